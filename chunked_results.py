@@ -0,0 +1,101 @@
+'''
+Out-of-core aggregation of results files (constants.CSV_HEADER) ... the file is read
+RESULT_CHUNK_ROWS rows at a time and only mergeable per-repo partial aggregates are kept:
+distinct files, files with at least one event per field, event sums and SLOC. The rows of a
+repo must be contiguous, as the scanner writes them, so the distinct files of a repo are only
+remembered while the repo is being read ... memory holds one chunk, the files of the repos
+that run across chunk boundaries, at most the largest repo, and the name of every repo read.
+A repo whose rows come back after other repos raises ValueError
+'''
+
+import numpy as np
+import pandas as pd
+import constants
+import line_counter
+import results_store
+
+
+class RepoAggregates(object):
+    '''
+    Per-repo partial aggregates of the given count fields ... merge() folds in the aggregates of
+    another part of the results
+    '''
+    def __init__(self, fields_):
+        self.fields_     = list( fields_ )
+        self.file_counts = pd.Series( dtype=np.int64 )
+        self.atleast_one = pd.DataFrame( columns=self.fields_, dtype=np.int64 )
+        self.event_sums  = pd.DataFrame( columns=self.fields_, dtype=np.int64 )
+        self.sloc_       = pd.Series( dtype=np.int64 )
+
+    def merge(self, other_):
+        self.file_counts = self.file_counts.add( other_.file_counts, fill_value=0 ).astype( np.int64 )
+        self.atleast_one = self.atleast_one.add( other_.atleast_one, fill_value=0 ).astype( np.int64 )
+        self.event_sums  = self.event_sums.add( other_.event_sums, fill_value=0 ).astype( np.int64 )
+        self.sloc_       = self.sloc_.add( other_.sloc_, fill_value=0 ).astype( np.int64 )
+        return self
+
+    def getTotalFiles(self):
+        return self.file_counts.sort_index()
+
+    def getAtLeastOne(self):
+        return self.atleast_one.sort_index()
+
+    def getEventSums(self):
+        return self.event_sums.sort_index()
+
+    def getSLOC(self):
+        return self.sloc_.sort_index()
+
+
+def _getChunkAggregates( chunk_df, fields_, seen_files, with_sloc ):
+    '''
+    aggregates of one chunk ... seen_files maps the files already read in an earlier chunk of
+    their repo to their event flags, so such files are not counted again and only add the
+    fields they have events of for the first time
+    '''
+    chunk_aggregates = RepoAggregates( fields_ )
+    chunk_aggregates.event_sums = chunk_df.groupby( 'REPO_FULL_PATH' )[fields_].sum()
+    file_flags = chunk_df[fields_].gt( 0 ).groupby( [ chunk_df['REPO_FULL_PATH'], chunk_df['FILE_FULL_PATH'] ], sort=False ).any()
+    no_flags   = np.zeros( len( fields_ ), dtype=bool )
+    old_flags  = np.array( [ seen_files.get( file_key, no_flags ) for file_key in file_flags.index ], dtype=bool ).reshape( file_flags.shape )
+    is_new     = np.array( [ file_key not in seen_files for file_key in file_flags.index ], dtype=bool )
+    new_flags  = file_flags.to_numpy( dtype=bool )
+    seen_files.update( zip( file_flags.index, new_flags | old_flags ) )
+    repo_index = file_flags.index.get_level_values( 'REPO_FULL_PATH' )
+    chunk_aggregates.file_counts = pd.Series( is_new, index=repo_index ).groupby( level=0 ).sum()
+    chunk_aggregates.atleast_one = pd.DataFrame( new_flags & ~old_flags, index=repo_index, columns=fields_ ).groupby( level=0 ).sum()
+    if with_sloc:
+        new_files = file_flags.index[is_new]
+        if 'LINE_COUNT' in chunk_df.columns:
+            file_sloc = chunk_df.groupby( [ 'REPO_FULL_PATH', 'FILE_FULL_PATH' ], sort=False )['LINE_COUNT'].first().loc[new_files]
+        else:
+            file_paths  = new_files.get_level_values( 'FILE_FULL_PATH' )
+            line_counts = line_counter.getLineCounts( list( dict.fromkeys( file_paths ) ) )
+            file_sloc   = pd.Series( [ line_counts[file_] for file_ in file_paths ], index=new_files, dtype=np.int64 )
+        chunk_aggregates.sloc_ = file_sloc.groupby( level='REPO_FULL_PATH' ).sum()
+    return chunk_aggregates
+
+
+def aggregateResults( res_file, fields_, chunksize=constants.RESULT_CHUNK_ROWS, with_sloc=False ):
+    '''
+    RepoAggregates of a results file read chunksize rows at a time ... only the columns needed
+    are parsed, and SLOC is summed from a LINE_COUNT column or the line_counter cache when
+    with_sloc is set
+    '''
+    header_  = results_store.readResultsHeader( res_file )
+    columns_ = [ 'REPO_FULL_PATH', 'FILE_FULL_PATH' ] + list( fields_ )
+    if with_sloc and 'LINE_COUNT' in header_:
+        columns_.append( 'LINE_COUNT' )
+    all_aggregates = RepoAggregates( fields_ )
+    seen_files     = {}
+    done_repos, last_repos = set(), set()
+    for chunk_df in results_store.iterResultChunks( res_file, columns_, chunksize ):
+        chunk_repos = set( chunk_df['REPO_FULL_PATH'] )
+        # repos missing from the last chunk are done, their files need not be remembered
+        done_repos |= last_repos - chunk_repos
+        if not done_repos.isdisjoint( chunk_repos ):
+            raise ValueError( 'rows of repo {} are not contiguous in {} ... sort the results by REPO_FULL_PATH'.format( sorted( done_repos & chunk_repos )[0], res_file ) )
+        all_aggregates.merge( _getChunkAggregates( chunk_df, fields_, seen_files, with_sloc ) )
+        seen_files  = { file_key: flags_ for file_key, flags_ in seen_files.items() if file_key[0] in chunk_repos }
+        last_repos  = chunk_repos
+    return all_aggregates
@@ -238,6 +238,16 @@ CONSOLE_STR_PIPELINE= 'PIPELINE_EVENT'
 CONSOLE_STR_REL_ENV= 'ENV_REINFORCEMENT_LEARNING_EVENT'
 
 TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+PARSE_CACHE_SIZE = 32
+MMAP_MIN_SIZE    = 1048576
+RESULT_CACHE_DIR = '.fame_cache'
+RESULT_CACHE_FILE = 'results.sqlite3'
+SCAN_FILE_TIMEOUT = 60
+SCAN_TIMEOUT_GRACE = 5
+SCAN_QUEUE_FACTOR = 4
+EVENT_BATCH_SIZE  = 1000
+SCAN_STATE_SUFFIX = '.state.json'
+GIT_SCAN_REV      = 'HEAD'
 UTF_ENCODING   = 'utf-8'
 # CSV_HEADER = ['REPO_FULL_PATH','FILE_FULL_PATH','DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT','DATA_DOWNLOAD_COUNT',\
 # 		'MODEL_FEATURE_COUNT','MODEL_LABEL_COUNT','MODEL_OUTPUT_COUNT','DATA_PIPELINE_COUNT','ENVIRONMENT_COUNT',\
@@ -249,4 +259,21 @@ UTF_ENCODING   = 'utf-8'
 
 CSV_HEADER = ['REPO_FULL_PATH','FILE_FULL_PATH','DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT','DATA_DOWNLOAD_COUNT',\
 		'MODEL_LABEL_COUNT','MODEL_OUTPUT_COUNT','DATA_PIPELINE_COUNT','ENVIRONMENT_COUNT',\
-		'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT']
\ No newline at end of file
+		'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT']
+
+EVENT_HEADER = ['CATEGORY','FILE_FULL_PATH','LINE','CLASS_NAME','FUNC_NAME']
+
+TREND_HEADER = ['REPO_FULL_PATH','COMMIT_HASH','COMMIT_DATE','FILE_COUNT'] + CSV_HEADER[2:]
+TREND_BRANCH = 'master'
+
+DISTINCT_ERROR_RATE = 0.01
+HLL_MIN_PRECISION   = 4
+HLL_MAX_PRECISION   = 18
+
+STATS_CACHE_FILE = 'COMMIT.STATS.cache.json'
+
+LINE_COUNT_CACHE_FILE = 'line_counts.sqlite3'
+
+KLL_K             = 200
+KLL_SEED          = 0
+RESULT_CHUNK_ROWS = 100000
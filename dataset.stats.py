@@ -5,15 +5,21 @@ Mine Metrics for Paper Writing
 '''
 import pandas as pd 
 import numpy as np 
-from git import Repo
-from git import exc 
 import os 
-from datetime import datetime
+from datetime import datetime, time
 import subprocess
 from collections import Counter 
 import shutil 
+from concurrent.futures import ThreadPoolExecutor
 
 from forensics import forensic_wrapper
+import history 
+import sketches 
+import constants 
+import line_counter 
+import chunked_results 
+import results_store 
+from stats_cache import CommitStatsCache 
 
 def getBranch(path):
     dict_ = { 
@@ -47,160 +53,283 @@ def getBranch(path):
         return 'master' 
 
 def getFileLength(file_):
-    return sum(1 for line in open(file_, encoding='latin-1'))
+    return line_counter.countFileLines(file_)
 
-def getDevEmailForCommit(repo_path_param, hash_):
-    author_emails = []
-
-    cdCommand     = "cd " + repo_path_param + " ; "
-    commitCountCmd= " git log --format='%ae'" + hash_ + "^!"
-    command2Run   = cdCommand + commitCountCmd
-
-    author_emails = str(subprocess.check_output(['bash','-c', command2Run]))
-    author_emails = author_emails.split('\n')
-    author_emails = [x_.replace(hash_, '') for x_ in author_emails if x_ != '\n' and '@' in x_ ] 
-    author_emails = [x_.replace('^', '') for x_ in author_emails if x_ != '\n' and '@' in x_ ] 
-    author_emails = [x_.replace('!', '') for x_ in author_emails if x_ != '\n' and '@' in x_ ] 
-    author_emails = [x_.replace('\\n', ',') for x_ in author_emails if x_ != '\n' and '@' in x_ ] 
+def iterCommitLog(repo_path_param, branchName='master'):
+    ## one streaming git log pass per repo ... yields ( hash, author email, commit date ) per commit 
+    ## --end-of-options keeps a branch name starting with '-' from being read as an option, and '--' keeps it from being read as a path 
+    log_command = ['git', '-C', repo_path_param, 'log', '--format=%H%x00%ae%x00%cI', '--end-of-options', branchName, '--']
+    log_proc    = subprocess.Popen(log_command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
     try:
-        author_emails = author_emails[0].split(',')
-        author_emails = [x_ for x_ in author_emails if len(x_) > 3 ] 
-        author_emails = list(np.unique(author_emails) )
-    except IndexError as e_:
-        pass
-    return author_emails  
-
-def getDevDayCommits(full_path_to_repo, branchName='master', explore=1000):
-    repo_emails = []
-    all_commits = []
-    repo_emails = []
-    all_time_list = []
+        for line_ in log_proc.stdout:
+            hash_, email_, date_ = line_.decode('utf-8', 'replace').rstrip('\n').split('\0')
+            yield hash_, email_, date_
+    finally:
+        log_proc.stdout.close()
+        log_proc.wait()
+    if log_proc.returncode != 0:
+        raise subprocess.CalledProcessError(log_proc.returncode, log_command)
+
+def getCommitLog(repo_path_param, branchName='master', dev_counter=None):
+    ## author emails, commit count and ( first, last ) commit day of a branch from one git log pass 
+    ## emails go to a set ( or the sketches counter given ) and days to a running min/max, so memory stays flat on long histories 
+    author_emails = set() if dev_counter is None else dev_counter 
+    commit_count  = 0 
+    first_day, last_day = None, None 
+    for hash_, email_, date_ in iterCommitLog(repo_path_param, branchName):
+        commit_count += 1 
+        ## as the per-commit reader did, only emails with an '@' count as developers 
+        if len(email_) > 3 and '@' in email_:
+            author_emails.add( email_ )
+        commit_day = np.datetime64( date_[:10], 'D' )
+        if first_day is None or commit_day < first_day:
+            first_day = commit_day 
+        if last_day is None or commit_day > last_day:
+            last_day = commit_day 
+    return author_emails, commit_count, (first_day, last_day) 
+
+def getBranchHead(repo_path_param, branchName='master'):
+    head_command = ['git', '-C', repo_path_param, 'rev-parse', '--verify', '--quiet', '--end-of-options', branchName + '^{commit}']
+    return subprocess.check_output(head_command, stderr=subprocess.DEVNULL).decode('utf-8').strip()
+
+def isAncestorCommit(repo_path_param, old_head, new_head):
+    ancestor_command = ['git', '-C', repo_path_param, 'merge-base', '--is-ancestor', old_head, new_head]
+    return subprocess.call(ancestor_command, stderr=subprocess.DEVNULL) == 0 
+
+def _getCachedDevs(entry_, dev_counter=None):
+    ## developers of a cache entry, as a set or as a sketch when dev_counter is a HyperLogLog sketch 
+    ## None when the entry was stored for the other kind of counter ( or another precision ), so it is read again 
+    if entry_ is None:
+        return None 
+    if isinstance(dev_counter, sketches.HyperLogLog):
+        sketch_ = entry_.get('sketch')
+        if sketch_ is None or sketch_['precision'] != dev_counter.precision:
+            return None 
+        return sketches.HyperLogLog.fromState(sketch_)
+    if 'emails' not in entry_:
+        return None 
+    return set(entry_['emails'])
+
+def getCachedCommitLog(repo_path_param, branchName='master', dev_counter=None, stats_cache=None):
+    ## getCommitLog served from stats_cache ... an unchanged branch head reads no commits, and a head 
+    ## that moved forward only reads old_head..HEAD, merged into the cached aggregates 
+    ## with a HyperLogLog dev_counter the entry keeps the sketch registers instead of the emails, so the cache stays bounded 
+    head_  = getBranchHead(repo_path_param, branchName)
+    entry_ = stats_cache.get(repo_path_param, branchName)
+    cached_devs = _getCachedDevs(entry_, dev_counter)
+    if cached_devs is not None and entry_['head'] == head_:
+        stats_cache.hits += 1 
+    else:
+        if cached_devs is not None and isAncestorCommit(repo_path_param, entry_['head'], head_):
+            stats_cache.updates += 1 
+            log_range = entry_['head'] + '..' + head_
+        else:
+            stats_cache.misses += 1 
+            entry_      = { 'commits': 0, 'first_day': None, 'last_day': None }
+            cached_devs = sketches.HyperLogLog(dev_counter.error_rate) if isinstance(dev_counter, sketches.HyperLogLog) else set() 
+            log_range   = head_
+        cached_devs, new_commits, (first_day, last_day) = getCommitLog(repo_path_param, log_range, cached_devs)
+        commit_days = [ np.datetime64(day_, 'D') for day_ in (entry_['first_day'], entry_['last_day'], first_day, last_day) if day_ is not None ]
+        entry_ = { 'head': head_, 
+                   'commits': entry_['commits'] + new_commits, 
+                   'first_day': str( min(commit_days) ) if commit_days else None, 
+                   'last_day': str( max(commit_days) ) if commit_days else None }
+        if isinstance(cached_devs, sketches.HyperLogLog):
+            entry_['sketch'] = cached_devs.getState()
+        else:
+            entry_['emails'] = sorted( cached_devs )
+        stats_cache.put(repo_path_param, branchName, entry_)
+    author_emails = set() if dev_counter is None else dev_counter 
+    if isinstance(cached_devs, sketches.HyperLogLog):
+        author_emails.merge( cached_devs )
+    else:
+        author_emails.update( cached_devs )
+    commit_days = tuple( None if day_ is None else np.datetime64(day_, 'D') for day_ in (entry_['first_day'], entry_['last_day']) )
+    return author_emails, entry_['commits'], commit_days 
+
+def getDevEmailForCommit(repo_path_param, hash_):
+    author_emails, _, _ = getCommitLog(repo_path_param, hash_ + '^!')
+    return sorted( author_emails )  
+
+def _getCommitDay(day_):
+    ## commit days are counted at 12:30, as the day strings always were 
+    return datetime.combine( day_.astype(datetime), time(12, 30) )
+
+def getDevDayCommits(full_path_to_repo, branchName='master', explore=1000, dev_counter=None, stats_cache=None):
+    ## the day list only holds the extreme days ... the 2020-11-20 mining day and the first and last commit days 
+    repo_emails = set() if dev_counter is None else dev_counter 
+    commit_count = 0 
+    commit_days = (None, None)
+    placeholder_devs = None 
     if os.path.exists(full_path_to_repo):
         try:
-            repo_  = Repo(full_path_to_repo)
-            try:
-                all_commits = list(repo_.iter_commits(branchName))   
-            except (exc.GitCommandError, exc.InvalidGitRepositoryError ) :
-                print('Skipping this repo ... due to branch name problem', full_path_to_repo )
-        except (exc.GitCommandError, exc.InvalidGitRepositoryError ) :
-           print('Skipping this repo ... due to git problem', full_path_to_repo )
-        for commit_ in all_commits:
-                commit_hash = commit_.hexsha
-
-                emails = getDevEmailForCommit(full_path_to_repo, commit_hash)
-                repo_emails = repo_emails + emails
-
-                timestamp_commit = commit_.committed_datetime
-                str_time_commit  = timestamp_commit.strftime('%Y-%m-%d') ## date with time 
-                all_time_list.append( str_time_commit )
-
+            if stats_cache is None:
+                repo_emails, commit_count, commit_days = getCommitLog(full_path_to_repo, branchName, repo_emails)
+            else:
+                repo_emails, commit_count, commit_days = getCachedCommitLog(full_path_to_repo, branchName, repo_emails, stats_cache)
+        except (subprocess.CalledProcessError, OSError) :
+            print('Skipping this repo ... due to branch name problem', full_path_to_repo )
     else:
-        repo_emails = [ str(x_) for x_ in range(10) ]
+        ## a missing repo keeps its 10 placeholder developers for its own count only ... they stay out of dev_counter and the merged distinct counts 
+        placeholder_devs = 10 
     all_day_list   = [ datetime(2020, 11, 20, 00, 15) ]
-    all_day_list   = all_day_list + [datetime(int(x_.split('-')[0]), int(x_.split('-')[1]), int(x_.split('-')[2]), 12, 30) for x_ in all_time_list]
+    if commit_count > 0:
+        all_day_list = [ min( all_day_list[0], _getCommitDay(commit_days[0]) ), max( all_day_list[0], _getCommitDay(commit_days[1]) ) ]
 
-    repo_emails = np.unique( repo_emails ) 
-    return len(repo_emails) , len(all_commits) , all_day_list
+    dev_count = len(repo_emails) if placeholder_devs is None else placeholder_devs 
+    return dev_count , commit_count , all_day_list
 
 def days_between(d1_, d2_):  
     return abs((d2_ - d1_).days)
 
 
-def getAllCommits(all_repos):
-    full_list = []
-    total_commits  = 0 
-    total_devs     = 0 
-    all_days       = []
-    tracker        = 0 
-    for repo_ in all_repos:
-        tracker += 1 
-        branchName = getBranch(repo_) 
-        print(tracker, repo_)  
-        print(the_tuple) 
-        dev_cnt, com_cnt, _days = getDevDayCommits(repo_, branchName)  
-        per_repo_min_day        = min(_days) 
-        per_repo_max_day        = max(_days)   
-        day_diff                = days_between( per_repo_min_day, per_repo_max_day  )       
-        the_tuple = (repo_, dev_cnt, com_cnt, per_repo_min_day, per_repo_max_day, day_diff) 
-        full_list.append(  the_tuple  )
-        total_commits = total_commits + com_cnt 
-        total_devs    = total_devs + dev_cnt 
-        all_days      = all_days + _days 
-    
-    min_day        = min(all_days) 
-    max_day        = max(all_days) 
+def getRepoCommitStats(repo_, dev_counter=None, stats_cache=None):
+    ## per-repo partial aggregate ... ( repo, devs, commits, start day, end day, duration ) 
+    branchName = getBranch(repo_) 
+    dev_cnt, com_cnt, _days = getDevDayCommits(repo_, branchName, dev_counter=dev_counter, stats_cache=stats_cache)  
+    per_repo_min_day        = min(_days) 
+    per_repo_max_day        = max(_days)   
+    day_diff                = days_between( per_repo_min_day, per_repo_max_day  )       
+    return (repo_, dev_cnt, com_cnt, per_repo_min_day, per_repo_max_day, day_diff) 
 
-    temp_df  = pd.DataFrame( full_list )
-    temp_df.to_csv( 'COMMIT.STATS.csv', header=['REPO', 'DEVS', 'COMMITS', 'START_DATE', 'END_DATE', 'DURATION_DAYS'], index=False, encoding='utf-8')     
+def _getRepoCommitStats(repo_, error_rate=None, stats_cache=None):
+    ## errors are returned, so one bad repo does not stop the others 
+    try:
+        dev_counter = sketches.getDistinctCounter(error_rate) 
+        return getRepoCommitStats(repo_, dev_counter, stats_cache), dev_counter, None 
+    except Exception as e_:
+        return None, None, e_ 
+
+def getAllCommits(all_repos, workers=None, output_file='COMMIT.STATS.csv', dev_counter=None, stats_cache=None):
+    ## repos are read by a bounded thread pool, as each repo mostly waits on git 
+    ## the per-repo distinct developer counters are merged into dev_counter when one is given 
+    full_list = []
+    failed_repos = []
+    error_rate = dev_counter.error_rate if isinstance(dev_counter, sketches.HyperLogLog) else None 
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        ## map keeps the order of all_repos, so COMMIT.STATS.csv does not depend on scheduling 
+        repo_stats = executor.map(_getRepoCommitStats, all_repos, [error_rate] * len(all_repos), [stats_cache] * len(all_repos))
+        for tracker, (repo_, (the_tuple, repo_counter, error_)) in enumerate( zip( all_repos, repo_stats ) ):
+            print(tracker + 1, repo_)  
+            if error_ is not None:
+                print('Skipping this repo ... due to', repr(error_), repo_ )
+                failed_repos.append( repo_ )
+                continue 
+            print(the_tuple) 
+            full_list.append(  the_tuple  )
+            if dev_counter is not None:
+                dev_counter.merge( repo_counter )
+    if len(failed_repos) > 0:
+        print('FAILED_REPO_COUNT:', len(failed_repos) )
+
+    ## global values are reduced from the per-repo aggregates 
+    total_commits  = sum( the_tuple[2] for the_tuple in full_list ) 
+    total_devs     = sum( the_tuple[1] for the_tuple in full_list ) 
+    min_day        = min( [ the_tuple[3] for the_tuple in full_list ], default=None ) 
+    max_day        = max( [ the_tuple[4] for the_tuple in full_list ], default=None ) 
+
+    temp_df  = pd.DataFrame( full_list, columns=['REPO', 'DEVS', 'COMMITS', 'START_DATE', 'END_DATE', 'DURATION_DAYS'] )
+    temp_df.to_csv( output_file, index=False, encoding='utf-8')     
     return min_day, max_day, total_commits, total_devs 
 
            
 
 def getAllFileCount(df_):
-    tot_fil_size = 0 
+    ## file lengths come from the shared line_counter cache, counted in parallel 
     file_names_ =  np.unique( df_['FILE_FULL_PATH'].tolist() )
-    for file_ in file_names_:
-        tot_fil_size = tot_fil_size + getFileLength( file_ )
+    tot_fil_size = line_counter.getTotalLines( file_names_ ) 
     return tot_fil_size, len( file_names_ ) 
 
+def getChunkedFileCount(result_file, chunksize=constants.RESULT_CHUNK_ROWS):
+    ## getAllFileCount for results files too large to load, read chunksize rows at a time ... also gives the repos 
+    repo_aggregates = chunked_results.aggregateResults( result_file, ['TOTAL_EVENT_COUNT'], chunksize, with_sloc=True )
+    repo_files = repo_aggregates.getTotalFiles() 
+    return int( repo_aggregates.getSLOC().sum() ), int( repo_files.sum() ), repo_files.index.tolist() 
+
 
 @forensic_wrapper  
-def getGeneralStats(all_dataset_list):
+def getGeneralStats(all_dataset_list, error_rate=None, stats_cache_file=constants.STATS_CACHE_FILE, chunksize=None):
+    ## distinct developers are counted exactly, or with HyperLogLog sketches within error_rate 
+    ## commit statistics are cached per branch head in stats_cache_file, None turns the cache off 
+    ## with a chunksize the results files are streamed instead of loaded whole 
     all_repos = [] 
+    stats_cache = None if stats_cache_file is None else CommitStatsCache(stats_cache_file) 
+    corpus_devs = sketches.getDistinctCounter(error_rate) 
     for result_file in all_dataset_list:
         print('='*50)
         print(result_file)
         print('='*50)
-        res_df    = pd.read_csv( result_file ) 
+        if chunksize is None:
+            res_df    = results_store.readResults( result_file, ['REPO_FULL_PATH', 'FILE_FULL_PATH'] ) 
+            file_size, file_count   = getAllFileCount(res_df)
+            res_repos = np.unique( res_df['REPO_FULL_PATH'].tolist() ) 
+        else:
+            file_size, file_count, res_repos = getChunkedFileCount(result_file, chunksize)
         if 'ZOO' in result_file:
-            temp_dirs = np.unique( res_df['REPO_FULL_PATH'].tolist() ) 
+            temp_dirs = res_repos 
             for temp_dir in temp_dirs:
                 list_subfolders_with_paths = [f.path for f in os.scandir(temp_dir) if f.is_dir()]
                 all_repos = all_repos + list_subfolders_with_paths 
         else: 
-            all_repos = np.unique( res_df['REPO_FULL_PATH'].tolist() )
+            all_repos = res_repos 
         print('REPO_COUNT:', len(all_repos) ) 
-        file_size, file_count   = getAllFileCount(res_df)
         print('ALL_FILE_COUNT:', file_count  ) 
         print('ALL_FILE_SIZE:', file_size  )   
-        start_date, end_date, coms, devs  = getAllCommits( all_repos ) 
+        dataset_devs = sketches.getDistinctCounter(error_rate) 
+        start_date, end_date, coms, devs  = getAllCommits( all_repos, dev_counter=dataset_devs, stats_cache=stats_cache ) 
+        corpus_devs.merge( dataset_devs )
         print('COMMIT_COUNT:', coms )
         print('DEVS_COUNT:', devs )
+        print('DISTINCT_DEVS_COUNT:', dataset_devs.count() )
         print('START_DATE:', start_date )
         print('END_DATE:', end_date )
         print('='*50)
+        if stats_cache is not None:
+            stats_cache.save()
+    print('CORPUS_DISTINCT_DEVS_COUNT:', corpus_devs.count() )
+
+
+def getAllTrends(all_repos, every_n=1, output_file='CATEGORY.TRENDS.csv'):
+    ## category counts of every every_n-th commit on the branch getBranch picks 
+    scan_stats = history.writeTrends( all_repos, output_file, getBranch, every_n ) 
+    print('TREND_BLOBS:', dict(scan_stats) )
+    return scan_stats 
 
 
-def getDevEmails(ds_list): 
-    repo_emails = [] 
+def _getRepoEmails(full_path_to_repo):
+    ## ( emails, error ) of one repo, with None emails for a repo that is not on disk 
+    if not os.path.exists(full_path_to_repo):
+        return None, None 
+    try:
+        emails, _, _ = getCommitLog(full_path_to_repo, getBranch(full_path_to_repo))
+        return emails, None 
+    except Exception as e_:
+        return set(), e_ 
+
+def getDevEmails(ds_list, workers=None): 
+    repo_emails = set() 
     for result_file in ds_list:
         print('='*50)
         print(result_file)
         print('='*50)
         if 'ZOO' in result_file:
             all_repos = [] 
-            res_df    = pd.read_csv( result_file ) 
+            res_df    = results_store.readResults( result_file, ['REPO_FULL_PATH'] ) 
             temp_dirs = np.unique( res_df['REPO_FULL_PATH'].tolist() ) 
             for temp_dir in temp_dirs:
                 list_subfolders_with_paths = [f.path for f in os.scandir(temp_dir) if f.is_dir()]
                 all_repos = all_repos + list_subfolders_with_paths 
         print('REPO_COUNT:', len(all_repos) ) 
-        for full_path_to_repo in all_repos:
-            branchName = getBranch(full_path_to_repo) 
-            if os.path.exists(full_path_to_repo):
-                repo_  = Repo(full_path_to_repo)
-                try:
-                    all_commits = list(repo_.iter_commits(branchName))   
-                except exc.GitCommandError:
-                    print('Skipping this repo ... due to branch name problem', full_path_to_repo )
-                for commit_ in all_commits:
-                    commit_hash = commit_.hexsha
-                    emails = getDevEmailForCommit(full_path_to_repo, commit_hash)
-                    repo_emails = repo_emails + emails
-            else:
-                repo_emails = [ str(x_) for x_ in range(10) ]
-    repo_emails = np.unique( repo_emails ) 
-    print( list(repo_emails) )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for full_path_to_repo, (emails, error_) in zip( all_repos, executor.map(_getRepoEmails, all_repos) ):
+                if error_ is not None:
+                    print('Skipping this repo ... due to', repr(error_), full_path_to_repo )
+                elif emails is None:
+                    ## no placeholder emails for a missing repo, they would be listed as developers 
+                    print('Skipping this repo ... not on disk', full_path_to_repo )
+                else:
+                    repo_emails.update( emails )
+    print( sorted(repo_emails) )
 
 
 
@@ -242,4 +371,6 @@ if __name__=='__main__':
 
     # getDevEmails( all_datasets )
 
+    # getAllTrends( [ '/Users/arahman/FSE2021_ML_REPOS/GITHUB_REPOS/twisted@twisted' ], every_n=100 )
+
     '''
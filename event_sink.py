@@ -0,0 +1,113 @@
+'''
+Event sinks for lint_engine ... every matched record becomes one Event that is handed to a sink
+instead of being printed, so batch runs do no per-event console I/O and keep the event
+locations as data
+'''
+
+import collections
+import csv
+import json
+import constants
+
+
+Event = collections.namedtuple( 'Event', [ 'category', 'file', 'line', 'class_name', 'func_name' ] )
+
+
+class EventSink(object):
+    '''
+    Base sink ... drops every event
+    '''
+    def emit(self, event_):
+        pass
+
+    def emitAll(self, events_):
+        for event_ in events_:
+            self.emit( event_ )
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class NullSink(EventSink):
+    pass
+
+
+class ListSink(EventSink):
+    '''
+    Keeps the events in memory, in the order they were emitted
+    '''
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event_):
+        self.events.append( event_ )
+
+
+class ConsoleSink(EventSink):
+    '''
+    Prints one CONSOLE_STR_DISPLAY line per event, as the detectors always did
+    '''
+    def emit(self, event_):
+        print( constants.CONSOLE_STR_DISPLAY.format( event_.category, event_.line, event_.file ) )
+
+
+class _BatchFileSink(EventSink):
+    '''
+    Buffers events and writes them batch_size at a time to output_file
+    '''
+    def __init__(self, output_file, batch_size=constants.EVENT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.batch_     = []
+        self.file_      = open( output_file, 'w', newline='', encoding=constants.UTF_ENCODING )
+
+    def emit(self, event_):
+        self.batch_.append( event_ )
+        if len( self.batch_ ) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch_:
+            self.writeBatch( self.batch_ )
+            self.batch_ = []
+        self.file_.flush()
+
+    def close(self):
+        if not self.file_.closed:
+            self.flush()
+            self.file_.close()
+
+
+class JSONLSink(_BatchFileSink):
+    def writeBatch(self, events_):
+        self.file_.write( ''.join( json.dumps( event_._asdict() ) + '\n' for event_ in events_ ) )
+
+
+class CSVSink(_BatchFileSink):
+    def __init__(self, output_file, batch_size=constants.EVENT_BATCH_SIZE):
+        super(CSVSink, self).__init__( output_file, batch_size )
+        self.writer_ = csv.writer( self.file_ )
+        self.writer_.writerow( constants.EVENT_HEADER )
+
+    def writeBatch(self, events_):
+        self.writer_.writerows( events_ )
+
+
+NULL_SINK = NullSink()
+
+
+def getFileSink( output_file, batch_size=constants.EVENT_BATCH_SIZE ):
+    '''
+    JSONL sink for .jsonl output files, CSV sink for anything else
+    '''
+    if output_file.endswith( '.jsonl' ):
+        return JSONLSink( output_file, batch_size )
+    return CSVSink( output_file, batch_size )
@@ -9,6 +9,9 @@ import pandas as pd
 import time
 import datetime
 from forensics import forensic_wrapper
+import line_counter
+import chunked_results
+import results_store
 
 
 def giveTimeStamp():
@@ -18,86 +21,138 @@ def giveTimeStamp():
 
 
 def getAllSLOC(df_param, csv_encoding='latin-1'):
-    total_sloc = 0
+    # line counts come from the shared line_counter cache; csv_encoding is kept for callers,
+    # newlines are counted the same in any single byte encoding
     all_files = np.unique(df_param['FILE_FULL_PATH'].tolist())
-    for file_ in all_files:
-        total_sloc = total_sloc + sum(1 for _ in open(file_, encoding=csv_encoding))
-    return total_sloc
+    return line_counter.getTotalLines(all_files)
 
 
-@forensic_wrapper
-def reportProportion(res_file, output_file):
-    res_df = pd.read_csv(res_file)
-    repo_names = np.unique(res_df['REPO_FULL_PATH'].tolist())
+def loadResults(res_file, columns, optional_columns=()):
+    # results already in memory are used as they are, files are read with only the columns needed
+    if isinstance(res_file, pd.DataFrame):
+        return res_file[columns + [column for column in optional_columns if column in res_file.columns]]
+    header = results_store.readResultsHeader(res_file)
+    return results_store.readResults(res_file, columns + [column for column in optional_columns if column in header])
+
+
+def getFileEventFlags(res_df, fields2explore):
+    # one row per (repo, file), True where the file has at least one event of the field
+    # observed=True, so categorical path columns only group the paths that are present
+    flag_df = res_df[fields2explore].gt(0)
+    return flag_df.groupby([res_df['REPO_FULL_PATH'], res_df['FILE_FULL_PATH']], sort=True, observed=True).any()
 
+
+@forensic_wrapper
+def reportProportion(res_file, output_file=None, chunksize=None):
+    # res_file is a results file or DataFrame; the proportions are returned and also written to
+    # output_file when one is given. With a chunksize a results file is aggregated chunk by chunk
+    # instead of loaded whole, which needs the rows of each repo to be contiguous
     fields2explore = [
         'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
         'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
         'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
     ]
 
+    if chunksize is None or isinstance(res_file, pd.DataFrame):
+        # files per repo and files with at least one event, for every field in one groupby pass
+        res_df = loadResults(res_file, ['REPO_FULL_PATH', 'FILE_FULL_PATH'] + fields2explore)
+        repo_flags = getFileEventFlags(res_df, fields2explore).groupby(level='REPO_FULL_PATH', observed=True)
+        total_files = repo_flags.size()
+        atleast_one = repo_flags.sum()
+    else:
+        repo_aggregates = chunked_results.aggregateResults(res_file, fields2explore, chunksize)
+        total_files = repo_aggregates.getTotalFiles()
+        atleast_one = repo_aggregates.getAtLeastOne()
+
     df_list = []
 
-    for repo in repo_names:
+    for repo in total_files.index:
         print('-' * 50)
         print(repo)
-        repo_entity = res_df[res_df['REPO_FULL_PATH'] == repo]
-        all_py_files = np.unique(repo_entity['FILE_FULL_PATH'].tolist())
+        repo_total = int(total_files[repo])
 
         for field in fields2explore:
-            field_atleast_one_df = repo_entity[repo_entity[field] > 0]
-            atleast_one_files = np.unique(field_atleast_one_df['FILE_FULL_PATH'].tolist())
+            repo_atleast_one = int(atleast_one.at[repo, field])
             prop_metric = round(
-                float(len(atleast_one_files)) / float(len(all_py_files)), 5
+                float(repo_atleast_one) / float(repo_total), 5
             ) * 100
             print('TOTAL_FILES:{}, CATEGORY:{}, ATLEASTONE:{}, PROP_VAL:{}'.format(
-                len(all_py_files), field, len(atleast_one_files), prop_metric
+                repo_total, field, repo_atleast_one, prop_metric
             ))
             print('-' * 50)
 
-            the_tup = (repo, len(all_py_files), field, len(atleast_one_files), prop_metric)
+            the_tup = (repo, repo_total, field, repo_atleast_one, prop_metric)
             df_list.append(the_tup)
 
     CSV_HEADER = ['REPO_NAME', 'TOTAL_FILES', 'CATEGORY', 'ATLEASTONE', 'PROP_VAL']
-    full_df = pd.DataFrame(df_list)
-    full_df.to_csv(output_file, header=CSV_HEADER, index=False, encoding='utf-8')
+    full_df = pd.DataFrame(df_list, columns=CSV_HEADER)
+    if output_file is not None:
+        full_df.to_csv(output_file, index=False, encoding='utf-8')
+    return full_df
 
 
-@forensic_wrapper
-def reportEventDensity(res_file, output_file):
-    res_df = pd.read_csv(res_file)
-    repo_names = np.unique(res_df['REPO_FULL_PATH'].tolist())
+def getRepoSLOC(res_df):
+    # lines of the distinct files of each repo, from a precomputed LINE_COUNT column when the
+    # results have one and from the shared line_counter cache otherwise
+    file_df = res_df.drop_duplicates(['REPO_FULL_PATH', 'FILE_FULL_PATH'])
+    if 'LINE_COUNT' in file_df.columns:
+        file_sloc = file_df['LINE_COUNT']
+    else:
+        line_counts = line_counter.getLineCounts(np.unique(file_df['FILE_FULL_PATH'].tolist()))
+        file_sloc = file_df['FILE_FULL_PATH'].map(line_counts).astype(np.int64)
+    return file_sloc.groupby(file_df['REPO_FULL_PATH'], sort=True, observed=True).sum()
+
 
+@forensic_wrapper
+def reportEventDensity(res_file, output_file=None, chunksize=None):
+    # res_file is a results file or DataFrame; the densities are returned and also written to
+    # output_file when one is given. With a chunksize a results file is aggregated chunk by chunk
+    # instead of loaded whole, which needs the rows of each repo to be contiguous
     fields2explore = [
         'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
         'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
         'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
     ]
 
+    if chunksize is None or isinstance(res_file, pd.DataFrame):
+        # per repo SLOC and event totals of every field in one grouped aggregation
+        res_df = loadResults(res_file, ['REPO_FULL_PATH', 'FILE_FULL_PATH'] + fields2explore, ['LINE_COUNT'])
+        repo_sloc = getRepoSLOC(res_df)
+        repo_events = res_df.groupby('REPO_FULL_PATH', sort=True, observed=True)[fields2explore].sum().loc[repo_sloc.index]
+    else:
+        repo_aggregates = chunked_results.aggregateResults(res_file, fields2explore, chunksize, with_sloc=True)
+        repo_sloc = repo_aggregates.getSLOC()
+        repo_events = repo_aggregates.getEventSums().loc[repo_sloc.index]
+    # a repo whose files have no lines (only empty __init__.py files, say) has no events either,
+    # its density is written as 0 rather than the inf/nan of dividing by zero
+    sloc_values = repo_sloc.to_numpy(dtype=float)[:, np.newaxis]
+    event_density = np.divide(repo_events.to_numpy(dtype=float) * 1000, sloc_values,
+                              out=np.zeros(repo_events.shape), where=sloc_values > 0)
+
     df_list = []
 
-    for repo in repo_names:
+    for repo_index, repo in enumerate(repo_sloc.index):
         print('-' * 50)
         print(repo)
-        repo_entity = res_df[res_df['REPO_FULL_PATH'] == repo]
-        all_py_files = np.unique(repo_entity['FILE_FULL_PATH'].tolist())
-        all_py_size = getAllSLOC(repo_entity)
+        all_py_size = int(repo_sloc[repo])
 
-        for field in fields2explore:
-            field_res_list = repo_entity[field].tolist()
-            field_res_count = sum(field_res_list)
-            event_density = round(float(field_res_count * 1000) / float(all_py_size), 5)
+        for field_index, field in enumerate(fields2explore):
+            field_res_count = repo_events.iat[repo_index, field_index].item()
+            # python's round, so the CSV matches the per-repo implementation value for value
+            field_density = round(float(event_density[repo_index, field_index]), 5)
             print('TOTAL_LOC:{}, CATEGORY:{}, TOTAL_EVENT_COUNT:{}, EVENT_DENSITY:{}'.format(
-                all_py_size, field, field_res_count, event_density
+                all_py_size, field, field_res_count, field_density
             ))
             print('-' * 25)
 
-            the_tup = (repo, all_py_size, field, field_res_count, event_density)
+            the_tup = (repo, all_py_size, field, field_res_count, field_density)
             df_list.append(the_tup)
 
     CSV_HEADER = ['REPO_NAME', 'TOTAL_LOC', 'CATEGORY', 'TOTAL_EVENT_COUNT', 'EVENT_DENSITY']
-    full_df = pd.DataFrame(df_list)
-    full_df.to_csv(output_file, header=CSV_HEADER, index=False, encoding='utf-8')
+    full_df = pd.DataFrame(df_list, columns=CSV_HEADER)
+    if output_file is not None:
+        full_df.to_csv(output_file, index=False, encoding='utf-8')
+    return full_df
 
 
 if __name__ == '__main__':
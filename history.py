@@ -0,0 +1,190 @@
+'''
+Historical trend mode ... runs every lint_engine detector over the python files of each commit
+on a repository's branch and writes one row of category counts per commit (constants.TREND_HEADER)
+Results are kept per blob sha, so a commit only analyzes the blobs its diff touched
+'''
+
+import argparse
+import collections
+import csv
+from git import Repo
+from git import exc
+import constants
+import result_cache
+import scanner
+
+
+_REGULAR_MODES = ( '100644', '100755' )
+
+TrendCommit = collections.namedtuple( 'TrendCommit', [ 'jobs_after', 'repo_root', 'commit_hash', 'commit_date', 'changes' ] )
+
+
+def getBranchCommits( repo_, branch_name, every_n=1 ):
+    '''
+    ( sha, committer date ) of the first parent history of branch_name, oldest first ... every
+    every_n-th commit is kept, and the branch head always is
+    '''
+    log_output = repo_.git.log( '--first-parent', '--reverse', '--format=%H%x00%cI', '--end-of-options', branch_name, '--' )
+    all_commits = [ tuple( line_.split( '\0' ) ) for line_ in log_output.splitlines() if line_ ]
+    trend_commits = all_commits[::every_n]
+    if all_commits and trend_commits[-1] != all_commits[-1]:
+        trend_commits.append( all_commits[-1] )
+    return trend_commits
+
+
+def getTreeChanges( repo_, old_commit, new_commit ):
+    '''
+    ( path, blob sha ) of the python files that changed between two commits, with a None sha
+    for files that were deleted or stopped being regular files
+    '''
+    diff_output = repo_.git.diff_tree( '-r', '-z', '--no-renames', '--end-of-options', old_commit, new_commit, '--' ).split( '\0' )
+    tree_changes = []
+    for entry_meta, git_path in zip( diff_output[0::2], diff_output[1::2] ):
+        if git_path.endswith( '.py' ):
+            old_mode, new_mode, old_sha, new_sha, change_type = entry_meta.lstrip( ':' ).split( ' ' )
+            tree_changes.append( ( git_path, new_sha if new_mode in _REGULAR_MODES else None ) )
+    return tree_changes
+
+
+def getTrendJobs( repo_roots, trend_commits, trend_blobs, branch_func=None, every_n=1, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None ):
+    '''
+    scan jobs for every blob not seen before, across the sampled history of all repo_roots ...
+    each commit is appended to trend_commits with the count of jobs that must finish before it
+    can be counted, and ( blob sha, readable ) of each new blob is appended to trend_blobs ...
+    blobs that cannot be read from the object database are not readable and get no job
+    '''
+    requested_blobs = set()
+    jobs_count      = 0
+    for repo_root in repo_roots:
+        branch_name = branch_func( repo_root ) if branch_func is not None else constants.TREND_BRANCH
+        try:
+            repo_ = Repo( repo_root )
+        except ( exc.InvalidGitRepositoryError, exc.NoSuchPathError ):
+            print( 'Skipping this repo ... due to git problem', repo_root )
+            continue
+        try:
+            old_commit = None
+            for commit_hash, commit_date in getBranchCommits( repo_, branch_name, every_n ):
+                if old_commit is None:
+                    tree_changes = scanner.getPythonBlobs( repo_.git.ls_tree( '-r', '-z', '--full-tree', commit_hash ) )
+                else:
+                    tree_changes = getTreeChanges( repo_, old_commit, commit_hash )
+                old_commit = commit_hash
+                new_blobs  = []
+                for git_path, blob_sha in tree_changes:
+                    if blob_sha is not None and blob_sha not in requested_blobs:
+                        requested_blobs.add( blob_sha )
+                        new_blobs.append( ( git_path, blob_sha ) )
+                jobs_count += len( new_blobs )
+                trend_commits.append( TrendCommit( jobs_count, repo_root, commit_hash, commit_date, tree_changes ) )
+                for git_path, blob_sha in new_blobs:
+                    py_file   = scanner._getRepoPath( repo_root, git_path )
+                    py_source = scanner.readBlob( repo_, blob_sha, py_file )
+                    trend_blobs.append( ( blob_sha, py_source is not None ) )
+                    if py_source is not None:
+                        yield ( repo_root, py_file, timeout_, cache_dir, False, py_source )
+        except exc.GitCommandError:
+            print( 'Skipping this repo ... due to branch name problem', repo_root, branch_name )
+        finally:
+            repo_.close()
+
+
+def _getTrendRow( trend_commit, repo_trees, repo_totals, blob_counts ):
+    '''
+    applies the changes of one commit to the running counts of its repository
+    '''
+    repo_tree = repo_trees.setdefault( trend_commit.repo_root, {} )
+    totals_   = repo_totals.setdefault( trend_commit.repo_root, [ 0 ] * len( constants.CSV_HEADER[2:] ) )
+    for git_path, blob_sha in trend_commit.changes:
+        old_sha = repo_tree.pop( git_path, None )
+        if old_sha is not None:
+            totals_[:] = [ total_ - count_ for total_, count_ in zip( totals_, blob_counts[old_sha] ) ]
+        if blob_sha is not None:
+            repo_tree[git_path] = blob_sha
+            totals_[:] = [ total_ + count_ for total_, count_ in zip( totals_, blob_counts[blob_sha] ) ]
+    return [ trend_commit.repo_root, trend_commit.commit_hash, trend_commit.commit_date, len( repo_tree ) ] + totals_
+
+
+def _countUnreadBlobs( trend_blobs, blob_counts, zero_counts, scan_stats ):
+    '''
+    takes the unreadable blobs off the front of trend_blobs, where every job before them is
+    done, with zero counts ... returns how many were taken
+    '''
+    unread_count = 0
+    while trend_blobs and not trend_blobs[0][1]:
+        blob_counts[trend_blobs.popleft()[0]] = zero_counts
+        scan_stats[scanner.SCAN_ERROR] += 1
+        unread_count += 1
+    return unread_count
+
+
+def iterTrendRows( repo_roots, branch_func=None, every_n=1, workers=None, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None, scan_stats=None ):
+    '''
+    Yields one constants.TREND_HEADER row per sampled commit, repository by repository and
+    oldest commit first ... blobs that time out, fail or crash their worker count as zero
+    '''
+    scan_stats    = scan_stats if scan_stats is not None else collections.Counter()
+    trend_commits = collections.deque()
+    trend_blobs   = collections.deque()
+    blob_counts   = {}
+    repo_trees, repo_totals = {}, {}
+    zero_counts   = ( 0, ) * len( constants.CSV_HEADER[2:] )
+    cache_        = result_cache.ResultCache( cache_dir ) if cache_dir is not None else None
+    jobs_done     = 0
+    try:
+        scan_jobs = getTrendJobs( repo_roots, trend_commits, trend_blobs, branch_func, every_n, timeout_, cache_dir )
+        for job_, ( status_, result_, content_hash, events_ ) in scanner.iterScanResults( scan_jobs, workers ):
+            jobs_done += _countUnreadBlobs( trend_blobs, blob_counts, zero_counts, scan_stats )
+            blob_sha   = trend_blobs.popleft()[0]
+            jobs_done += 1
+            scan_stats[status_] += 1
+            if status_ in ( scanner.SCAN_TIMEOUT, scanner.SCAN_ERROR, scanner.SCAN_CRASHED ):
+                print( 'Skipping this file ... scan', status_, job_[1], result_ or '' )
+                blob_counts[blob_sha] = zero_counts
+            else:
+                if cache_ is not None and status_ != scanner.SCAN_CACHED:
+                    cache_.put( content_hash, result_ )
+                blob_counts[blob_sha] = tuple( result_[column_] for column_ in constants.CSV_HEADER[2:] )
+            jobs_done += _countUnreadBlobs( trend_blobs, blob_counts, zero_counts, scan_stats )
+            while trend_commits and trend_commits[0].jobs_after <= jobs_done:
+                yield _getTrendRow( trend_commits.popleft(), repo_trees, repo_totals, blob_counts )
+        _countUnreadBlobs( trend_blobs, blob_counts, zero_counts, scan_stats )
+        while trend_commits:
+            yield _getTrendRow( trend_commits.popleft(), repo_trees, repo_totals, blob_counts )
+    finally:
+        if cache_ is not None:
+            cache_.close()
+
+
+def writeTrends( repo_roots, output_file, branch_func=None, every_n=1, workers=None, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None ):
+    '''
+    Writes the category counts of every every_n-th commit of repo_roots to output_file, and
+    returns the count of analyzed blobs per scan status. branch_func picks the branch of a
+    repository, such as dataset.stats.getBranch
+    '''
+    scan_stats = collections.Counter()
+    with open( output_file, 'w', newline='' ) as csv_file:
+        writer_ = csv.writer( csv_file )
+        writer_.writerow( constants.TREND_HEADER )
+        for row_ in iterTrendRows( repo_roots, branch_func, every_n, workers, timeout_, cache_dir, scan_stats ):
+            writer_.writerow( row_ )
+    return scan_stats
+
+
+if __name__=='__main__':
+    parser_ = argparse.ArgumentParser( description='Write the FAME-ML category counts of each commit of repositories' )
+    parser_.add_argument( 'output_file' )
+    parser_.add_argument( 'repo_roots', nargs='+' )
+    parser_.add_argument( '--zoo', action='store_true', help='every repo_root is a folder of repositories' )
+    parser_.add_argument( '--branch', default=constants.TREND_BRANCH )
+    parser_.add_argument( '--every', type=int, default=1, help='count every n-th commit of the branch' )
+    parser_.add_argument( '--workers', type=int, default=None )
+    parser_.add_argument( '--timeout', type=float, default=constants.SCAN_FILE_TIMEOUT )
+    parser_.add_argument( '--cache-dir', default=None )
+    args_ = parser_.parse_args()
+
+    repo_roots = args_.repo_roots
+    if args_.zoo:
+        repo_roots = [ repo_ for parent_dir in args_.repo_roots for repo_ in scanner.getRepoRoots( parent_dir ) ]
+    scan_stats = writeTrends( repo_roots, args_.output_file, lambda repo_root: args_.branch, args_.every, args_.workers, args_.timeout, args_.cache_dir )
+    print( dict( scan_stats ) )
@@ -0,0 +1,115 @@
+'''
+Shared line counting for the SLOC and file length metrics ... files are read as bytes (mapped
+when large) and their newlines counted with py_parser.countLines, in a pool of threads.
+Counts are cached by path together with the file's mtime and size, in memory and optionally in
+a SQLite store under a cache dir, so every report and dataset reuses them
+'''
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+import constants
+import py_parser
+
+
+def getFileKey( py_file ):
+    stat_ = os.stat( py_file )
+    return stat_.st_mtime_ns, stat_.st_size
+
+
+def countFileLines( py_file ):
+    '''
+    lines of one file, as iterating it in text mode counts them
+    '''
+    return py_parser.countLines( py_parser.getPythonSource( py_file ) )
+
+
+class LineCountCache(object):
+    '''
+    Line counts keyed by path, valid while the mtime and size of the file are unchanged ... kept
+    in memory, and in cache_dir when one is given
+    '''
+    def __init__(self, cache_dir=None):
+        self.counts_    = {}
+        self.hits, self.misses = 0, 0
+        self.connection = None
+        if cache_dir is not None:
+            os.makedirs( cache_dir, exist_ok=True )
+            self.connection = sqlite3.connect( os.path.join( cache_dir, constants.LINE_COUNT_CACHE_FILE ) )
+            self.connection.execute( 'CREATE TABLE IF NOT EXISTS line_counts ( path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, '
+                                     'size INTEGER NOT NULL, line_count INTEGER NOT NULL )' )
+
+    def get(self, py_file, file_key):
+        cached_ = self.counts_.get( py_file )
+        if cached_ is None and self.connection is not None:
+            row_ = self.connection.execute( 'SELECT mtime_ns, size, line_count FROM line_counts WHERE path = ?', ( py_file, ) ).fetchone()
+            if row_ is not None:
+                cached_ = self.counts_[py_file] = ( ( row_[0], row_[1] ), row_[2] )
+        if cached_ is None or cached_[0] != file_key:
+            return None
+        return cached_[1]
+
+    def put(self, py_file, file_key, line_count):
+        self.counts_[py_file] = ( file_key, line_count )
+        if self.connection is not None:
+            self.connection.execute( 'INSERT OR REPLACE INTO line_counts VALUES ( ?, ?, ?, ? )', ( py_file, file_key[0], file_key[1], line_count ) )
+
+    def commit(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_line_cache = LineCountCache()
+
+
+def setLineCountCache( cache_ ):
+    '''
+    makes cache_, such as a LineCountCache kept under a cache dir, the default of this process
+    and returns the previous one
+    '''
+    global _line_cache
+    previous_cache, _line_cache = _line_cache, cache_
+    return previous_cache
+
+
+def getLineCounts( py_files, workers=None, cache_=None ):
+    '''
+    { file : line count } ... files whose mtime and size did not change since they were last
+    counted come from cache_ ( the process wide in-memory cache by default ), the others are
+    counted in parallel
+    '''
+    cache_      = cache_ if cache_ is not None else _line_cache
+    line_counts = {}
+    file_keys   = {}
+    for py_file in py_files:
+        file_keys[py_file] = getFileKey( py_file )
+        line_count = cache_.get( py_file, file_keys[py_file] )
+        if line_count is None:
+            cache_.misses += 1
+        else:
+            cache_.hits += 1
+            line_counts[py_file] = line_count
+    uncounted_files = [ py_file for py_file in file_keys if py_file not in line_counts ]
+    if uncounted_files:
+        with ThreadPoolExecutor( max_workers=workers ) as executor:
+            for py_file, line_count in zip( uncounted_files, executor.map( countFileLines, uncounted_files ) ):
+                cache_.put( py_file, file_keys[py_file], line_count )
+                line_counts[py_file] = line_count
+        cache_.commit()
+    return line_counts
+
+
+def getTotalLines( py_files, workers=None, cache_=None ):
+    return sum( getLineCounts( py_files, workers, cache_ ).values() )
@@ -5,649 +5,479 @@ Oct 20, 2020
 Executes the pattern matching and data flow analysis 
 '''
 
+import collections
+import hashlib
+import inspect
+import re
+import unicodedata
+import weakref
+import event_sink
 import py_parser
 import constants 
 
+
+'''
+Rule tables ... each table maps the key of one extracted record straight to the detectors
+that count it, so a record is classified for every detector with a single lookup
+'''
+ATTRIB_CALL_RULES    = {}  # (class_name, func_name) of py_parser.getPythonAtrributeFuncs
+ASSIGNMENT_RULES     = {}  # func_name of py_parser.getFunctionAssignments
+DEFINITION_RULES     = {}  # func_name of py_parser.getFunctionDefinitions
+MULTI_LHS_RULES      = {}  # func_name of py_parser.getFunctionAssignmentsWithMultipleLHS
+FEATURE_RULES        = {}  # (class_name, feature_name) of py_parser.getModelFeature
+TUP_ASSIGNMENT_RULES = {}  # (var_s, var_d, rhs_var_iter) of py_parser.getTupAssiDetails
+DETECTOR_CONSOLE_STR = {}  # detector name -> category of its events, None for silent detectors
+
+
+'''
+Matchers ... given a record whose key hit a rule, return how many events the record adds
+'''
+def _always( record_ ):
+    return 1
+
+def _withArgs( record_ ):
+    return 1 if len( record_.arg_names ) > 0 else 0
+
+def _withFewArgs( record_ ):
+    return 1 if len( record_.arg_names ) < 3 else 0
+
+def _labelVarsWithArgs( record_ ):
+    if len( record_.arg_names ) > 0:
+        return len( [ var_name for var_name in record_.owner if constants.LABEL_KW in var_name ] )
+    return 0
+
+def _labelLHS( record_ ):
+    return 1 if constants.LABEL_KW in record_[0] else 0
+
+
+def _addRules( rule_table, detector_name, console_str, matcher_, rule_keys ):
+    DETECTOR_CONSOLE_STR[detector_name] = console_str
+    for key_ in rule_keys:
+        rule_table[key_] = rule_table.get( key_, () ) + ( ( detector_name, matcher_ ), )
+
+
+_addRules( ATTRIB_CALL_RULES, 'getDataLoadCount', constants.CONSOLE_STR_DATA_LOAD, _always, [
+    ( constants.TORCH_KW,               constants.LOAD_KW ),
+    ( constants.DATA_KW,                constants.LOAD_KW ),
+    ( constants.PICKLE_KW,              constants.LOAD_KW ),
+    ( constants.JSON_KW,                constants.LOAD_KW ),
+    ( constants.NP_KW,                  constants.LOAD_KW ),
+    ( constants.LATEST_BLOB_KW,         constants.DOWNLOAD_TO_FILENAME_KW ),
+    ( constants.BLOB_KW,                constants.UPLOAD_FROM_FILENAME_KW ),
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # ( constants.VISDOM_LOGGER_KW,     constants.LOAD_PREVIOUS_VALUES_KW ),
+    ( constants.COCO_GT_KW,             constants.LOADRES_KW ),
+    ( constants.YAML_KW,                constants.LOAD_KW ),
+    ( constants.HUB_KW,                 constants.LOAD_KW ),
+    ( constants.DATA_LOADER_FACTORY_KW, constants.GET_DATA_LOADER_KW ),
+    ( constants.IO_KW,                  constants.READ_FILE_KW ),
+    ( constants.DATASET_KW,             constants.TENSOR_SLICE_KW ),
+    ( constants.SP_MODEL_KW,            constants.LOAD_CAPITAL_KW ),
+    ( constants.TAGGING_DATA_LOADER_KW, constants.LOAD_KW ),
+    ( constants.PD_KW,                  constants.READ_CSV_KW ),
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # ( constants.FILES_KW,             constants.LOAD_FILES_LIST_KW ),
+    ( constants.IBROSA_KW,              constants.LOAD_KW ),
+    ( constants.DATA_UTILS_KW,          constants.LOAD_CELEBA_KW ),
+    ( constants.DSET_KW,                constants.MNIST_KW ),
+    ( constants.TARFILE_KW,             constants.OPEN_KW ),
+    ( constants.AUDIO_KW,               constants.LOAD_WAV_KW ),
+    ( constants.IMAGE_KW,               constants.OPEN_KW ),
+    ( constants.REPLAY_BUFFER_KW,       constants.LOAD_KW ),
+    ( constants.H5PY_KW,                constants.FILE_KW ),
+])
+
+_addRules( ASSIGNMENT_RULES, 'getDataLoadCountb', constants.CONSOLE_STR_DATA_LOAD, _withArgs, [
+    constants.GET_LOADER_KW,
+    constants.FROM_BUFFER_KW,
+])
+
+_addRules( DEFINITION_RULES, 'getDataLoadCountc', constants.CONSOLE_STR_DATA_LOAD, _withArgs, [
+    constants.LOAD_RANDOMLY_AUGMENTED_AUDIO_KW,
+    constants._DOWNLOAD_KW,
+    constants.OPEN_KW,
+    constants.LOAD_KW,
+    constants.LOAD_GENERIC_AUDIO_KW,
+    constants.LOAD_AUDIO_KW,
+    constants.LOAD_IMAGE_DATASET_KW,
+    constants.DOWNLOAD_FROM_URL_KW,
+    constants.GET_RAW_FILES_KW,
+    constants.LOAD_VOCAB_FILE_KW,
+    constants.LOAD_ATTRIBUTE_DATASET_KW,
+    constants.READ_H5FILE_KW,
+    constants.LOAD_LUA_KW,
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getModelLoadCounta', constants.CONSOLE_STR_MODEL_LOAD, _always, [
+    ( constants.DEEP_SPEECH_KW,  constants.LOAD_MODEL_PACKAGE_KW ),
+    ( constants.MODELS_KW,       constants.LOAD_MODEL_KW ),
+    ( constants.MODEL_KW,        constants.LOAD_STATE_DICT_KW ),
+    ( constants.NETWORK_KW,      constants.LOAD_NET_KW ),
+    ( constants.VGG_KW,          constants.LOAD_FROM_NPY_FILE_KW ),
+    ( constants.CAFFE_PARSER_KW, constants.READ_CAFFE_MODEL_KW ),
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # ( constants.TRAIN_KW,      constants.CHECK_POINT_KW ),
+    # ( constants.TF_HUB_KW,     constants.LOAD_KW ),
+    # ( constants.MISC_KW,       constants.IMRE_SIZE_KW ),
+])
+
+_addRules( ASSIGNMENT_RULES, 'getModelLoadCountb', constants.CONSOLE_STR_MODEL_LOAD, _withArgs, [
+    constants.PATCH_PATH_KW,
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # constants.CAFFE_FUNCTION_KW,
+])
+
+_addRules( DEFINITION_RULES, 'getModelLoadCountc', constants.CONSOLE_STR_MODEL_LOAD, _withArgs, [
+    constants.LOAD_MODEL_KW,
+    constants.LOAD_DECODER_KW,
+    constants.LOAD_PREVIOUS_VALUES_KW,
+    constants.LOAD_PRETRAINED_KW,
+    constants.LOAD_PARAM_KW,
+])
+
+_addRules( MULTI_LHS_RULES, 'getModelLoadCountd', constants.CONSOLE_STR_MODEL_LOAD, _withArgs, [
+    constants.SEQ_LABEL_KW,
+    constants.LOAD_CHECKPOINT_KW,
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getDataDownLoadCount', constants.CONSOLE_STR_DATA_DLOAD, _always, [
+    ( constants.WGET_KW,      constants.DOWNLOAD_KW ),
+    ( constants.REQUEST_KW,   constants.URL_OPEN_KW ),
+    ( constants.MODEL_ZOO_KW, constants.LOAD_URL_KW ),
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # ( constants.URL_LIB_KW, constants.URL_RETRIEVE_KW ),
+    ( constants.AGENT_KW,     constants.LOAD_KW ),
+])
+
+_addRules( DEFINITION_RULES, 'getDataDownLoadCountb', constants.CONSOLE_STR_DATA_DLOAD, _withArgs, [
+    constants.PREPARE_URL_IMAGE_KW,
+])
+
+_addRules( FEATURE_RULES, 'getModelFeatureCount', constants.CONSOLE_STR_MODEL_FEATURE, _always, [
+    ( constants.DATA_KW, constants.HP_BATCH_SIZE_KW ),
+])
+
+_addRules( MULTI_LHS_RULES, 'getModelLabelCount', constants.CONSOLE_STR_MODEL_LABEL, _labelVarsWithArgs, [
+    constants.READ_H5FILE_KW,
+    constants.ARRAY_KW,
+    constants.CONVERT_KW,
+    constants.AS_TYPE_KW,
+    constants.LOAD_DATA_AND_LABELS_KW,
+    constants.CREATE_DATASET_KW,
+])
+
+_addRules( TUP_ASSIGNMENT_RULES, 'getModelLabelCountb', constants.CONSOLE_STR_MODEL_LABEL, _labelLHS, [
+    ( constants.SENT_KW, constants.SENT_KW, constants.INPUT_BATCH_LIST_KW ),
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getModelOutputCount', constants.CONSOLE_STR_MODEL_OUTPUT, _always, [
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # ( constants.MODEL_KW, constants.SUMMARY_KW ),
+    ( constants.DATA_KW, constants.SHOW_DATA_SUMMARY_KW ),
+])
+
+_addRules( ASSIGNMENT_RULES, 'getModelOutputCountb', constants.CONSOLE_STR_MODEL_OUTPUT, _withArgs, [
+    constants.GET_TENSOR_KW,
+    constants.EVALUATE_KW,
+])
+_addRules( ASSIGNMENT_RULES, 'getModelOutputCountb', constants.CONSOLE_STR_MODEL_OUTPUT, _always, [
+    constants.EVAL_KW,
+])
+
+_addRules( ASSIGNMENT_RULES, 'getModelOutputCountc', constants.CONSOLE_STR_MODEL_OUTPUT, _withArgs, [
+    # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # constants.CONFUSION_MATRIX_KW,
+    constants.F1_SCORE_KW,
+    constants.ACCURACY_SCORE_KW,
+    constants.CLASSIFICATION_LOSS_KW,
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getDataPipelineCount', constants.CONSOLE_STR_PIPELINE, _withArgs, [
+    ( constants.ARG_PARSE_KW, constants.ARGUMENT_PARSER_KW ),
+])
+
+_addRules( ASSIGNMENT_RULES, 'getDataPipelineCountb', constants.CONSOLE_STR_PIPELINE, _always, [
+    constants.TRAIN_EVAL_PIPELINE_CONFIG_KW,
+])
+
+_addRules( DEFINITION_RULES, 'getDataPipelineCountc', constants.CONSOLE_STR_PIPELINE, _withArgs, [
+    constants.GET_CONFIGS_FROM_PIPELINE_FILE_KW,
+])
+
+_addRules( FEATURE_RULES, 'getDataPipelineCountd', constants.CONSOLE_STR_PIPELINE, _always, [
+    ( constants.PIPELINE_CONFIG_KW, constants.MODEL_KW ),
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getEnvironmentCount', constants.CONSOLE_STR_REL_ENV, _withArgs, [
+    ( constants.WRAPPED_ENV_KW, constants.STEP_KW ),
+    ( constants.ENV_KW,         constants.STEP_KW ),
+    ( constants.GYM_KW,         constants.MAKE_KW ),
+])
+
+_addRules( FEATURE_RULES, 'getEnvironmentCountb', constants.CONSOLE_STR_REL_ENV, _always, [
+    ( constants.OBSERVATION_SPACE_KW, constants.SHAPE_KW ),
+    ( constants.ACTION_SPACE_KW,      constants.SHAPE_KW ),
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getStateObserveCount', constants.CONSOLE_STR_REL_ENV, _withArgs, [
+    ( constants.ENV_KW, constants.STEP_KW ),
+])
+
+_addRules( ASSIGNMENT_RULES, 'getDNNDecisionCountb', None, _always, [
+    constants.PREDICT_KW,
+    constants.FIT_KW,
+    constants.EVALUATE_KW,
+    # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # constants.RELU_KW, constants.POINT_NET_CLS_KW, constants.CLS_KW, constants.CASCADED_MODEL_KW,
+    constants.MODEL_KW,
+    # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # constants.PERMUTE_KW, constants.MINIMUM_KW,
+    constants.MODEL_C_KW,
+    # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
+    # constants.GRAPH_KW, constants.VGG_16_GRAPH_KW,
+])
+
+_addRules( ATTRIB_CALL_RULES, 'getIncompleteLoggingCount', None, _withFewArgs, [
+    ( constants.LOGGING_KW, constants.GET_LOGGER_KW ),
+    ( constants.LOGGING_KW, constants.BASIC_CONFIG_KW ),
+    ( constants.LOGGER_KW,  constants.INFO_KW ),
+    ( constants.TF_KW,      constants.LOGGING_KW ),
+    ( constants.LOGGING_KW, constants.INFO_KW ),
+])
+
+
+'''
+Keyword prefilter ... a record can only hit a rule if every name in the rule key occurs in the
+source, so the raw bytes are scanned once for all rule keywords and files that cannot satisfy
+any rule key are never parsed
+'''
+RULE_TABLES = ( ATTRIB_CALL_RULES, ASSIGNMENT_RULES, DEFINITION_RULES, MULTI_LHS_RULES, FEATURE_RULES, TUP_ASSIGNMENT_RULES )
+
+
+def _ruleKeywordSets():
+    keyword_sets = set()
+    for rule_table in RULE_TABLES:
+        for key_ in rule_table:
+            key_ = key_ if isinstance( key_, tuple ) else ( key_, )
+            keyword_sets.add( frozenset( keyword_.encode() for keyword_ in key_ ) )
+    return keyword_sets
+
+RULE_KEYWORD_SETS = _ruleKeywordSets()
+
+# longest first, so a keyword is not shadowed by a shorter keyword it starts with
+RULE_KEYWORD_PATTERN = re.compile( b'|'.join( re.escape( keyword_ ) for keyword_ in
+                                   sorted( set().union( *RULE_KEYWORD_SETS ), key=len, reverse=True ) ) )
+
+PREFILTER_STATS = collections.Counter()
+_prefilter_hits = weakref.WeakKeyDictionary()
+
+
+_NON_ASCII = re.compile( b'[\x80-\xff]' )
+
+def _prefilterSource( py_source ):
+    '''
+    Bytes the prefilter matches on, or None when only the parser can judge the file
+    '''
+    if not py_parser.isParsableSource( py_source ):
+        # parses to an empty tree, so there is nothing to find
+        return b''
+    if _NON_ASCII.search( py_source ) is not None:
+        # identifiers are NFKC normalized by the parser, so match on the normalized text
+        try:
+            py_source = unicodedata.normalize( 'NFKC', py_parser.decodePythonSource( py_source ) ).encode( 'utf-8', 'surrogatepass' )
+        except ( SyntaxError, ValueError ):
+            return None
+    return py_source
+
+
+def hasRuleKeywords( py_source ):
+    '''
+    True if the source bytes hold every keyword of at least one rule key
+    '''
+    py_source = _prefilterSource( py_source )
+    if py_source is None:
+        return True
+    found_keywords = set( RULE_KEYWORD_PATTERN.findall( py_source ) )
+    return any( keyword_set <= found_keywords for keyword_set in RULE_KEYWORD_SETS )
+
+
+def passesPrefilter( py_file ):
+    '''
+    Runs the keyword prefilter once per file analysis and records the outcome in PREFILTER_STATS
+    '''
+    analysis = py_parser.getFileAnalysis(py_file)
+    hit_ = _prefilter_hits.get( analysis )
+    if hit_ is None:
+        hit_ = hasRuleKeywords( analysis.source )
+        _prefilter_hits[analysis] = hit_
+        PREFILTER_STATS['FILES_SCANNED'] += 1
+        PREFILTER_STATS['FILES_MATCHED' if hit_ else 'FILES_SKIPPED'] += 1
+    return hit_
+
+
+def getPrefilterStats():
+    files_scanned = PREFILTER_STATS['FILES_SCANNED']
+    files_skipped = PREFILTER_STATS['FILES_SKIPPED']
+    return {
+        'FILES_SCANNED': files_scanned,
+        'FILES_MATCHED': PREFILTER_STATS['FILES_MATCHED'],
+        'FILES_SKIPPED': files_skipped,
+        'SKIP_RATE':     float( files_skipped ) / files_scanned if files_scanned > 0 else 0.0,
+    }
+
+
+def resetPrefilterStats():
+    PREFILTER_STATS.clear()
+
+
+_tree_matches = weakref.WeakKeyDictionary()
+
+def classifyRecords( py_file ):
+    '''
+    Classifies every extracted record of a file against the rule tables, one lookup per record,
+    and returns the ( line, class_name, func_name ) matches of each detector ... done once per parsed tree
+    '''
+    analysis = py_parser.getFileAnalysis(py_file)
+    if not passesPrefilter( analysis ):
+        return collections.defaultdict(list)
+    matches  = _tree_matches.get( analysis.tree )
+    if matches is None:
+        matches = collections.defaultdict(list)
+        records = analysis.records
+        for record_ in records.attrib_calls:
+            for detector_name, matcher_ in ATTRIB_CALL_RULES.get( ( record_.owner, record_.func_name ), () ):
+                matches[detector_name].extend( [ ( record_.line, record_.owner, record_.func_name ) ] * matcher_( record_ ) )
+        for rule_table, call_records in ( ( ASSIGNMENT_RULES, records.func_assignments ),
+                                          ( DEFINITION_RULES, records.func_definitions ),
+                                          ( MULTI_LHS_RULES,  records.multi_lhs_assignments ) ):
+            for record_ in call_records:
+                for detector_name, matcher_ in rule_table.get( record_.func_name, () ):
+                    matches[detector_name].extend( [ ( record_.line, constants.EMPTY_STRING, record_.func_name ) ] * matcher_( record_ ) )
+        for record_ in records.model_features:
+            lhs, class_name, feature_name, feature_line = record_
+            for detector_name, matcher_ in FEATURE_RULES.get( ( class_name, feature_name ), () ):
+                matches[detector_name].extend( [ ( feature_line, class_name, feature_name ) ] * matcher_( record_ ) )
+        for record_ in records.tup_assignments:
+            lhs, var_s, var_d, rhs_var_iter, func_line = record_
+            for detector_name, matcher_ in TUP_ASSIGNMENT_RULES.get( ( var_s, var_d, rhs_var_iter ), () ):
+                matches[detector_name].extend( [ ( func_line, constants.EMPTY_STRING, rhs_var_iter ) ] * matcher_( record_ ) )
+        _tree_matches[analysis.tree] = matches
+    return matches
+
+
+_event_sink = event_sink.ConsoleSink()
+
+def setEventSink( sink_ ):
+    '''
+    Sets the sink the detectors emit their events into and returns the previous one ... direct
+    detector calls print to the console unless another sink is set
+    '''
+    global _event_sink
+    previous_sink, _event_sink = _event_sink, sink_
+    return previous_sink
+
+
+def _detectorCount( py_file, detector_name ):
+    analysis      = py_parser.getFileAnalysis(py_file)
+    if not passesPrefilter( analysis ):
+        return 0
+    matches_      = classifyRecords( analysis ).get( detector_name, [] )
+    console_str   = DETECTOR_CONSOLE_STR[detector_name]
+    if console_str is not None:
+        for func_line, class_name, func_name in matches_:
+            _event_sink.emit( event_sink.Event( console_str, analysis.path, func_line, class_name, func_name ) )
+    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( analysis.tree, constants.DUMMY_LOG_KW )
+    return len( matches_ )
+
+
 def getDataLoadCount( py_file ):
-    data_load_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        if(( class_name == constants.TORCH_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.DATA_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.PICKLE_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.JSON_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.NP_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.LATEST_BLOB_KW ) and (func_name == constants.DOWNLOAD_TO_FILENAME_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.BLOB_KW ) and (func_name == constants.UPLOAD_FROM_FILENAME_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md 
-        # elif(( class_name == constants.VISDOM_LOGGER_KW ) and (func_name == constants.LOAD_PREVIOUS_VALUES_KW ) ):
-        #     data_load_count += 1 
-        #     # print(def_)
-            
-        elif(( class_name == constants.COCO_GT_KW ) and (func_name == constants.LOADRES_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.YAML_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.HUB_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.DATA_LOADER_FACTORY_KW ) and (func_name == constants.GET_DATA_LOADER_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.IO_KW ) and (func_name == constants.READ_FILE_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.DATASET_KW ) and (func_name == constants.TENSOR_SLICE_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.SP_MODEL_KW ) and (func_name == constants.LOAD_CAPITAL_KW) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.TAGGING_DATA_LOADER_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.PD_KW ) and (func_name == constants.READ_CSV_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-        # elif(( class_name == constants.FILES_KW ) and (func_name == constants.LOAD_FILES_LIST_KW ) ):
-        #     data_load_count += 1 
-            
-        elif(( class_name == constants.IBROSA_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.DATA_UTILS_KW ) and (func_name == constants.LOAD_CELEBA_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.DSET_KW ) and (func_name == constants.MNIST_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.TARFILE_KW ) and (func_name == constants.OPEN_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.AUDIO_KW ) and (func_name == constants.LOAD_WAV_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.IMAGE_KW) and (func_name == constants.OPEN_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-                    
-        elif(( class_name == constants.REPLAY_BUFFER_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.H5PY_KW ) and (func_name == constants.FILE_KW ) ):
-            data_load_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-
-    # LOGGING_IS_ON_FLAG = py_parser.checkLogging( py_tree,  func_def_list, 'akond' )
-    # this will be used to check if the file_name passed in as file to read, is logged  
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_load_count) 
-    return data_load_count 
-    
-    
+    return _detectorCount( py_file, 'getDataLoadCount' )
+
+
 def getDataLoadCountb( py_file ):
-    data_load_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignments( py_tree ) 
-
-    for assign_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = assign_ 
-        
-        if( (func_name == constants.GET_LOADER_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-        
-        elif( (func_name == constants.FROM_BUFFER_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_load_countb) 
-    return data_load_countb 
+    return _detectorCount( py_file, 'getDataLoadCountb' )
 
 
 def getDataLoadCountc( py_file ):
-    data_load_countc = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionDefinitions( py_tree ) 
-    for func_ in func_assign_list:
-        func_name, func_line, func_arg_list = func_ 
-        
-        if( (func_name == constants.LOAD_RANDOMLY_AUGMENTED_AUDIO_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants._DOWNLOAD_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.OPEN_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_GENERIC_AUDIO_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_AUDIO_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_IMAGE_DATASET_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.DOWNLOAD_FROM_URL_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.GET_RAW_FILES_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_VOCAB_FILE_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_ATTRIBUTE_DATASET_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.READ_H5FILE_KW ) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_LUA_KW) and (len(func_arg_list) > 0) ):
-            data_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_LOAD, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_load_countc) 
-    return data_load_countc 
+    return _detectorCount( py_file, 'getDataLoadCountc' )
 
 
 def getModelLoadCounta( py_file ):
-    model_load_counta = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        if(( class_name == constants.DEEP_SPEECH_KW ) and (func_name == constants.LOAD_MODEL_PACKAGE_KW) ):
-            model_load_counta += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-        
-        elif(( class_name == constants.MODELS_KW ) and (func_name == constants.LOAD_MODEL_KW) ):
-            model_load_counta += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.MODEL_KW ) and (func_name == constants.LOAD_STATE_DICT_KW) ):
-            model_load_counta += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.NETWORK_KW ) and (func_name == constants.LOAD_NET_KW) ):
-            model_load_counta += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.VGG_KW ) and (func_name == constants.LOAD_FROM_NPY_FILE_KW) ):
-            model_load_counta += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.CAFFE_PARSER_KW ) and (func_name == constants.READ_CAFFE_MODEL_KW) ):
-            model_load_counta += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md     
-        # elif(( class_name == constants.TRAIN_KW ) and (func_name == constants.CHECK_POINT_KW) ):
-        #     model_load_counta += 1 
-            
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md     
-        # elif(( class_name == constants.TF_HUB_KW ) and (func_name == constants.LOAD_KW) ):
-        #     model_load_counta += 1 
-            
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md     
-        # elif(( class_name == constants.MISC_KW ) and (func_name == constants.IMRE_SIZE_KW) ):
-        #     model_load_counta += 1 
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW )    
-    # print(LOGGING_IS_ON_FLAG, model_load_counta) 
-    return model_load_counta 
-    
-    
+    return _detectorCount( py_file, 'getModelLoadCounta' )
+
+
 def getModelLoadCountb( py_file ):
-    model_load_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignments( py_tree ) 
-
-    for assign_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = assign_ 
-        
-        if( (func_name == constants.PATCH_PATH_KW  ) and (len(func_arg_list) > 0) ):
-            model_load_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-        
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md     
-        # elif( (func_name == constants.CAFFE_FUNCTION_KW ) and (len(func_arg_list) > 0) ):
-        #     model_load_countb += 1 
-        #     # print(assign_)
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_load_countb) 
-    return model_load_countb 
-    
-    
+    return _detectorCount( py_file, 'getModelLoadCountb' )
+
+
 def getModelLoadCountc( py_file ):
-    model_load_countc = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionDefinitions( py_tree ) 
-    for func_ in func_assign_list:
-        func_name, func_line, func_arg_list = func_ 
-        
-        if( (func_name == constants.LOAD_MODEL_KW ) and (len(func_arg_list) > 0) ):
-            model_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-
-        elif( (func_name == constants.LOAD_DECODER_KW ) and (len(func_arg_list) > 0) ):
-            model_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_PREVIOUS_VALUES_KW ) and (len(func_arg_list) > 0) ):
-            model_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_PRETRAINED_KW ) and (len(func_arg_list) > 0) ):
-            model_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-        elif( (func_name == constants.LOAD_PARAM_KW ) and (len(func_arg_list) > 0) ):
-            model_load_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_load_countc) 
-    return model_load_countc 
-    
-    
+    return _detectorCount( py_file, 'getModelLoadCountc' )
+
+
 def getModelLoadCountd( py_file ):
-    model_load_countd = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignmentsWithMultipleLHS( py_tree ) 
-    for assign_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = assign_ 
-        
-        if( (func_name == constants.SEQ_LABEL_KW  ) and (len(func_arg_list) > 0) ):
-            model_load_countd += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-        
-        elif( (func_name == constants.LOAD_CHECKPOINT_KW ) and (len(func_arg_list) > 0) ):
-            model_load_countd += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LOAD, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_load_countd) 
-    return model_load_countd 
-    
-    
+    return _detectorCount( py_file, 'getModelLoadCountd' )
+
+
 def getDataDownLoadCount( py_file ):
-    data_download_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        if(( class_name == constants.WGET_KW ) and (func_name == constants.DOWNLOAD_KW ) ):
-            data_download_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_DLOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.REQUEST_KW ) and (func_name == constants.URL_OPEN_KW ) ):
-            data_download_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_DLOAD, func_line , py_file  ) )
-            
-        elif(( class_name == constants.MODEL_ZOO_KW ) and (func_name == constants.LOAD_URL_KW ) ):
-            data_download_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_DLOAD, func_line , py_file  ) )
-            
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-        # elif(( class_name == constants.URL_LIB_KW  ) and (func_name == constants.URL_RETRIEVE_KW ) ):
-        #     data_download_count += 1 
-            
-        elif(( class_name == constants.AGENT_KW ) and (func_name == constants.LOAD_KW ) ):
-            data_download_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_DLOAD, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_download_count) 
-    return data_download_count 
-    
-    
+    return _detectorCount( py_file, 'getDataDownLoadCount' )
+
+
 def getDataDownLoadCountb( py_file ):
-    data_download_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionDefinitions( py_tree ) 
-    for func_ in func_assign_list:
-        func_name, func_line, func_arg_list = func_ 
-        
-        if( (func_name == constants.PREPARE_URL_IMAGE_KW ) and (len(func_arg_list) > 0) ):
-            data_download_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_DATA_DLOAD, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_download_countb) 
-    return data_download_countb
-            
-            
+    return _detectorCount( py_file, 'getDataDownLoadCountb' )
+
+
 def getModelFeatureCount( py_file ):
-    model_feature_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    feature_list  = py_parser.getModelFeature( py_tree ) 
-    for feature_ in feature_list:
-        lhs, class_name, feature_name, feature_line = feature_ 
-        
-        if( (class_name == constants.DATA_KW ) and (feature_name == constants.HP_BATCH_SIZE_KW ) ):
-            model_feature_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_FEATURE, feature_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG,  model_feature_count) 
-    return model_feature_count
-    
+    return _detectorCount( py_file, 'getModelFeatureCount' )
+
 
 def getModelLabelCount( py_file ):
-    model_label_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignmentsWithMultipleLHS( py_tree ) 
-    for assign_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = assign_ 
-        for var_name in lhs:
-            if ( constants.LABEL_KW in var_name):
-                if( (func_name == constants.READ_H5FILE_KW  ) and (len(func_arg_list) > 0) ):
-                    model_label_count += 1 
-                    print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-                elif( (func_name == constants.ARRAY_KW ) and (len(func_arg_list) > 0) ):
-                    model_label_count += 1 
-                    print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-                elif( (func_name == constants.CONVERT_KW ) and (len(func_arg_list) > 0) ):
-                    model_label_count += 1 
-                    print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-                elif( (func_name == constants.AS_TYPE_KW ) and (len(func_arg_list) > 0) ):
-                    model_label_count += 1 
-                    print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-                elif( (func_name == constants.LOAD_DATA_AND_LABELS_KW ) and (len(func_arg_list) > 0) ):
-                    model_label_count += 1 
-                    print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-                elif( (func_name == constants.CREATE_DATASET_KW ) and (len(func_arg_list) > 0) ):
-                    model_label_count += 1 
-                    print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_label_count) 
-    return model_label_count 
-    
+    return _detectorCount( py_file, 'getModelLabelCount' )
+
 
 def getModelLabelCountb( py_file ):
-    model_label_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getTupAssiDetails( py_tree ) 
-    for assign_ in func_assign_list:
-        lhs, var_s, var_d, rhs_var_iter, func_line = assign_ 
-        
-        if ( constants.LABEL_KW in lhs):
-        
-        	if ( (var_s == constants.SENT_KW ) and (var_d == constants.SENT_KW )  and (rhs_var_iter == constants.INPUT_BATCH_LIST_KW ) ):
-        		model_label_countb += 1 
-        		print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_LABEL, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_label_countb) 
-    return model_label_countb 
-    
-    
+    return _detectorCount( py_file, 'getModelLabelCountb' )
+
+
 def getModelOutputCount( py_file ):
-    model_output_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md 
-        # if(( class_name == constants.MODEL_KW ) and (func_name == constants.SUMMARY_KW ) ):
-        #     model_output_count += 1 
-        #     # print(def_)
-            
-        if(( class_name == constants.DATA_KW ) and (func_name == constants.SHOW_DATA_SUMMARY_KW ) ):
-            model_output_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_output_count) 
-    return model_output_count 
-    
+    return _detectorCount( py_file, 'getModelOutputCount' )
+
 
 def getModelOutputCountb( py_file ):
-    model_output_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignments( py_tree ) 
-    for assign_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = assign_ 
-        
-        if( (func_name == constants.GET_TENSOR_KW ) and (len(func_arg_list) > 0) ):
-            model_output_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-            
-        elif( (func_name == constants.EVALUATE_KW ) and (len(func_arg_list) > 0) ):
-            model_output_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-                          
-        elif(( func_name == constants.EVAL_KW ) ):
-            model_output_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_output_countb) 
-    return model_output_countb 
-    
-    
+    return _detectorCount( py_file, 'getModelOutputCountb' )
+
+
 def getModelOutputCountc( py_file ):
-    model_output_countc = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignments( py_tree ) 
-    for func_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = func_ 
-        
-        # # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md 
-        # if( (func_name == constants.CONFUSION_MATRIX_KW ) and (len(func_arg_list) > 0) ):
-        #     model_output_countc += 1 
-        #     # print(func_)
-            
-        if( (func_name == constants.F1_SCORE_KW ) and (len(func_arg_list) > 0) ):
-            model_output_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-            
-        elif( (func_name == constants.ACCURACY_SCORE_KW ) and (len(func_arg_list) > 0) ):
-            model_output_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-            
-        elif( (func_name == constants.CLASSIFICATION_LOSS_KW ) and (len(func_arg_list) > 0) ):
-            model_output_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_MODEL_OUTPUT, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, model_output_countc) 
-    return model_output_countc 
-    
-    
+    return _detectorCount( py_file, 'getModelOutputCountc' )
+
+
 def getDataPipelineCount( py_file ):
-    data_pipeline_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        if(( class_name == constants.ARG_PARSE_KW ) and (func_name == constants.ARGUMENT_PARSER_KW ) and (len(arg_call_list) > 0)):
-            data_pipeline_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_PIPELINE, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_pipeline_count) 
-    return data_pipeline_count 
-    
-    
+    return _detectorCount( py_file, 'getDataPipelineCount' )
+
+
 def getDataPipelineCountb( py_file ):
-    data_pipeline_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionAssignments( py_tree ) 
-    for assign_ in func_assign_list:
-        lhs, func_name, func_line, func_arg_list = assign_ 
-        
-        if( (func_name == constants.TRAIN_EVAL_PIPELINE_CONFIG_KW ) ):
-            data_pipeline_countb += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_PIPELINE, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_pipeline_countb) 
-    return data_pipeline_countb 
+    return _detectorCount( py_file, 'getDataPipelineCountb' )
 
 
 def getDataPipelineCountc( py_file ):
-    data_pipeline_countc = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_assign_list  = py_parser.getFunctionDefinitions( py_tree ) 
-    for func_ in func_assign_list:
-        func_name, func_line, func_arg_list = func_ 
-        
-        if( (func_name == constants.GET_CONFIGS_FROM_PIPELINE_FILE_KW ) and (len(func_arg_list) > 0) ):
-            data_pipeline_countc += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_PIPELINE, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, data_pipeline_countc) 
-    return data_pipeline_countc
-    
+    return _detectorCount( py_file, 'getDataPipelineCountc' )
+
 
 def getDataPipelineCountd( py_file ):
-	data_pipeline_countd = 0 
-	py_tree = py_parser.getPythonParseObject(py_file)
-	feature_list  = py_parser.getModelFeature( py_tree ) 
-	for feature_ in feature_list:
-		lhs, class_name, feature_name, feature_line = feature_ 
-		
-		if( (class_name == constants.PIPELINE_CONFIG_KW  ) and (feature_name == constants.MODEL_KW ) ):
-			data_pipeline_countd += 1 
-			print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_PIPELINE, feature_line , py_file  ) )
-			
-	LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-	# print(LOGGING_IS_ON_FLAG,  data_pipeline_countd) 
-	return data_pipeline_countd
-	
+    return _detectorCount( py_file, 'getDataPipelineCountd' )
+
 
 def getEnvironmentCount( py_file ):
-    environment_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        if(( class_name == constants.WRAPPED_ENV_KW ) and (func_name == constants.STEP_KW ) and (len(arg_call_list) > 0)):
-            environment_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_REL_ENV, func_line , py_file  ) )
-            
-        elif(( class_name == constants.ENV_KW ) and (func_name == constants.STEP_KW ) and (len(arg_call_list) > 0)):
-            environment_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_REL_ENV, func_line , py_file  ) )
-            
-        elif(( class_name == constants.GYM_KW ) and (func_name == constants.MAKE_KW ) and (len(arg_call_list) > 0)):
-            environment_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_REL_ENV, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, environment_count) 
-    return environment_count 
-	
+    return _detectorCount( py_file, 'getEnvironmentCount' )
+
 
 def getEnvironmentCountb( py_file ):
-	environment_countb = 0 
-	py_tree = py_parser.getPythonParseObject(py_file)
-	feature_list  = py_parser.getModelFeature( py_tree ) 
-	for feature_ in feature_list:
-		lhs, class_name, feature_name, feature_line = feature_ 
-		
-		if( (class_name == constants.OBSERVATION_SPACE_KW  ) and (feature_name == constants.SHAPE_KW ) ):
-			environment_countb += 1 
-			print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_REL_ENV, feature_line , py_file  ) )
-			
-		elif( (class_name == constants.ACTION_SPACE_KW  ) and (feature_name == constants.SHAPE_KW ) ):
-			environment_countb += 1 
-			print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_REL_ENV, feature_line , py_file  ) )
-			
-	LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-	# print(LOGGING_IS_ON_FLAG, environment_countb) 
-	return environment_countb
-	
+    return _detectorCount( py_file, 'getEnvironmentCountb' )
+
 
 def getStateObserveCount( py_file ):
-    state_observe_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-    func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-    for def_ in func_def_list:
-        class_name, func_name, func_line, arg_call_list = def_ 
-        
-        if(( class_name == constants.ENV_KW ) and (func_name == constants.STEP_KW ) and (len(arg_call_list) > 0)):
-            state_observe_count += 1 
-            print( constants.CONSOLE_STR_DISPLAY.format( constants.CONSOLE_STR_REL_ENV, func_line , py_file  ) )
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, state_observe_count) 
-    return state_observe_count 
-    
-    
+    return _detectorCount( py_file, 'getStateObserveCount' )
+
+
 def getDNNImportStatus( py_tree ):
     status = False 
     import_list  = py_parser.getImport( py_tree ) 
@@ -659,127 +489,118 @@ def getDNNImportStatus( py_tree ):
             status = True 
     return status 
 
-    
+
 def getDNNDecisionCountb( py_file ):
-    dnn_decision_countb = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
-
-    if( getDNNImportStatus( py_tree  ) ):
-        func_assign_list  = py_parser.getFunctionAssignments( py_tree ) 
-        for assign_ in func_assign_list:
-            lhs, func_name, func_line, func_arg_list = assign_ 
-        
-            if( (func_name == constants.PREDICT_KW ) ):
-                dnn_decision_countb += 1 
-            elif( (func_name == constants.FIT_KW ) ):
-                dnn_decision_countb += 1                 
-            elif( (func_name == constants.EVALUATE_KW ) ):
-                dnn_decision_countb += 1 
-                
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-            # elif( (func_name == constants.RELU_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-                
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-            # elif( (func_name == constants.POINT_NET_CLS_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-                
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-            # elif( (func_name == constants.CLS_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-                
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-            # elif( (func_name == constants.CASCADED_MODEL_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-                
-            elif( (func_name == constants.MODEL_KW ) ):
-                dnn_decision_countb += 1 
-                # print(assign_)
-                
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-            # elif( (func_name == constants.PERMUTE_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-                
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md
-            # elif( (func_name == constants.MINIMUM_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-                
-            elif( (func_name == constants.MODEL_C_KW ) ):
-                dnn_decision_countb += 1 
-                # print(assign_)
-
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md            
-            # elif( (func_name == constants.GRAPH_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-
-            # skipping as per https://github.com/paser-group/MLForensics/blob/farzana/Verb.Object.Mapping.md             
-            # elif( (func_name == constants.VGG_16_GRAPH_KW ) ):
-            #     dnn_decision_countb += 1 
-            #     # print(assign_)
-            
-    LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-    # print(LOGGING_IS_ON_FLAG, dnn_decision_countb) 
-    return dnn_decision_countb 
-    
+    dnn_decision_countb = 0
+    analysis = py_parser.getFileAnalysis(py_file)
+    if( passesPrefilter( analysis ) and getDNNImportStatus( analysis.tree  ) ):
+        dnn_decision_countb = _detectorCount( analysis, 'getDNNDecisionCountb' )
+    return dnn_decision_countb
+
 
 def getExcepts( py_file ) :
-    py_tree = py_parser.getPythonParseObject(py_file)
+    analysis = py_parser.getFileAnalysis(py_file)
+    py_file, py_tree = analysis.path, analysis.tree
     except_list  = py_parser.getPythonExcepts( py_tree )  
     except_func_list = py_parser.checkAttribFuncsInExcept( except_list )    
     EXCEPT_LOGGING_IS_ON_FLAG = py_parser.checkExceptLogging( except_func_list )      
     # print(EXCEPT_LOGGING_IS_ON_FLAG) 
     return EXCEPT_LOGGING_IS_ON_FLAG
-    
+
 
 def checkLoggingLibrary( py_file ):
     incomplete_logging_count = 0 
-    py_tree = py_parser.getPythonParseObject(py_file)
+    analysis = py_parser.getFileAnalysis(py_file)
+    py_file, py_tree = analysis.path, analysis.tree
     import_list  = py_parser.getImport( py_tree ) 
     for import_ in import_list:
         library_ = import_ 
-        
+
         if( (library_ == constants.LOGGING_KW ) or (library_ == constants.TENSORFLOW_KW ) or (library_ == constants.SYMNET_KW )):
         	# print(library_)
         	return True
         else:
         	return False 
-    
+
 
 def getIncompleteLoggingCount( py_file ):
-	incomplete_logging_count = 0 
-	if(checkLoggingLibrary):
-		py_tree = py_parser.getPythonParseObject(py_file)
-		func_def_list  = py_parser.getPythonAtrributeFuncs( py_tree ) 
-		for def_ in func_def_list:
-			class_name, func_name, func_line, arg_call_list = def_ 
-			
-			if(( class_name == constants.LOGGING_KW  ) and (func_name == constants.GET_LOGGER_KW ) and (len(arg_call_list) < 3) ):
-				incomplete_logging_count += 1 
-				# print(def_)
-
-			elif(( class_name == constants.LOGGING_KW ) and (func_name == constants.BASIC_CONFIG_KW ) and (len(arg_call_list) < 3) ):
-				incomplete_logging_count += 1 
-				# print(def_) 
-            
-			elif(( class_name == constants.LOGGER_KW ) and (func_name == constants.INFO_KW ) and (len(arg_call_list) < 3) ):
-				incomplete_logging_count += 1 
-				# print(def_)
-				
-			elif(( class_name == constants.TF_KW ) and (func_name == constants.LOGGING_KW ) and (len(arg_call_list) < 3) ):
-				incomplete_logging_count += 1 
-				# print(def_)
-				
-			elif(( class_name == constants.LOGGING_KW ) and (func_name == constants.INFO_KW) and (len(arg_call_list) < 3) ):
-				incomplete_logging_count += 1 
-				# print(def_)
-				
-	LOGGING_IS_ON_FLAG = py_parser.checkLoggingPerData( py_tree, constants.DUMMY_LOG_KW ) 
-	# print(LOGGING_IS_ON_FLAG, incomplete_logging_count) 
-	return incomplete_logging_count 
\ No newline at end of file
+    return _detectorCount( py_file, 'getIncompleteLoggingCount' )
+
+
+def getLoggingFlags( py_file ):
+    '''
+    The checkLoggingPerData and getExcepts flags of a file ... both need 'logging' in some name,
+    so files without it are answered without being parsed
+    '''
+    analysis  = py_parser.getFileAnalysis(py_file)
+    py_source = _prefilterSource( analysis.source )
+    if py_source is not None and constants.LOGGING_KW.encode() not in py_source:
+        return False, False
+    return py_parser.checkLoggingPerData( analysis.tree, constants.DUMMY_LOG_KW ), getExcepts( analysis )
+
+
+# detectors summed into each *_COUNT column of constants.CSV_HEADER
+CATEGORY_DETECTORS = [
+    ('DATA_LOAD_COUNT',     ( getDataLoadCount, getDataLoadCountb, getDataLoadCountc ) ),
+    ('MODEL_LOAD_COUNT',    ( getModelLoadCounta, getModelLoadCountb, getModelLoadCountc, getModelLoadCountd ) ),
+    ('DATA_DOWNLOAD_COUNT', ( getDataDownLoadCount, getDataDownLoadCountb ) ),
+    ('MODEL_LABEL_COUNT',   ( getModelLabelCount, getModelLabelCountb ) ),
+    ('MODEL_OUTPUT_COUNT',  ( getModelOutputCount, getModelOutputCountb, getModelOutputCountc ) ),
+    ('DATA_PIPELINE_COUNT', ( getDataPipelineCount, getDataPipelineCountb, getDataPipelineCountc, getDataPipelineCountd ) ),
+    ('ENVIRONMENT_COUNT',   ( getEnvironmentCount, getEnvironmentCountb ) ),
+    ('STATE_OBSERVE_COUNT', ( getStateObserveCount, ) ),
+]
+
+
+def analyze_file( py_file, sink_=None ):
+    '''
+    Runs every category detector on one file, which is read and parsed only once, and
+    returns the counts keyed by the *_COUNT columns of constants.CSV_HEADER ... files
+    rejected by the keyword prefilter get all-zero counts without being parsed. Events go
+    to sink_, and are dropped when no sink is given
+    '''
+    analysis = py_parser.getFileAnalysis(py_file)
+    if not passesPrefilter( analysis ):
+        return dict.fromkeys( constants.CSV_HEADER[2:], 0 )
+    previous_sink   = setEventSink( sink_ if sink_ is not None else event_sink.NULL_SINK )
+    category_counts = {}
+    try:
+        for category_, detectors_ in CATEGORY_DETECTORS:
+            category_counts[category_] = sum( detector_( analysis ) for detector_ in detectors_ )
+    finally:
+        setEventSink( previous_sink )
+    category_counts['TOTAL_EVENT_COUNT'] = sum( category_counts.values() )
+    return category_counts
+
+
+# code that decides which files are parsed and turns their records into counts and flags ...
+# getRulesVersion() hashes its source
+RULE_CODE = ( _prefilterSource, hasRuleKeywords, passesPrefilter, classifyRecords, _detectorCount,
+              getDNNImportStatus, getDNNDecisionCountb, getExcepts, checkLoggingLibrary, getLoggingFlags,
+              analyze_file )
+
+
+def getRulesVersion():
+    '''
+    Digest of the rule tables and the source of their matchers, the detectors of each category,
+    the source of the prefilter and rule-matching code, the keywords it and the record extraction compare
+    against and py_parser.EXTRACTOR_VERSION ... changes whenever a keyword rule, a matcher or the
+    record extraction changes, so stored results can be invalidated
+    '''
+    digest_   = hashlib.sha256()
+    matchers_ = {}
+    for rule_table in RULE_TABLES:
+        for key_ in sorted( rule_table ):
+            digest_.update( repr( ( key_, [ ( detector_name, matcher_.__name__ ) for detector_name, matcher_ in rule_table[key_] ] ) ).encode() )
+            matchers_.update( ( matcher_.__name__, matcher_ ) for detector_name, matcher_ in rule_table[key_] )
+        digest_.update( b'\n' )
+    for matcher_name in sorted( matchers_ ):
+        digest_.update( inspect.getsource( matchers_[matcher_name] ).encode() )
+    for rule_code in RULE_CODE:
+        digest_.update( inspect.getsource( rule_code ).encode() )
+    digest_.update( repr( sorted( DETECTOR_CONSOLE_STR.items() ) ).encode() )
+    digest_.update( repr( [ ( category_, [ detector_.__name__ for detector_ in detectors_ ] ) for category_, detectors_ in CATEGORY_DETECTORS ] ).encode() )
+    digest_.update( repr( ( constants.KERAS_KW, constants.TORCH_KW, constants.LOGGING_KW, constants.TENSORFLOW_KW, constants.SYMNET_KW,
+                            constants.DUMMY_LOG_KW, constants.LABEL_KW, constants.INDEX_KW, constants.FUNC_CALL_ARG_STR ) ).encode() )
+    digest_.update( repr( py_parser.EXTRACTOR_VERSION ).encode() )
+    return digest_.hexdigest()
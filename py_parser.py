@@ -6,38 +6,34 @@ Parser needed to implement FAME-ML
 '''
 
 import ast 
+import collections 
+import io 
+import mmap 
 import os 
+import re 
+import tokenize 
+import weakref 
 import constants 
 
+# version of what TreeRecords, _argName / _callArgs and the CallRecord shapes extract ... bump it 
+# whenever records are extracted differently, lint_engine.getRulesVersion() hashes it so cached 
+# results are not served for the old records 
+EXTRACTOR_VERSION = 1 
+
 
 def checkLoggingPerData(tree_object, name2track):
     '''
-    Check if data used in any load/write methods is logged ... called once for one load/write operation 
+    Check if data used in any load/write methods is logged ... called once for one load/write operation. 
+    Answered from the logging index that TreeRecords builds in its single walk of the tree 
     '''
-    LOGGING_EXISTS_FLAG = False 
-    IMPORT_FLAG, FUNC_FLAG, ARG_FLAG  = False, False , False 
-    for stmt_ in tree_object.body:
-        for node_ in ast.walk(stmt_):
-            if isinstance(node_, ast.Import) :
-                funcDict = node_.__dict__     
-                # print(funcDict) 
-                import_name_objects = funcDict[constants.NAMES_KW]
-                for obj in import_name_objects:
-                    if ( constants.LOGGING_KW in  obj.__dict__[constants.NAME_KW]): 
-                        IMPORT_FLAG = True 
-    func_decl_list = getPythonAtrributeFuncs(tree_object)
-    for func_decl_ in func_decl_list:
-        func_parent_id, func_name , funcLineNo, call_arg_list = func_decl_ # the class in which the method belongs, func_name, line no, arg_list 
-        
-        if ( constants.LOGGING_KW in func_parent_id ) or ( constants.LOGGING_KW in func_name) : 
-            # print(func_parent_id, func_name, call_arg_list)  
-            FUNC_FLAG = True 
-            for arg_ in call_arg_list:
-                if name2track in arg_:
-                    ARG_FLAG = True 
-    if (IMPORT_FLAG) and (FUNC_FLAG) and (ARG_FLAG):
-        LOGGING_EXISTS_FLAG = True 
-    return LOGGING_EXISTS_FLAG 
+    records = getTreeRecords( tree_object )
+    if not ( records.logging_imported and records.logging_calls ):
+        return False 
+    try:
+        return name2track in records.logging_arg_keys 
+    except TypeError:
+        # unhashable names can only be compared one by one 
+        return any( name2track == arg_key for arg_key in records.logging_arg_keys )
 
 
 def func_def_log_check(func_decl_list):
@@ -58,13 +54,7 @@ def checkExceptLogging(except_func_list):
     
 
 def getPythonExcepts(pyTreeObj): 
-    except_body_as_list = []
-    for stmt_ in pyTreeObj.body:
-        for node_ in ast.walk(stmt_):
-            if isinstance(node_, ast.ExceptHandler): 
-                exceptDict = node_.__dict__     
-                except_body_as_list = exceptDict[constants.BODY_KW]  
-    return except_body_as_list
+    return getTreeRecords(pyTreeObj).except_body 
 
 
 def checkAttribFuncsInExcept(expr_obj):
@@ -77,341 +67,450 @@ def checkAttribFuncsInExcept(expr_obj):
                 attrib_list = attrib_list + commonAttribCallBody( func_node )
     return attrib_list 
 
-def getPythonParseObject( pyFile ): 
-	try:
-		full_tree = ast.parse( open( pyFile ).read())    
-	except SyntaxError:
-		# print(constants.PARSING_ERROR_KW, pyFile )
+def getPythonSource( pyFile ):
+    '''
+    raw bytes of a python file ... read once and shared by the keyword prefilter, the parser 
+    and line counting. Files of MMAP_MIN_SIZE bytes or more are memory mapped instead of copied 
+    '''
+    with open( pyFile, 'rb' ) as file_:
+        if os.fstat( file_.fileno() ).st_size >= constants.MMAP_MIN_SIZE:
+            return mmap.mmap( file_.fileno(), 0, access=mmap.ACCESS_READ )
+        return file_.read()
+
+
+def isParsableSource( pySource ):
+    '''
+    cheap screen run before the parser ... source holding null bytes can never be parsed 
+    '''
+    return pySource.find( b'\x00' ) == -1 
+
+
+def decodePythonSource( pySource ):
+    '''
+    source bytes decoded with their PEP 263 encoding, the way the parser decodes them 
+    '''
+    encoding_, first_lines = tokenize.detect_encoding( io.BytesIO( pySource ).readline )
+    return bytes( pySource ).decode( encoding_ )
+
+
+_NEWLINE = re.compile( b'\r\n?|\n' )
+
+def countLines( pySource ):
+    '''
+    lines of the source, counted the way iterating the file in text mode counts them 
+    '''
+    if isinstance( pySource, bytes ):
+        newline_count = pySource.count( b'\n' ) + pySource.count( b'\r' ) - pySource.count( b'\r\n' )
+    else:
+        newline_count = sum( 1 for newline_ in _NEWLINE.finditer( pySource ) )
+    if len( pySource ) > 0 and pySource[-1:] not in ( b'\n', b'\r' ):
+        newline_count += 1 
+    return newline_count 
+
+
+def getSourceParseObject( pySource ): 
+	'''
+	the bytes go straight to the parser, which honors the PEP 263 coding cookie ... source that 
+	is screened out or does not decode gives an empty tree 
+	'''
+	full_tree = None 
+	if isParsableSource( pySource ):
+		try:
+			full_tree = ast.parse( pySource )    
+		except SyntaxError:
+			# print(constants.PARSING_ERROR_KW, pyFile )
+			pass 
+	if full_tree is None:
 		full_tree = ast.parse(constants.EMPTY_STRING) 
 	return full_tree 
 
-def commonAttribCallBody(node_):
-	full_list = []
+
+def getPythonParseObject( pyFile ): 
+	return getSourceParseObject( getPythonSource( pyFile ) )
+
+
+class FileAnalysis(object):
+    '''
+    One python file read and parsed once ... the tree and its extracted records are 
+    handed to every lint_engine detector instead of each detector parsing the file again. 
+    The tree is only parsed on first use, so files rejected by the keyword prefilter are never parsed 
+    '''
+    def __init__(self, pyFile, pySource=None):
+        self.path   = pyFile 
+        # content already in memory, such as a blob read from git, is not read from pyFile 
+        self.source = getPythonSource( pyFile ) if pySource is None else pySource
+        self._tree  = None 
+
+    @property 
+    def tree(self):
+        if self._tree is None:
+            self._tree = getSourceParseObject( self.source )
+        return self._tree 
+
+    @property 
+    def parsed(self):
+        return self._tree is not None 
+
+    @property 
+    def line_count(self):
+        return countLines( self.source )
+
+    @property 
+    def records(self):
+        return getTreeRecords( self.tree )
+
+
+_analysis_cache = collections.OrderedDict() 
+
+def getFileAnalysis( pyFile ):
+    '''
+    returns the FileAnalysis of a file ... a cached one is reused while the file's 
+    mtime and size are unchanged, and only the last PARSE_CACHE_SIZE files are kept 
+    '''
+    if isinstance(pyFile, FileAnalysis):
+        return pyFile 
+    stat_ = os.stat( pyFile )
+    cache_key = ( pyFile, stat_.st_dev, stat_.st_ino, stat_.st_mtime_ns, stat_.st_size )
+    analysis = _analysis_cache.get( cache_key )
+    if analysis is None:
+        analysis = FileAnalysis( pyFile )
+        _analysis_cache[cache_key] = analysis 
+        if len(_analysis_cache) > constants.PARSE_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    else:
+        _analysis_cache.move_to_end( cache_key )
+    return analysis 
+
+class CallRecord(object):
+    '''
+    Compact record of one extracted call ... argument names and their integer positions are 
+    kept as tuples, and the ( name, label ) argument tuples are only built by astuple() 
+    '''
+    __slots__ = ( 'owner', 'func_name', 'line', 'arg_names', 'arg_positions' )
+    ARG_LABEL = constants.INDEX_KW 
+
+    def __init__(self, owner, func_name, line, arg_names, arg_positions):
+        self.owner         = owner 
+        self.func_name     = func_name 
+        self.line          = line 
+        self.arg_names     = arg_names 
+        # None when the arguments sit at positions 1 .. n 
+        self.arg_positions = arg_positions 
+
+    def getArgs(self):
+        arg_positions = self.arg_positions 
+        if arg_positions is None:
+            arg_positions = range( 1, len(self.arg_names) + 1 )
+        return [ ( arg_name, self.ARG_LABEL + str(arg_position) ) for arg_name, arg_position in zip( self.arg_names, arg_positions ) ]
+
+    def astuple(self):
+        return ( self.owner, self.func_name, self.line, self.getArgs() )
+
+
+class AssignmentCallRecord(CallRecord):
+    __slots__ = () 
+    ARG_LABEL = constants.FUNC_CALL_ARG_STR 
+
+
+class DefinitionCallRecord(CallRecord):
+    __slots__ = () 
+
+    def astuple(self):
+        return ( self.func_name, self.line, self.getArgs() )
+
+
+_SKIPPED_ARG = object() 
+
+def _argName(funcArg, arg_kinds):
+	if isinstance(funcArg, ast.Name):
+		if ast.Name in arg_kinds:
+			return funcArg.id 
+	elif isinstance(funcArg, ast.Attribute):
+		if ast.Attribute in arg_kinds:
+			return funcArg.attr 
+	elif isinstance(funcArg, ast.Str):
+		if ast.Str in arg_kinds:
+			return funcArg.s 
+	elif isinstance(funcArg, ast.Call):
+		if ast.Call in arg_kinds:
+			return funcArg.func 
+	elif isinstance(funcArg, ast.Subscript):
+		# only a subscript of a subscript is recorded, as its inner value 
+		if ( ast.Subscript in arg_kinds ) and isinstance(funcArg.value, ast.Subscript):
+			return funcArg.value.value 
+	return _SKIPPED_ARG 
+
+
+def _callArgs(funcArgs, funcKeys, arg_kinds):
+	'''
+	names and positions of the positional args of arg_kinds, then of every keyword arg ... 
+	keywords are numbered after all positional args, recorded or not 
+	'''
+	arg_names, arg_positions = [], []
+	for x_ in range(len(funcArgs)):
+		arg_name = _argName( funcArgs[x_], arg_kinds )
+		if arg_name is not _SKIPPED_ARG:
+			arg_names.append( arg_name )
+			arg_positions.append( x_ + 1 )
+	for x_ in range(len(funcKeys)):
+		funcKey = funcKeys[x_] 
+		if( isinstance(funcKey, ast.keyword ) ):
+			arg_names.append( funcKey.arg )
+			arg_positions.append( x_ + 1 + len(funcArgs) )
+	if len(arg_positions) == 0 or arg_positions[-1] == len(arg_positions):
+		return tuple(arg_names), None 
+	return tuple(arg_names), tuple(arg_positions) 
+
+
+_ATTRIB_CALL_ARGS         = ( ast.Name, ast.Attribute, ast.Str )
+_NAME_ASSIGNMENT_ARGS     = ( ast.Name, ast.Str )
+_ATTRIB_ASSIGNMENT_ARGS   = ( ast.Call, ast.Attribute, ast.Str, ast.Subscript )
+_DEFINITION_ARGS          = ( ast.Name, ast.Attribute, ast.Call, ast.Str )
+_MULTI_LHS_ARGS           = ( ast.Name, ast.Str, ast.Call, ast.Attribute )
+_NO_KEYWORDS              = () 
+
+
+def _attribCallRecords(node_):
+	record_list = []
 	if isinstance(node_, ast.Call):
-		funcDict = node_.__dict__ 
-		func_, funcArgs, funcLineNo, funcKeys =  funcDict[ constants.FUNC_KW ], funcDict[constants.ARGS_KW], funcDict[constants.LINE_NO_KW], funcDict[constants.KEY_WORDS_KW]  
+		func_ = node_.func 
 		if( isinstance(func_, ast.Attribute ) ):
-			func_as_attrib_dict = func_.__dict__ 
-            #print(func_as_attrib_dict ) 
-			func_name    = func_as_attrib_dict[constants.ATTRIB_KW] 
-			func_parent  = func_as_attrib_dict[constants.VALUE_KW]
-			
-			if( isinstance(func_parent, ast.Name ) ):     
-				call_arg_list = []   
-				index = 0                
-				for x_ in range(len(funcArgs)):
-					index = x_ + 1
-					funcArg = funcArgs[x_] 
-					if( isinstance(funcArg, ast.Name ) )  :
-						call_arg_list.append( (  funcArg.id, constants.INDEX_KW + str(x_ + 1) )  ) 
-					elif( isinstance(funcArg, ast.Attribute) ): 
-						arg_dic  = funcArg.__dict__
-						arg_name = arg_dic[constants.ATTRIB_KW] 
-						call_arg_list.append( (  arg_name, constants.INDEX_KW + str(x_ + 1) )  ) 
-					elif(isinstance( funcArg, ast.Str ) ):
-						call_arg_list.append( ( funcArg.s, constants.INDEX_KW + str( x_ + 1 )  ) )
-				for x_ in range(len(funcKeys)):
-					funcKey = funcKeys[x_] 
-					if( isinstance(funcKey, ast.keyword ) )  :
-						call_arg_list.append( ( funcKey.arg, constants.INDEX_KW + str( x_ + 1 + index ) ) ) 
-				full_list.append( ( func_parent.id, func_name , funcLineNo, call_arg_list  ) )
-			if( isinstance(func_parent, ast.Attribute ) ):     
-				call_arg_list = []   
-				index = 0                
-				for x_ in range(len(funcArgs)):
-					index = x_ + 1
-					funcArg = funcArgs[x_] 
-					if( isinstance(funcArg, ast.Name ) )  :
-						call_arg_list.append( (  funcArg.id, constants.INDEX_KW + str(x_ + 1) )  ) 
-					elif( isinstance(funcArg, ast.Attribute) ): 
-						arg_dic  = funcArg.__dict__
-						arg_name = arg_dic[constants.ATTRIB_KW] 
-						call_arg_list.append( (  arg_name, constants.INDEX_KW + str(x_ + 1) )  ) 
-					elif(isinstance( funcArg, ast.Str ) ):
-						call_arg_list.append( ( funcArg.s, constants.INDEX_KW + str( x_ + 1 )  ) )
-				for x_ in range(len(funcKeys)):
-					funcKey = funcKeys[x_] 
-					if( isinstance(funcKey, ast.keyword ) ):
-						call_arg_list.append( ( funcKey.arg, constants.INDEX_KW + str( x_ + 1 + index ) ) ) 
-				
-				func_dic  = func_parent.__dict__
-				func_parent_name = func_dic[constants.ATTRIB_KW] 
-				full_list.append( ( func_parent_name, func_name , funcLineNo, call_arg_list  ) )    
-			if( isinstance(func_parent, ast.Call ) ):     
-				call_arg_list = []   
-				index = 0                
-				for x_ in range(len(funcArgs)):
-					index = x_ + 1
-					funcArg = funcArgs[x_] 
-					if( isinstance(funcArg, ast.Name ) )  :
-						call_arg_list.append( (  funcArg.id, constants.INDEX_KW + str(x_ + 1) )  ) 
-					elif( isinstance(funcArg, ast.Attribute) ): 
-						arg_dic  = funcArg.__dict__
-						arg_name = arg_dic[constants.ATTRIB_KW] 
-						call_arg_list.append( (  arg_name, constants.INDEX_KW + str(x_ + 1) )  ) 
-					elif(isinstance( funcArg, ast.Str ) ):
-						call_arg_list.append( ( funcArg.s, constants.INDEX_KW + str( x_ + 1 )  ) )
-				
-				for x_ in range(len(funcKeys)):
-					funcKey = funcKeys[x_] 
-					if( isinstance(funcKey, ast.keyword ) )  :
-						call_arg_list.append( ( funcKey.arg, constants.INDEX_KW + str( x_ + 1 + index ) ) ) 
-					
-				func_dic  = func_parent.__dict__
-				func_parent_name = func_dic[constants.FUNC_KW] 
-				if( isinstance(func_parent_name, ast.Name ) ):  
-					full_list.append( ( func_parent_name.id, func_name , funcLineNo, call_arg_list  ) )      
-	return full_list             
+			func_parent = func_.value 
+			if( isinstance(func_parent, ast.Name ) ):
+				func_parent_name = func_parent.id 
+			elif( isinstance(func_parent, ast.Attribute ) ):
+				func_parent_name = func_parent.attr 
+			elif( isinstance(func_parent, ast.Call ) and isinstance(func_parent.func, ast.Name ) ):
+				func_parent_name = func_parent.func.id 
+			else:
+				return record_list 
+			arg_names, arg_positions = _callArgs( node_.args, node_.keywords, _ATTRIB_CALL_ARGS )
+			record_list.append( CallRecord( func_parent_name, func_.attr, node_.lineno, arg_names, arg_positions ) )
+	return record_list 
+
+
+def commonAttribCallBody(node_):
+	return [ record_.astuple() for record_ in _attribCallRecords( node_ ) ]
+
+
+def _functionAssignmentRecords(node_):
+	record_list = []
+	if isinstance(node_, ast.Assign) and isinstance(node_.value, ast.Call):
+		value, funcName = node_.value, node_.value.func 
+		if( isinstance(funcName, ast.Name ) ): 
+			func_name, arg_kinds = funcName.id, _NAME_ASSIGNMENT_ARGS 
+		elif( isinstance( funcName, ast.Attribute ) ):
+			func_name, arg_kinds = funcName.attr, _ATTRIB_ASSIGNMENT_ARGS 
+		else:
+			return record_list 
+		arg_names, arg_positions = _callArgs( value.args, value.keywords, arg_kinds )
+		lhs = ''
+		# one record per target, holding the last plain name seen so far 
+		for target in node_.targets:
+			if( isinstance(target, ast.Name) ):
+				lhs = target.id 
+			record_list.append( AssignmentCallRecord( lhs, func_name, value.lineno, arg_names, arg_positions ) )
+	return record_list
+
+
+def _functionDefinitionRecords(node_):
+	record_list = []
+	if isinstance(node_, ast.Call) and isinstance(node_.func, ast.Name):
+		arg_names, arg_positions = _callArgs( node_.args, node_.keywords, _DEFINITION_ARGS )
+		record_ = DefinitionCallRecord( None, node_.func.id, node_.lineno, arg_names, arg_positions )
+		# one record per keyword argument 
+		record_list = [ record_ ] * len( [ funcKey for funcKey in node_.keywords if isinstance(funcKey, ast.keyword ) ] )
+	return record_list
+
+
+def _multipleLHSAssignmentRecords(node_):
+	record_list = []
+	if isinstance(node_, ast.Assign) and isinstance(node_.value, ast.Call):
+		value, funcName = node_.value, node_.value.func 
+		lhs = []
+		for target in node_.targets:
+			if( isinstance(target, ast.Name) ):
+				lhs.append(target.id) 
+			elif( isinstance(target, ast.Tuple) ):
+				for item in target.elts:
+					if isinstance(item, ast.Name):
+						lhs.append(item.id)
+		if( isinstance(funcName, ast.Name ) ): 
+			func_name = funcName.id 
+			# one record per attribute argument 
+			record_count = len( [ funcArg for funcArg in value.args if isinstance(funcArg, ast.Attribute ) ] )
+		elif( isinstance( funcName, ast.Attribute ) ):
+			func_name = funcName.attr 
+			# one record per positional argument 
+			record_count = len( value.args )
+		else:
+			return record_list 
+		arg_names, arg_positions = _callArgs( value.args, _NO_KEYWORDS, _MULTI_LHS_ARGS )
+		record_list = [ AssignmentCallRecord( lhs, func_name, value.lineno, arg_names, arg_positions ) ] * record_count 
+	return record_list
+
+
+def _modelFeatureRecords(node_):
+	feature_list = []
+	if isinstance(node_, ast.Assign):
+		lhs = ''
+		assign_dict = node_.__dict__
+		targets, value  =  assign_dict[  constants.TARGETS_KW ], assign_dict[  constants.VALUE_KW ]
+		if isinstance(value, ast.Attribute):
+			funcDict = value.__dict__ 
+			className, featureName, funcLineNo =  funcDict[ constants.VALUE_KW ], funcDict[ constants.ATTRIB_KW ], funcDict[ constants.LINE_NO_KW ] 
+			for target in targets:
+				if(isinstance(target, ast.Name) ):
+					lhs = target.id 
+			if(isinstance(className, ast.Name ) ): 
+				feature_list.append( ( lhs, className.id, featureName, funcLineNo)  )	
+		if isinstance(value, ast.Subscript):
+			value =  value.value
+			if isinstance(value, ast.Attribute):
+				funcDict = value.__dict__ 
+				className, featureName, funcLineNo =  funcDict[ constants.VALUE_KW ], funcDict[ constants.ATTRIB_KW ], funcDict[constants.LINE_NO_KW] 
+				for target in targets:
+					if( isinstance(target, ast.Name) ):
+						lhs = target.id 
+						if( isinstance(className, ast.Name ) ): 
+							feature_list.append( ( lhs, className.id, featureName, funcLineNo)  )
+					elif( isinstance(className, ast.Attribute ) ): 
+						class_dic  = className.__dict__
+						class_name = class_dic[constants.ATTRIB_KW] 
+						feature_list.append( ( lhs, class_name, featureName, funcLineNo)  )	
+	return feature_list
+
+
+def _tupAssiRecords(node_):
+	var_assignment_list = []
+	if isinstance(node_, ast.Assign):
+		lhs = ''
+		assign_dict = node_.__dict__
+		targets, value  =  assign_dict[ constants.TARGETS_KW ], assign_dict[  constants.VALUE_KW ]
+		if isinstance(value, ast.ListComp):
+			varDict = value.__dict__ 
+			varName, varValue, varLineNo =  varDict[ constants.ELT_KW ], varDict[ constants.GENERATORS_KW ], varDict[ constants.LINE_NO_KW ] 
+			for target in targets:
+				if( isinstance(target, ast.Name) ):
+					lhs = target.id 
+			if isinstance(varName, ast.Subscript):
+				varName =  varName.value
+				if isinstance(varName, ast.Name):
+					varName = varName.id
+			if isinstance(varValue, list):
+				varValue =  varValue[0]
+				if isinstance(varValue, ast.comprehension):
+					varIter = varValue.iter
+					if isinstance(varIter, ast.Name):
+						varIter = varIter.id
+					varValue = varValue.target
+					if isinstance(varValue, ast.Name):
+						varValue = varValue.id
+			var_assignment_list.append( (lhs, varName, varValue, varIter, varLineNo) )
+	return var_assignment_list
+
+
+def _importRecords(node_):
+	import_list = []
+	if isinstance(node_, ast.Import):
+		for name in node_.names:
+			import_list.append( (name.name.split('.')[0] ) )
+	elif isinstance(node_, ast.ImportFrom):
+		if(node_.module is not None):
+			import_list.append( ( node_.module.split('.')[0] ) )
+	return import_list
+
+
+class TreeRecords(object):
+    '''
+    Holds every record list extracted from one parse tree ... filled by a single walk 
+    over pyTree.body so that the extractors below do not walk the same tree again. Calls are 
+    kept as CallRecords, the extractors turn them into tuples when asked for 
+    '''
+    def __init__(self, pyTree):
+        self.attrib_calls         = [] 
+        self.func_assignments     = [] 
+        self.func_definitions     = [] 
+        self.multi_lhs_assignments = [] 
+        self.model_features       = [] 
+        self.tup_assignments      = [] 
+        self.imports              = [] 
+        self.except_body          = [] 
+        self.logging_imported     = False 
+        for stmt_ in pyTree.body:
+            for node_ in ast.walk(stmt_):
+                if isinstance(node_, ast.Call):
+                    self.attrib_calls.extend( _attribCallRecords( node_ ) )
+                    self.func_definitions.extend( _functionDefinitionRecords( node_ ) )
+                elif isinstance(node_, ast.Assign):
+                    self.func_assignments.extend( _functionAssignmentRecords( node_ ) )
+                    self.multi_lhs_assignments.extend( _multipleLHSAssignmentRecords( node_ ) )
+                    self.model_features.extend( _modelFeatureRecords( node_ ) )
+                    self.tup_assignments.extend( _tupAssiRecords( node_ ) )
+                elif isinstance(node_, (ast.Import, ast.ImportFrom)):
+                    self.imports.extend( _importRecords( node_ ) )
+                    if isinstance(node_, ast.Import) and any( constants.LOGGING_KW in alias_.name for alias_ in node_.names ):
+                        self.logging_imported = True 
+                elif isinstance(node_, ast.ExceptHandler):
+                    # same as before: the body of the last handler in walk order wins 
+                    self.except_body = node_.__dict__[constants.BODY_KW]
+        # logging index: calls on or of something named logging, and every argument name and 
+        # argument label passed to them 
+        self.logging_calls    = [ record_ for record_ in self.attrib_calls if ( constants.LOGGING_KW in record_.owner ) or ( constants.LOGGING_KW in record_.func_name ) ]
+        self.logging_arg_keys = set( arg_key for record_ in self.logging_calls for arg_ in record_.getArgs() for arg_key in arg_ )
+
+
+_tree_records = weakref.WeakKeyDictionary() 
+
+def getTreeRecords(pyTree):
+    '''
+    returns the TreeRecords of a tree, walking the tree only the first time it is asked for 
+    '''
+    records = _tree_records.get(pyTree)
+    if records is None:
+        records = TreeRecords(pyTree)
+        _tree_records[pyTree] = records 
+    return records 
 
 
 def getPythonAtrributeFuncs(pyTree):
     '''
     detects func like class.funcName() 
     '''
-    attrib_call_list  = [] 
-    for stmt_ in pyTree.body:
-        for node_ in ast.walk(stmt_):
-            if isinstance(node_, ast.Call):
-                attrib_call_list =  attrib_call_list + commonAttribCallBody( node_ )
-
-    return attrib_call_list 
+    return [ record_.astuple() for record_ in getTreeRecords(pyTree).attrib_calls ]
     
     
 def getFunctionAssignments(pyTree):
-	call_list = []
-	for stmt_ in pyTree.body:
-		for node_ in ast.walk(stmt_):
-			if isinstance(node_, ast.Assign):
-				lhs = ''
-				assign_dict = node_.__dict__
-				targets, value  =  assign_dict[ constants.TARGETS_KW ], assign_dict[ constants.VALUE_KW ]
-				if isinstance(value, ast.Call):
-					funcDict = value.__dict__ 
-					funcName, funcArgs, funcLineNo, funcKeys =  funcDict[ constants.FUNC_KW ], funcDict[ constants.ARGS_KW ], funcDict[constants.LINE_NO_KW], funcDict[constants.KEY_WORDS_KW]  
-					for target in targets:
-						if( isinstance(target, ast.Name) ):
-							lhs = target.id 
-						if( isinstance(funcName, ast.Name ) ): 
-							call_arg_list = [] 
-							index = 0   
-							for x_ in range(len(funcArgs)):
-								index = x_ + 1
-								funcArg = funcArgs[x_] 
-								if( isinstance(funcArg, ast.Name ) ):
-									call_arg_list.append( ( funcArg.id, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-								elif(isinstance( funcArg, ast.Str ) ):
-									call_arg_list.append( ( funcArg.s, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							for x_ in range(len(funcKeys)):
-								funcKey = funcKeys[x_] 
-								if( isinstance(funcKey, ast.keyword ) )  :
-									call_arg_list.append( (  funcKey.arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1 + index) )  ) 
-							call_list.append( ( lhs, funcName.id, funcLineNo, call_arg_list )  )
-						elif( isinstance( funcName, ast.Attribute ) ):
-							call_arg_list = []   
-							index = 0       
-							func_name_dict  = funcName.__dict__
-							func_name = func_name_dict[constants.ATTRIB_KW] 
-							for x_ in range(len(funcArgs)):
-								index = x_ + 1
-								funcArg = funcArgs[x_] 
-								if( isinstance( funcArg, ast.Call ) ):
-									func_arg_dict  = funcArg.__dict__
-									func_arg = func_arg_dict[constants.FUNC_KW] 
-									call_arg_list.append( ( func_arg,  constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-								elif( isinstance(funcArg, ast.Attribute) ): 
-									func_arg_dic  = funcArg.__dict__
-									func_arg = func_arg_dic[constants.ATTRIB_KW] 
-									call_arg_list.append( ( func_arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-								elif(isinstance( funcArg, ast.Str ) ):
-									call_arg_list.append( ( funcArg.s, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-								elif isinstance(funcArg, ast.Subscript):
-									func_arg =  funcArg.value
-									if isinstance(func_arg, ast.Name):
-										func_arg = func_arg.id 
-									elif isinstance(func_arg, ast.Subscript):
-										func_arg = func_arg.value 
-										call_arg_list.append( ( func_arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							for x_ in range(len(funcKeys)):
-								funcKey = funcKeys[x_] 
-								if( isinstance(funcKey, ast.keyword ) )  :
-									call_arg_list.append( (  funcKey.arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1 + index) )  ) 
-							call_list.append( ( lhs, func_name, funcLineNo, call_arg_list )  )
-	return call_list 
+    return [ record_.astuple() for record_ in getTreeRecords(pyTree).func_assignments ]
     
     
 def getFunctionDefinitions(pyTree):
-	func_list = []
-	func_var_list = []
-	for stmt_ in pyTree.body:
-		for node_ in ast.walk(stmt_):
-			if isinstance(node_, ast.Call):
-				funcDict = node_.__dict__ 
-				func_, funcArgs, funcLineNo, funcKeys =  funcDict[ constants.FUNC_KW ], funcDict[constants.ARGS_KW], funcDict[constants.LINE_NO_KW], funcDict[constants.KEY_WORDS_KW] 
-				if( isinstance(func_, ast.Name ) ):  
-					func_name = func_.id 
-					call_arg_list = []
-					index = 0                
-					for x_ in range(len(funcArgs)):
-						index = x_ + 1
-						funcArg = funcArgs[x_] 
-						if( isinstance(funcArg, ast.Name ) )  :
-							call_arg_list.append( (  funcArg.id, constants.INDEX_KW + str(x_ + 1) )  ) 
-						elif( isinstance(funcArg, ast.Attribute) ): 
-							arg_dic  = funcArg.__dict__
-							arg_name = arg_dic[constants.ATTRIB_KW] 
-							call_arg_list.append( (  arg_name, constants.INDEX_KW + str(x_ + 1) )  ) 
-						elif( isinstance( funcArg, ast.Call ) ):
-							func_arg_dict  = funcArg.__dict__
-							func_arg = func_arg_dict[constants.FUNC_KW] 
-							call_arg_list.append( ( func_arg, constants.INDEX_KW + str( x_ + 1 )  ) )
-						elif( isinstance( funcArg, ast.Str ) ):
-							call_arg_list.append( ( funcArg.s, constants.INDEX_KW + str( x_ + 1 )  ) )
-					for x_ in range(len(funcKeys)):
-						funcKey = funcKeys[x_] 
-						if( isinstance(funcKey, ast.keyword ) )  :
-							call_arg_list.append( (  funcKey.arg, constants.INDEX_KW + str(x_ + index + 1) )  ) 
-							func_list.append( ( func_name , funcLineNo, call_arg_list  ) )        
-	return func_list
+    return [ record_.astuple() for record_ in getTreeRecords(pyTree).func_definitions ]
 
     
-    
 def getFunctionAssignmentsWithMultipleLHS(pyTree):
-	call_list = []
-	for stmt_ in pyTree.body:
-		for node_ in ast.walk(stmt_):
-			if isinstance(node_, ast.Assign):
-				lhs = []
-				assign_dict = node_.__dict__
-				targets, value  =  assign_dict[  constants.TARGETS_KW ], assign_dict[  constants.VALUE_KW ]
-				if isinstance(value, ast.Call):
-					funcDict = value.__dict__ 
-					funcName, funcArgs, funcLineNo =  funcDict[ constants.FUNC_KW ], funcDict[ constants.ARGS_KW ], funcDict[constants.LINE_NO_KW] 
-					for target in targets:
-						if( isinstance(target, ast.Name) ):
-							lhs.append(target.id) 
-						elif( isinstance(target, ast.Tuple) ):
-							for item in target.elts:
-								if isinstance(item, ast.Name):
-									lhs.append(item.id)
-					if( isinstance(funcName, ast.Name ) ): 
-						call_arg_list = []       
-						for x_ in range(len(funcArgs)):
-							funcArg = funcArgs[x_] 
-							if( isinstance(funcArg, ast.Name ) ):
-								call_arg_list.append( ( funcArg.id, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )             
-							elif( isinstance( funcArg, ast.Str ) ):
-								call_arg_list.append( ( funcArg.s, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							elif( isinstance( funcArg, ast.Call ) ):
-								func_arg_dict  = funcArg.__dict__
-								func_arg = func_arg_dict[constants.FUNC_KW] 
-								call_arg_list.append( ( func_arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							elif( isinstance( funcArg, ast.Attribute ) ): 
-								func_arg_dic  = funcArg.__dict__
-								func_arg = func_arg_dic[constants.ATTRIB_KW] 
-								call_arg_list.append( ( func_arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) ) 
-								call_list.append( ( lhs, funcName.id, funcLineNo, call_arg_list )  )	
-					elif( isinstance( funcName, ast.Attribute ) ):
-						call_arg_list = []       
-						func_name_dict  = funcName.__dict__
-						func_name = func_name_dict[constants.ATTRIB_KW] 
-						for x_ in range(len(funcArgs)):
-							funcArg = funcArgs[x_] 
-							if( isinstance(funcArg, ast.Name ) ):
-								call_arg_list.append( ( funcArg.id, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							elif(isinstance( funcArg, ast.Str ) ):
-								call_arg_list.append( ( funcArg.s, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							elif( isinstance( funcArg, ast.Call ) ):
-								func_arg_dict  = funcArg.__dict__
-								func_arg = func_arg_dict[constants.FUNC_KW] 
-								call_arg_list.append( ( func_arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1) ) )
-							elif( isinstance(funcArg, ast.Attribute) ): 
-								func_arg_dic  = funcArg.__dict__
-								func_arg = func_arg_dic[constants.ATTRIB_KW] 
-								call_arg_list.append( ( func_arg, constants.FUNC_CALL_ARG_STR + str(x_ + 1) )   ) 
-							call_list.append( ( lhs, func_name, funcLineNo, call_arg_list )  )
-	return call_list 
+    return [ record_.astuple() for record_ in getTreeRecords(pyTree).multi_lhs_assignments ]
     
 
 def getModelFeature(pyTree):
-	feature_list = []
-	for stmt_ in pyTree.body:
-		for node_ in ast.walk(stmt_):
-			if isinstance(node_, ast.Assign):
-				lhs = ''
-				assign_dict = node_.__dict__
-				targets, value  =  assign_dict[  constants.TARGETS_KW ], assign_dict[  constants.VALUE_KW ]
-				if isinstance(value, ast.Attribute):
-					funcDict = value.__dict__ 
-					className, featureName, funcLineNo =  funcDict[ constants.VALUE_KW ], funcDict[ constants.ATTRIB_KW ], funcDict[ constants.LINE_NO_KW ] 
-					for target in targets:
-						if(isinstance(target, ast.Name) ):
-							lhs = target.id 
-					if(isinstance(className, ast.Name ) ): 
-						feature_list.append( ( lhs, className.id, featureName, funcLineNo)  )	
-				if isinstance(value, ast.Subscript):
-					value =  value.value
-					if isinstance(value, ast.Attribute):
-						funcDict = value.__dict__ 
-						className, featureName, funcLineNo =  funcDict[ constants.VALUE_KW ], funcDict[ constants.ATTRIB_KW ], funcDict[constants.LINE_NO_KW] 
-						for target in targets:
-							if( isinstance(target, ast.Name) ):
-								lhs = target.id 
-								if( isinstance(className, ast.Name ) ): 
-									feature_list.append( ( lhs, className.id, featureName, funcLineNo)  )
-							elif( isinstance(className, ast.Attribute ) ): 
-								class_dic  = className.__dict__
-								class_name = class_dic[constants.ATTRIB_KW] 
-								feature_list.append( ( lhs, class_name, featureName, funcLineNo)  )	
-	return feature_list 
+    return list( getTreeRecords(pyTree).model_features )
     
     
 def getTupAssiDetails(pyTree): 
-	var_assignment_list = []
-	for stmt_ in pyTree.body:
-		for node_ in ast.walk(stmt_):
-			if isinstance(node_, ast.Assign):
-				lhs = ''
-				assign_dict = node_.__dict__
-				targets, value  =  assign_dict[ constants.TARGETS_KW ], assign_dict[  constants.VALUE_KW ]
-				if isinstance(value, ast.ListComp):
-					varDict = value.__dict__ 
-					varName, varValue, varLineNo =  varDict[ constants.ELT_KW ], varDict[ constants.GENERATORS_KW ], varDict[ constants.LINE_NO_KW ] 
-					for target in targets:
-						if( isinstance(target, ast.Name) ):
-							lhs = target.id 
-					if isinstance(varName, ast.Subscript):
-						varName =  varName.value
-						if isinstance(varName, ast.Name):
-							varName = varName.id
-					if isinstance(varValue, list):
-						varValue =  varValue[0]
-						if isinstance(varValue, ast.comprehension):
-							varIter = varValue.iter
-							if isinstance(varIter, ast.Name):
-								varIter = varIter.id
-							varValue = varValue.target
-							if isinstance(varValue, ast.Name):
-								varValue = varValue.id
-					var_assignment_list.append( (lhs, varName, varValue, varIter, varLineNo) )
-	return var_assignment_list     
+    return list( getTreeRecords(pyTree).tup_assignments )
     
     
 def getImport(pyTree): 
-	import_list = []
-	for stmt_ in pyTree.body:
-		for node_ in ast.walk(stmt_):
-			if isinstance(node_, ast.Import):
-				for name in node_.names:
-					import_list.append( (name.name.split('.')[0] ) )
-			elif isinstance(node_, ast.ImportFrom):
-				if(node_.module is not None):
-					import_list.append( ( node_.module.split('.')[0] ) )
-	return import_list 
+    return list( getTreeRecords(pyTree).imports )
 
 def checkIfParsablePython( pyFile ):
 	flag = True 
 	try:
-		full_tree = ast.parse( open( pyFile ).read())    
+		pySource  = getPythonSource( pyFile )
+		if not isParsableSource( pySource ):
+			flag = False 
+		else:
+			full_tree = ast.parse( pySource )    
 	except (SyntaxError, UnicodeDecodeError) as err_ :
 		flag = False 
-	return flag 	
\ No newline at end of file
+	return flag
@@ -9,8 +9,15 @@ import pandas as pd
 import time
 import datetime
 import statistics
+from concurrent.futures import ThreadPoolExecutor
 
 from forensics import forensic_wrapper
+import frequency
+import sketches
+import results_store
+
+
+REPORT_METRICS = ['PROP_VAL', 'EVENT_DENSITY']
 
 
 def giveTimeStamp():
@@ -27,18 +34,59 @@ def Median(my_list):
     return statistics.median(my_list) if len(my_list) > 0 else 0.0
 
 
+def loadReportFrame(res_file, columns=None):
+    # DataFrames from frequency are used as they are, files are read with only the columns needed
+    if isinstance(res_file, pd.DataFrame):
+        return res_file if columns is None else res_file[columns]
+    return results_store.readResults(res_file, columns)
+
+
+def getChunkedCategoryStats(res_file, value_column, chunksize):
+    """
+    {category: (average, median)} of value_column, read chunksize rows at a time. Sums and
+    counts are exact, medians come from a bounded-memory KLL sketch per category.
+    """
+    value_sums, value_sketches = {}, {}
+    for chunk_df in results_store.iterResultChunks(res_file, ['CATEGORY', value_column], chunksize):
+        for field, field_values in chunk_df.groupby('CATEGORY', sort=False)[value_column]:
+            value_sums[field] = value_sums.get(field, 0.0) + field_values.sum()
+            value_sketches.setdefault(field, sketches.KLLSketch()).update(field_values.tolist())
+    return {field: (value_sums[field] / len(value_sketches[field]), value_sketches[field].median())
+            for field in value_sketches}
+
+
+def reportChunked(res_file, value_column, chunksize):
+    fields2explore = [
+        'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
+        'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
+        'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
+    ]
+    category_stats = getChunkedCategoryStats(res_file, value_column, chunksize)
+    for field in fields2explore:
+        average_metric, median_metric = category_stats.get(field, (0.0, 0.0))
+        print('CATEGORY:{}, AVG_PROP_VAL:{}'.format(field, average_metric))
+        print('-' * 50)
+        print('CATEGORY:{}, MEDIAN_PROP_VAL:{}'.format(field, median_metric))
+        print('-' * 50)
+    return category_stats
+
+
 @forensic_wrapper
-def reportProp(res_file):
+def reportProp(res_file, chunksize=None):
     """
-    Compute average and median PROP_VAL per category.
-    Logged by forensic_wrapper().
+    Compute average and median PROP_VAL per category of a proportion file or DataFrame.
+    With a chunksize a file is streamed and medians are approximate for large files.
+    Returns {category: (average, median)}. Logged by forensic_wrapper().
     """
-    res_df = pd.read_csv(res_file)
+    if chunksize is not None and not isinstance(res_file, pd.DataFrame):
+        return reportChunked(res_file, 'PROP_VAL', chunksize)
+    res_df = loadReportFrame(res_file, ['CATEGORY', 'PROP_VAL'])
     fields2explore = [
         'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
         'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
         'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
     ]
+    category_stats = {}
 
     for field in fields2explore:
         field_res_list = res_df[res_df['CATEGORY'] == field]
@@ -53,20 +101,26 @@ def reportProp(res_file):
         median_prop_metric = Median(prop_val_list)
         print('CATEGORY:{}, MEDIAN_PROP_VAL:{}'.format(field, median_prop_metric))
         print('-' * 50)
+        category_stats[field] = (average_prop_metric, median_prop_metric)
+    return category_stats
 
 
 @forensic_wrapper
-def reportDensity(res_file):
+def reportDensity(res_file, chunksize=None):
     """
-    Compute average and median EVENT_DENSITY per category.
-    Logged by forensic_wrapper().
+    Compute average and median EVENT_DENSITY per category of a density file or DataFrame.
+    With a chunksize a file is streamed and medians are approximate for large files.
+    Returns {category: (average, median)}. Logged by forensic_wrapper().
     """
-    res_df = pd.read_csv(res_file)
+    if chunksize is not None and not isinstance(res_file, pd.DataFrame):
+        return reportChunked(res_file, 'EVENT_DENSITY', chunksize)
+    res_df = loadReportFrame(res_file, ['CATEGORY', 'EVENT_DENSITY'])
     fields2explore = [
         'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
         'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
         'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
     ]
+    category_stats = {}
 
     for field in fields2explore:
         field_res_list = res_df[res_df['CATEGORY'] == field]
@@ -79,6 +133,123 @@ def reportDensity(res_file):
         median_density_metric = Median(density_val_list)
         print('CATEGORY:{}, MEDIAN_PROP_VAL:{}'.format(field, median_density_metric))
         print('-' * 50)
+        category_stats[field] = (average_density_metric, median_density_metric)
+    return category_stats
+
+
+def getReportMetric(res_df):
+    """
+    The value column a report file holds: PROP_VAL for proportions, EVENT_DENSITY for densities.
+    """
+    for metric in REPORT_METRICS:
+        if metric in res_df.columns:
+            return metric
+    raise ValueError('no PROP_VAL or EVENT_DENSITY column in {}'.format(list(res_df.columns)))
+
+
+def loadReportFile(res_file, dataset=None):
+    # a DataFrame has no file name to take the dataset from, so it needs one given
+    if dataset is None:
+        if isinstance(res_file, pd.DataFrame):
+            raise ValueError('a dataset name is needed for a report DataFrame')
+        dataset = os.path.splitext(os.path.basename(res_file))[0]
+    res_df = loadReportFrame(res_file)
+    metric = getReportMetric(res_df)
+    return pd.DataFrame({
+        'DATASET': dataset,
+        'METRIC': metric,
+        'CATEGORY': res_df['CATEGORY'],
+        'VALUE': res_df[metric],
+    })
+
+
+def getDatasetNames(res_files):
+    """
+    Dataset labels of a list of report files: the file name without its extension, or the
+    relative path for files whose names clash with another file's. A file listed twice raises
+    ValueError, as its rows could not be told apart.
+    """
+    stems = [None if isinstance(res_file, pd.DataFrame) else os.path.splitext(os.path.basename(res_file))[0]
+             for res_file in res_files]
+    datasets = []
+    for res_file, stem in zip(res_files, stems):
+        if stem is not None and stems.count(stem) > 1:
+            stem = os.path.relpath(res_file)
+        if stem is not None and stem in datasets:
+            raise ValueError('{} is listed more than once'.format(res_file))
+        datasets.append(stem)
+    return datasets
+
+
+@forensic_wrapper
+def reportBatch(res_files, percentiles=(25, 75, 90), output_file=None, workers=None):
+    """
+    Summary of many proportion/density files at once: the files are loaded concurrently and
+    mean, median and percentiles are computed per (dataset, category) in one grouped pass.
+    res_files is a list of files named after their dataset, see getDatasetNames, or a
+    {dataset: file or DataFrame} dict. Returns the tidy table, optionally written to output_file, and prints the lines of
+    reportProp/reportDensity for every file.
+    """
+    if isinstance(res_files, dict):
+        datasets, res_files = list(res_files.keys()), list(res_files.values())
+    else:
+        datasets = getDatasetNames(res_files)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        all_df = pd.concat(list(executor.map(loadReportFile, res_files, datasets)), ignore_index=True)
+
+    grouped = all_df.groupby(['DATASET', 'METRIC', 'CATEGORY'], sort=False)['VALUE']
+    summary_df = grouped.agg(['count', 'mean', 'median'])
+    summary_df.columns = ['COUNT', 'AVERAGE', 'MEDIAN']
+    for percentile in percentiles:
+        summary_df['P{}'.format(percentile)] = grouped.quantile(percentile / 100.0)
+    summary_df = summary_df.reset_index()
+
+    fields2explore = [
+        'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
+        'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
+        'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
+    ]
+    summary_rows = summary_df.set_index(['DATASET', 'CATEGORY'])
+    for dataset in summary_df['DATASET'].unique():
+        print('*' * 50)
+        print(dataset)
+        for field in fields2explore:
+            if (dataset, field) in summary_rows.index:
+                average_metric, median_metric = summary_rows.loc[(dataset, field), ['AVERAGE', 'MEDIAN']]
+            else:
+                average_metric, median_metric = 0.0, 0.0
+            print('CATEGORY:{}, AVG_PROP_VAL:{}'.format(field, average_metric))
+            print('-' * 50)
+            print('CATEGORY:{}, MEDIAN_PROP_VAL:{}'.format(field, median_metric))
+            print('-' * 50)
+
+    if output_file is not None:
+        summary_df.to_csv(output_file, index=False, encoding='utf-8')
+    return summary_df
+
+
+@forensic_wrapper
+def run_pipeline(res_file, dataset=None, proportion_file=None, density_file=None, summary_file=None,
+                 percentiles=(25, 75, 90)):
+    """
+    Results to proportions and densities to summary stats in one process: the results are read
+    once and every stage hands its DataFrame to the next. proportion_file, density_file and
+    summary_file persist a stage when given. res_file may also be a results DataFrame, and the
+    dataset name defaults to the results file name. Returns (proportion_df, density_df, summary_df).
+    """
+    if isinstance(res_file, pd.DataFrame):
+        if dataset is None:
+            raise ValueError('a dataset name is needed for a results DataFrame')
+        res_df = res_file
+    else:
+        if dataset is None:
+            dataset = os.path.splitext(os.path.basename(res_file))[0]
+        res_df = results_store.readResults(res_file)
+    proportion_df = frequency.reportProportion(res_df, proportion_file)
+    density_df = frequency.reportEventDensity(res_df, density_file)
+    summary_df = reportBatch({'PROPORTION_' + dataset: proportion_df, 'DENSITY_' + dataset: density_df},
+                             percentiles=percentiles, output_file=summary_file)
+    return proportion_df, density_df, summary_df
 
 
 if __name__ == '__main__':
@@ -87,41 +258,12 @@ if __name__ == '__main__':
     print('Started at:', giveTimeStamp())
     print('*' * 100)
 
-    print('*' * 100)
-    print("MODELZOO Proportion")
-    RESULTS_FILE = 'PROPORTION_MODELZOO.csv'
-    reportProp(RESULTS_FILE)
-    print('*' * 50)
-
-    print('*' * 50)
-    print("MODELZOO Density")
-    RESULTS_FILE = 'DENSITY_MODELZOO.csv'
-    reportDensity(RESULTS_FILE)
-    print('*' * 100)
-
-    print('*' * 100)
-    print("GITLAB Proportion")
-    RESULTS_FILE = 'PROPORTION_GITLAB.csv'
-    reportProp(RESULTS_FILE)
-    print('*' * 50)
-
-    print('*' * 50)
-    print("GITLAB Density")
-    RESULTS_FILE = 'DENSITY_GITLAB.csv'
-    reportDensity(RESULTS_FILE)
-    print('*' * 100)
-
-    print('*' * 100)
-    print("GITHUB Proportion")
-    RESULTS_FILE = 'PROPORTION_GITHUB.csv'
-    reportProp(RESULTS_FILE)
-    print('*' * 50)
-
-    print('*' * 50)
-    print("GITHUB Density")
-    RESULTS_FILE = 'DENSITY_GITHUB.csv'
-    reportDensity(RESULTS_FILE)
-    print('*' * 100)
+    RESULTS_FILES = [
+        'PROPORTION_MODELZOO.csv', 'DENSITY_MODELZOO.csv',
+        'PROPORTION_GITLAB.csv', 'DENSITY_GITLAB.csv',
+        'PROPORTION_GITHUB.csv', 'DENSITY_GITHUB.csv',
+    ]
+    reportBatch(RESULTS_FILES, output_file='REPORT_SUMMARY.csv')
 
     print('*' * 100)
     print('Ended at:', giveTimeStamp())
@@ -0,0 +1,94 @@
+'''
+Persistent per-file result cache for lint_engine
+Results are addressed by the sha256 of the file content together with lint_engine.getRulesVersion(),
+so unchanged files are not parsed again and any change to the rules invalidates every stored result
+'''
+
+import hashlib
+import json
+import os
+import sqlite3
+import urllib.request
+import constants
+import lint_engine
+import py_parser
+
+
+FLAG_COLUMNS = ['LOGGING_IS_ON_FLAG', 'EXCEPT_LOGGING_IS_ON_FLAG']
+
+
+def getContentHash( py_source ):
+    return hashlib.sha256( py_source ).hexdigest()
+
+
+def analyzeFileWithFlags( py_file, sink_=None ):
+    '''
+    The full result stored per file ... the lint_engine.analyze_file counts followed by the logging flags
+    '''
+    analysis = py_parser.getFileAnalysis(py_file)
+    result_  = lint_engine.analyze_file( analysis, sink_ )
+    result_['LOGGING_IS_ON_FLAG'], result_['EXCEPT_LOGGING_IS_ON_FLAG'] = lint_engine.getLoggingFlags( analysis )
+    return result_
+
+
+class ResultCache(object):
+    '''
+    SQLite store of per-file results under cache_dir ... rows written for other rule versions
+    are dropped when the cache is opened. A readonly cache only serves lookups, so scanner
+    workers can share the store their parent process writes
+    '''
+    def __init__(self, cache_dir=constants.RESULT_CACHE_DIR, readonly=False):
+        self.path          = os.path.join( cache_dir, constants.RESULT_CACHE_FILE )
+        self.rules_version = lint_engine.getRulesVersion()
+        self.hits, self.misses = 0, 0
+        if readonly:
+            self.connection = sqlite3.connect( 'file:{}?mode=ro'.format( urllib.request.pathname2url( os.path.abspath( self.path ) ) ), uri=True )
+            return
+        os.makedirs( cache_dir, exist_ok=True )
+        self.connection    = sqlite3.connect( self.path )
+        # readers in other processes keep working while results are written
+        self.connection.execute( 'PRAGMA journal_mode=WAL' )
+        self.connection.execute( 'CREATE TABLE IF NOT EXISTS results ( content_hash TEXT NOT NULL, rules_version TEXT NOT NULL, '
+                                 'result TEXT NOT NULL, PRIMARY KEY ( content_hash, rules_version ) )' )
+        self.connection.execute( 'DELETE FROM results WHERE rules_version != ?', ( self.rules_version, ) )
+        self.connection.commit()
+
+    def get(self, content_hash):
+        row_ = self.connection.execute( 'SELECT result FROM results WHERE content_hash = ? AND rules_version = ?',
+                                        ( content_hash, self.rules_version ) ).fetchone()
+        if row_ is None:
+            return None
+        return json.loads( row_[0] )
+
+    def put(self, content_hash, result_):
+        self.connection.execute( 'INSERT OR REPLACE INTO results VALUES ( ?, ?, ? )',
+                                 ( content_hash, self.rules_version, json.dumps( result_ ) ) )
+
+    def analyzeFile(self, py_file):
+        '''
+        Cached analyzeFileWithFlags ... only files whose content was never seen under the current
+        rules are parsed
+        '''
+        analysis     = py_parser.getFileAnalysis(py_file)
+        content_hash = getContentHash( analysis.source )
+        result_      = self.get( content_hash )
+        if result_ is None:
+            self.misses += 1
+            result_ = analyzeFileWithFlags( analysis )
+            self.put( content_hash, result_ )
+        else:
+            self.hits += 1
+        return result_
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
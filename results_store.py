@@ -0,0 +1,227 @@
+'''
+Results store ... scanner results (constants.CSV_HEADER) are kept as CSV, or as Parquet / Feather
+files when the optional pyarrow is installed. Columnar files dictionary-encode the repo column,
+keep the unique file paths as plain strings and the counts as int32. Readers project columns, so a report only parses the columns it
+uses, and hand the path columns out as categoricals
+'''
+
+import csv
+import os
+import pandas as pd
+import constants
+
+
+PATH_COLUMNS   = ['REPO_FULL_PATH', 'FILE_FULL_PATH']
+# every file path is unique, so only the repo column gains from a dictionary
+DICTIONARY_COLUMNS = ['REPO_FULL_PATH']
+PARQUET_SUFFIX = '.parquet'
+FEATHER_SUFFIX = '.feather'
+
+
+def _getPyArrow():
+    '''
+    pyarrow is imported on first use ... None when it is not installed
+    '''
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _requirePyArrow( results_file ):
+    pyarrow = _getPyArrow()
+    if pyarrow is None:
+        raise ImportError( 'pyarrow is needed for {} ... pip install -r requirements-columnar.txt or use a .csv results file'.format( results_file ) )
+    return pyarrow
+
+
+def getResultsFormat( results_file ):
+    if results_file.endswith( PARQUET_SUFFIX ):
+        return 'parquet'
+    if results_file.endswith( FEATHER_SUFFIX ):
+        return 'feather'
+    return 'csv'
+
+
+def getTempFile( results_file ):
+    '''
+    a temporary file next to results_file that keeps its format suffix
+    '''
+    base_, suffix_ = os.path.splitext( results_file )
+    return base_ + '.tmp' + suffix_
+
+
+class CSVResultsWriter(object):
+    def __init__(self, results_file, header_=constants.CSV_HEADER):
+        self.file_   = open( results_file, 'w', newline='' )
+        self.writer_ = csv.writer( self.file_ )
+        self.writer_.writerow( header_ )
+
+    def writerow(self, row_):
+        self.writer_.writerow( row_ )
+
+    def close(self):
+        self.file_.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ArrowResultsWriter(object):
+    '''
+    Writes rows batch_size at a time as Parquet row groups or zstd compressed Feather record
+    batches ... the repo column is a dictionary-encoded string, the file column a plain string and
+    every other column an int32 count. Parquet row groups each carry the dictionary of their own
+    rows, Feather batches add the repos they bring as dictionary deltas
+    '''
+    def __init__(self, results_file, header_=constants.CSV_HEADER, batch_size=constants.RESULT_CHUNK_ROWS):
+        self.pyarrow    = _requirePyArrow( results_file )
+        self.header_    = list( header_ )
+        self.batch_size = batch_size
+        self.rows_      = []
+        self.is_parquet = getResultsFormat( results_file ) == 'parquet'
+        # Feather only takes dictionary deltas after its first batch, so its dictionaries grow
+        # across batches ... they hold one entry per repo
+        self.dictionaries_ = { column_: {} for column_ in self.header_ if column_ in DICTIONARY_COLUMNS }
+        self.schema_    = self.pyarrow.schema( [ self.pyarrow.field( column_, self._getColumnType( column_ ) ) for column_ in self.header_ ] )
+        if self.is_parquet:
+            self.writer_ = self.pyarrow.parquet.ParquetWriter( results_file, self.schema_, use_dictionary=[ column_ for column_ in self.header_ if column_ in DICTIONARY_COLUMNS ] )
+        else:
+            self.writer_ = self.pyarrow.ipc.new_file( results_file, self.schema_, options=self.pyarrow.ipc.IpcWriteOptions( emit_dictionary_deltas=True, compression='zstd' ) )
+
+    def _getColumnType(self, column_):
+        if column_ in DICTIONARY_COLUMNS:
+            return self.pyarrow.dictionary( self.pyarrow.int32(), self.pyarrow.string() )
+        if column_ in PATH_COLUMNS:
+            return self.pyarrow.string()
+        return self.pyarrow.int32()
+
+    def writerow(self, row_):
+        self.rows_.append( row_ )
+        if len( self.rows_ ) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows_:
+            return
+        columns_ = []
+        for index_, column_ in enumerate( self.header_ ):
+            values_ = [ row_[index_] for row_ in self.rows_ ]
+            if column_ in DICTIONARY_COLUMNS:
+                # a Parquet row group starts a dictionary of its own
+                dictionary_ = {} if self.is_parquet else self.dictionaries_[column_]
+                indices_    = self.pyarrow.array( [ dictionary_.setdefault( value_, len( dictionary_ ) ) for value_ in values_ ], self.pyarrow.int32() )
+                columns_.append( self.pyarrow.DictionaryArray.from_arrays( indices_, self.pyarrow.array( list( dictionary_ ), self.pyarrow.string() ) ) )
+            elif column_ in PATH_COLUMNS:
+                columns_.append( self.pyarrow.array( values_, self.pyarrow.string() ) )
+            else:
+                columns_.append( self.pyarrow.array( [ int( value_ ) for value_ in values_ ], self.pyarrow.int32() ) )
+        self.writer_.write_table( self.pyarrow.Table.from_arrays( columns_, schema=self.schema_ ) )
+        self.rows_ = []
+
+    def close(self):
+        self.flush()
+        self.writer_.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def getResultsWriter( results_file, header_=constants.CSV_HEADER ):
+    if getResultsFormat( results_file ) == 'csv':
+        return CSVResultsWriter( results_file, header_ )
+    return ArrowResultsWriter( results_file, header_ )
+
+
+def readResultsHeader( results_file ):
+    results_format = getResultsFormat( results_file )
+    if results_format == 'csv':
+        return list( pd.read_csv( results_file, nrows=0 ).columns )
+    pyarrow = _requirePyArrow( results_file )
+    if results_format == 'parquet':
+        return pyarrow.parquet.ParquetFile( results_file ).schema_arrow.names
+    with pyarrow.ipc.open_file( results_file ) as reader_:
+        return reader_.schema.names
+
+
+def _sortCategories( results_df ):
+    # categories in sorted order, so grouping by a path column orders groups as plain strings do
+    for column_ in PATH_COLUMNS:
+        if column_ in results_df.columns:
+            results_df[column_] = results_df[column_].astype( 'category' )
+            results_df[column_] = results_df[column_].cat.set_categories( sorted( results_df[column_].cat.categories ) )
+    return results_df
+
+
+def readResults( results_file, columns=None ):
+    '''
+    the results as a DataFrame, with only the given columns parsed
+    '''
+    results_format = getResultsFormat( results_file )
+    if results_format == 'csv':
+        path_dtypes = { column_: 'category' for column_ in PATH_COLUMNS }
+        return _sortCategories( pd.read_csv( results_file, usecols=columns, dtype=path_dtypes ) )
+    _requirePyArrow( results_file )
+    if results_format == 'parquet':
+        return _sortCategories( pd.read_parquet( results_file, columns=columns ) )
+    return _sortCategories( pd.read_feather( results_file, columns=columns ) )
+
+
+def iterResultChunks( results_file, columns=None, chunksize=constants.RESULT_CHUNK_ROWS ):
+    '''
+    DataFrames of at most chunksize rows ... path columns are plain strings, as categories
+    would differ from chunk to chunk
+    '''
+    results_format = getResultsFormat( results_file )
+    if results_format == 'csv':
+        for chunk_df in pd.read_csv( results_file, chunksize=chunksize, usecols=columns ):
+            yield chunk_df
+        return
+    pyarrow = _requirePyArrow( results_file )
+    if results_format == 'parquet':
+        record_batches = pyarrow.parquet.ParquetFile( results_file ).iter_batches( batch_size=chunksize, columns=columns )
+    else:
+        reader_ = pyarrow.ipc.open_file( results_file )
+        record_batches = ( reader_.get_batch( index_ ).select( columns ) if columns is not None else reader_.get_batch( index_ )
+                           for index_ in range( reader_.num_record_batches ) )
+    for record_batch in record_batches:
+        chunk_df = record_batch.to_pandas()
+        for column_ in PATH_COLUMNS:
+            if column_ in chunk_df.columns:
+                chunk_df[column_] = chunk_df[column_].astype( str )
+        for start_ in range( 0, len( chunk_df ), chunksize ):
+            yield chunk_df.iloc[start_:start_ + chunksize]
+
+
+def iterResultRows( results_file ):
+    '''
+    rows of a results file as lists, in file order
+    '''
+    if getResultsFormat( results_file ) == 'csv':
+        with open( results_file, newline='' ) as csv_file:
+            reader_ = csv.reader( csv_file )
+            next( reader_, None )
+            for row_ in reader_:
+                yield row_
+        return
+    for chunk_df in iterResultChunks( results_file ):
+        for row_ in chunk_df.itertuples( index=False ):
+            yield list( row_ )
+
+
+def exportCSV( results_file, csv_file, chunksize=constants.RESULT_CHUNK_ROWS ):
+    '''
+    copies a results file of any format to csv_file, chunksize rows at a time
+    '''
+    with CSVResultsWriter( csv_file, readResultsHeader( results_file ) ) as writer_:
+        for row_ in iterResultRows( results_file ):
+            writer_.writerow( row_ )
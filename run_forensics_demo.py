@@ -6,8 +6,7 @@ Creates a tiny fake results CSV and calls some decorated functions.
 import os
 import pandas as pd
 
-from frequency import reportProportion, reportEventDensity
-from report import reportProp, reportDensity
+from report import reportProp, reportDensity, run_pipeline
 
 
 def make_dummy_files(out_dir: str):
@@ -64,20 +63,20 @@ def main():
     dummy_results = os.path.join(out_dir, "dummy_results.csv")
     prop_csv = os.path.join(out_dir, "dummy_prop.csv")
     density_csv = os.path.join(out_dir, "dummy_density.csv")
+    summary_csv = os.path.join(out_dir, "dummy_summary.csv")
 
     make_dummy_csv(dummy_results)
 
-    print("\n=== Calling frequency.reportProportion ===")
-    reportProportion(dummy_results, prop_csv)
-
-    print("\n=== Calling frequency.reportEventDensity ===")
-    reportEventDensity(dummy_results, density_csv)
+    # every stage hands its DataFrame to the next, the CSVs are only written for inspection
+    print("\n=== Calling report.run_pipeline ===")
+    prop_df, density_df, _ = run_pipeline(dummy_results, proportion_file=prop_csv,
+                                          density_file=density_csv, summary_file=summary_csv)
 
     print("\n=== Calling report.reportProp ===")
-    reportProp(prop_csv)
+    reportProp(prop_df)
 
     print("\n=== Calling report.reportDensity ===")
-    reportDensity(density_csv)
+    reportDensity(density_df)
 
     print("\nDone. Check 'forensics.log' in the repo root to see logged events.")
 
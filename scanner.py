@@ -0,0 +1,517 @@
+'''
+Corpus scanner ... runs every lint_engine detector over the python files of many repositories
+in a pool of worker processes and streams the V5_OUTPUT results (constants.CSV_HEADER) as CSV,
+Parquet or Feather by the suffix of the output file
+'''
+
+import argparse
+import collections
+import json
+import os
+import signal
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from git import Repo
+from git import exc
+import constants
+import event_sink
+import lint_engine
+import py_parser
+import result_cache
+import results_store
+
+
+SCAN_MATCHED  = 'MATCHED'
+SCAN_SKIPPED  = 'PREFILTER_SKIPPED'
+SCAN_CACHED   = 'CACHED'
+SCAN_TIMEOUT  = 'TIMED_OUT'
+SCAN_ERROR    = 'FAILED'
+SCAN_CRASHED  = 'CRASHED'
+
+
+class ScanTimeout(Exception):
+    pass
+
+
+def _raiseScanTimeout( signum, frame ):
+    raise ScanTimeout()
+
+
+def getRepoRoots( parent_dir ):
+    '''
+    every repository directly under parent_dir, the way the model zoo results are organized
+    '''
+    return sorted( dir_.path for dir_ in os.scandir( parent_dir ) if dir_.is_dir() )
+
+
+def getPythonFiles( repo_root ):
+    '''
+    python files of one repository in a stable order ... git metadata is not walked
+    '''
+    for root_, dirs_, files_ in os.walk( repo_root ):
+        dirs_[:] = sorted( dir_ for dir_ in dirs_ if dir_ != '.git' )
+        for file_ in sorted( files_ ):
+            if file_.endswith( '.py' ):
+                yield os.path.join( root_, file_ )
+
+
+def getWorkerCount():
+    '''
+    cores this process may run on, which respects cpu affinity limits of containers
+    '''
+    if hasattr( os, 'sched_getaffinity' ):
+        return len( os.sched_getaffinity( 0 ) )
+    return os.cpu_count() or 1
+
+
+def getScanJobs( repo_roots, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None, collect_events=False ):
+    for repo_root in repo_roots:
+        for py_file in getPythonFiles( repo_root ):
+            yield ( repo_root, py_file, timeout_, cache_dir, collect_events, None )
+
+
+def getPythonBlobs( ls_tree_output ):
+    '''
+    ( path, blob sha ) of the python files in `git ls-tree -r -z` output, in getPythonFiles
+    order ... symlinks and submodules are left out
+    '''
+    python_blobs = []
+    for entry_ in ls_tree_output.split( '\0' ):
+        if entry_:
+            entry_meta, git_path = entry_.split( '\t', 1 )
+            entry_mode, entry_type, entry_sha = entry_meta.split( ' ' )
+            if entry_type == 'blob' and entry_mode != '120000' and git_path.endswith( '.py' ):
+                python_blobs.append( ( git_path, entry_sha ) )
+    return sorted( python_blobs, key=lambda python_blob: _walkOrderKey( python_blob[0].split( '/' ) ) )
+
+
+def readBlob( repo_, blob_sha, py_file ):
+    '''
+    content of a blob from the repository's git cat-file --batch process ... None when the blob
+    is missing or cannot be fetched
+    '''
+    try:
+        return repo_.git.get_object_data( blob_sha )[3]
+    except ValueError as e_:
+        print( 'Skipping this file ... scan', SCAN_ERROR, py_file, repr( e_ ) )
+        return None
+
+
+def getGitScanJobs( repo_roots, rev_=constants.GIT_SCAN_REV, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None, collect_events=False, scan_stats=None ):
+    '''
+    scan jobs carrying the python blobs of rev_ read from each repository's object database
+    through one persistent git cat-file --batch process per repository ... bare and partial
+    clones need no checkout. Files keep the path they would have in a checkout of repo_root.
+    Blobs that cannot be read, such as blobs missing from a partial clone, get no job and are
+    counted as SCAN_ERROR in scan_stats
+    '''
+    for repo_root in repo_roots:
+        try:
+            repo_ = Repo( repo_root )
+        except ( exc.InvalidGitRepositoryError, exc.NoSuchPathError ):
+            print( 'Skipping this repo ... due to git problem', repo_root )
+            continue
+        try:
+            ls_tree_output = repo_.git.ls_tree( '-r', '-z', '--full-tree', '--end-of-options', rev_ )
+            for git_path, blob_sha in getPythonBlobs( ls_tree_output ):
+                py_file = _getRepoPath( repo_root, git_path )
+                py_source = readBlob( repo_, blob_sha, py_file )
+                if py_source is None:
+                    if scan_stats is not None:
+                        scan_stats[SCAN_ERROR] += 1
+                    continue
+                yield ( repo_root, py_file, timeout_, cache_dir, collect_events, py_source )
+        except exc.GitCommandError:
+            print( 'Skipping this repo ... due to branch name problem', repo_root, rev_ )
+        finally:
+            repo_.close()
+
+
+_worker_cache = {}
+
+def _getWorkerCache( cache_dir ):
+    if cache_dir not in _worker_cache:
+        _worker_cache[cache_dir] = result_cache.ResultCache( cache_dir, readonly=True )
+    return _worker_cache[cache_dir]
+
+
+def scanFile( job_ ):
+    '''
+    Worker side of the scan ... returns ( status, result, content hash, events ) for one file. The
+    file is abandoned with SCAN_TIMEOUT once it runs past its timeout, and any error is returned
+    instead of raised so one bad file does not stop the others. Events are only collected when
+    asked for, and then the file is always analyzed since cached results hold no events. Jobs
+    from getGitScanJobs carry the file content, which is analyzed in memory
+    '''
+    try:
+        repo_root, py_file, timeout_, cache_dir, collect_events, py_source = job_
+        use_alarm = timeout_ and hasattr( signal, 'SIGALRM' )
+        if use_alarm:
+            signal.signal( signal.SIGALRM, _raiseScanTimeout )
+            signal.setitimer( signal.ITIMER_REAL, timeout_ )
+        try:
+            return _analyzeJob( py_file, cache_dir, collect_events, py_source )
+        finally:
+            # an alarm going off before it is cancelled here is still caught below
+            if use_alarm:
+                signal.setitimer( signal.ITIMER_REAL, 0 )
+    except ScanTimeout:
+        return SCAN_TIMEOUT, None, None, []
+    except Exception as e_:
+        return SCAN_ERROR, repr( e_ ), None, []
+
+
+def _analyzeJob( py_file, cache_dir, collect_events, py_source ):
+    sink_ = event_sink.ListSink() if collect_events else None
+    if py_source is None:
+        analysis = py_parser.getFileAnalysis( py_file )
+    else:
+        analysis = py_parser.FileAnalysis( py_file, py_source )
+    content_hash = None
+    if cache_dir is not None:
+        content_hash = result_cache.getContentHash( analysis.source )
+        result_      = None if collect_events else _getWorkerCache( cache_dir ).get( content_hash )
+        if result_ is not None:
+            return SCAN_CACHED, result_, content_hash, []
+        result_ = result_cache.analyzeFileWithFlags( analysis, sink_ )
+    else:
+        result_ = lint_engine.analyze_file( analysis, sink_ )
+    status_ = SCAN_MATCHED if lint_engine.passesPrefilter( analysis ) else SCAN_SKIPPED
+    return status_, result_, content_hash, sink_.events if collect_events else []
+
+
+def _getDeadline( job_ ):
+    '''
+    seconds the parent waits for a job's result ... the worker's own alarm plus a grace, for
+    files stuck where the alarm cannot reach them. None when the job has no timeout
+    '''
+    timeout_ = job_[2]
+    return timeout_ + constants.SCAN_TIMEOUT_GRACE if timeout_ else None
+
+
+def _killPool( executor ):
+    # the public shutdown() cannot kill a hung worker, so the workers are reached through the
+    # private _processes of CPython's ProcessPoolExecutor. Without it only shutdown() is left,
+    # which still cancels the queued jobs
+    processes_ = getattr( executor, '_processes', None ) or {}
+    for process_ in list( processes_.values() ):
+        process_.kill()
+    executor.shutdown( wait=False, cancel_futures=True )
+
+
+def _rerunJob( executor, job_, workers, mp_context ):
+    '''
+    runs one suspect job alone ... returns its result and the pool to go on with, a new one when
+    the job crashed or hung its worker
+    '''
+    try:
+        return executor.submit( scanFile, job_ ).result( timeout=_getDeadline( job_ ) ), executor
+    except BrokenProcessPool:
+        result_ = ( SCAN_CRASHED, None, None, [] )
+    except FutureTimeout:
+        result_ = ( SCAN_TIMEOUT, None, None, [] )
+    except Exception as e_:
+        # the worker is fine, the job or its result could not be passed to or from it
+        return ( SCAN_ERROR, repr( e_ ), None, [] ), executor
+    _killPool( executor )
+    return result_, ProcessPoolExecutor( max_workers=workers, mp_context=mp_context )
+
+
+def _getDoneFuture( result_ ):
+    future_ = Future()
+    future_.set_result( result_ )
+    return future_
+
+
+def _isFinished( future_ ):
+    return future_.done() and not future_.cancelled() and future_.exception() is None
+
+
+def iterScanResults( jobs_, workers=None, mp_context=None ):
+    '''
+    Yields ( job, ( status, result, content hash, events ) ) in job order. At most
+    workers * SCAN_QUEUE_FACTOR jobs are in flight. When a worker dies, while a result is
+    awaited or while the window is refilled, the pool is rebuilt and the jobs that were in flight
+    are rerun one at a time, so only the file that kills its worker again is reported as
+    SCAN_CRASHED. A job whose result does not come within its deadline is reported as
+    SCAN_TIMEOUT and its pool is killed, and the jobs in flight that had not finished are
+    submitted again to a new pool. Any other exception a job raises is reported as SCAN_ERROR
+    '''
+    workers  = workers or getWorkerCount()
+    jobs_    = iter( jobs_ )
+    window_  = collections.deque()
+    # ( job, future ) of jobs to put back in the window before new jobs, a done future for
+    # jobs that finished before their pool was killed
+    requeued = collections.deque()
+    executor = ProcessPoolExecutor( max_workers=workers, mp_context=mp_context )
+    try:
+        while True:
+            suspects = None
+            while len( window_ ) < workers * constants.SCAN_QUEUE_FACTOR:
+                if requeued:
+                    job_, future_ = requeued.popleft()
+                else:
+                    job_, future_ = next( jobs_, None ), None
+                    if job_ is None:
+                        break
+                if future_ is None:
+                    try:
+                        future_ = executor.submit( scanFile, job_ )
+                    except BrokenProcessPool:
+                        # the job that could not be submitted is rerun with the ones in flight
+                        suspects = list( window_ ) + [ ( job_, None ) ]
+                        break
+                window_.append( ( job_, future_ ) )
+            if suspects is None:
+                if not window_:
+                    break
+                job_, future_ = window_.popleft()
+                try:
+                    result_ = future_.result( timeout=_getDeadline( job_ ) )
+                except BrokenProcessPool:
+                    suspects = [ ( job_, future_ ) ] + list( window_ )
+                except FutureTimeout:
+                    # only the timed out job is suspect, the others go back to a new pool in order
+                    requeued.extendleft( reversed( [ ( window_job, _getDoneFuture( window_future.result() ) if _isFinished( window_future ) else None )
+                                                     for window_job, window_future in window_ ] ) )
+                    window_.clear()
+                    _killPool( executor )
+                    executor = ProcessPoolExecutor( max_workers=workers, mp_context=mp_context )
+                    yield job_, ( SCAN_TIMEOUT, None, None, [] )
+                    continue
+                except Exception as e_:
+                    # raised out of the worker or while passing the job or its result, so one
+                    # bad file does not stop the others
+                    yield job_, ( SCAN_ERROR, repr( e_ ), None, [] )
+                    continue
+                else:
+                    yield job_, result_
+                    continue
+            window_.clear()
+            _killPool( executor )
+            executor = ProcessPoolExecutor( max_workers=workers, mp_context=mp_context )
+            for job_, future_ in suspects:
+                if future_ is not None and _isFinished( future_ ):
+                    yield job_, future_.result()
+                    continue
+                result_, executor = _rerunJob( executor, job_, workers, mp_context )
+                yield job_, result_
+    finally:
+        if window_:
+            # abandoned with jobs in flight, one of which may never return
+            _killPool( executor )
+        else:
+            executor.shutdown( wait=True, cancel_futures=True )
+
+
+def _iterScanRows( scan_jobs, workers, cache_, sink_, scan_stats ):
+    '''
+    Yields ( repo_root, py_file, row ) per job in job order, with a None row for files that timed
+    out, failed or crashed ... results are stored in cache_ and events emitted into sink_ on the way
+    '''
+    for job_, ( status_, result_, content_hash, events_ ) in iterScanResults( scan_jobs, workers ):
+        repo_root, py_file = job_[0], job_[1]
+        scan_stats[status_] += 1
+        if status_ in ( SCAN_TIMEOUT, SCAN_ERROR, SCAN_CRASHED ):
+            print( 'Skipping this file ... scan', status_, py_file, result_ or '' )
+            yield repo_root, py_file, None
+            continue
+        if cache_ is not None and status_ != SCAN_CACHED:
+            cache_.put( content_hash, result_ )
+        if sink_ is not None:
+            sink_.emitAll( events_ )
+        yield repo_root, py_file, [ repo_root, py_file ] + [ result_[column_] for column_ in constants.CSV_HEADER[2:] ]
+
+
+def scanRepos( repo_roots, output_file, workers=None, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None, sink_=None, rev_=None ):
+    '''
+    Scans every python file of repo_roots into output_file and returns the count of files per
+    scan status ... files that time out, fail or crash their worker get no row. The events of
+    each file are emitted into sink_ by this process, in file order, when a sink is given.
+    With rev_ the files of that commit are read from the git object database instead of the
+    working tree
+    '''
+    scan_stats = collections.Counter()
+    cache_     = result_cache.ResultCache( cache_dir ) if cache_dir is not None else None
+    try:
+        with results_store.getResultsWriter( output_file ) as writer_:
+            if rev_ is None:
+                scan_jobs = getScanJobs( repo_roots, timeout_, cache_dir, sink_ is not None )
+            else:
+                scan_jobs = getGitScanJobs( repo_roots, rev_, timeout_, cache_dir, sink_ is not None, scan_stats )
+            for repo_root, py_file, row_ in _iterScanRows( scan_jobs, workers, cache_, sink_, scan_stats ):
+                if row_ is not None:
+                    writer_.writerow( row_ )
+    finally:
+        if cache_ is not None:
+            cache_.close()
+    return scan_stats
+
+
+def getHeadCommit( repo_root ):
+    try:
+        return Repo( repo_root ).head.commit.hexsha
+    except ( exc.InvalidGitRepositoryError, exc.NoSuchPathError, ValueError ):
+        return None
+
+
+def _getRepoPath( repo_root, git_path ):
+    return os.path.join( repo_root, *git_path.split( '/' ) )
+
+
+def getChangedFiles( repo_root, old_commit, head_commit ):
+    '''
+    ( changed, deleted ) python files of a repository between two commits ... added, modified,
+    renamed and copied files that are on disk are changed, deleted files and the old side of
+    renames are deleted. None when there is no usable old commit to diff from
+    '''
+    if old_commit is None or head_commit is None:
+        return None
+    try:
+        diff_list = Repo( repo_root ).commit( old_commit ).diff( head_commit )
+    except ( exc.GitCommandError, exc.BadName, ValueError ):
+        print( 'Scanning this repo in full ... no diff from commit', old_commit, repo_root )
+        return None
+    changed_files, deleted_files = [], []
+    for diff_ in diff_list:
+        if diff_.change_type in ( 'D', 'R' ):
+            deleted_files.append( diff_.a_path )
+        if diff_.change_type != 'D':
+            changed_files.append( diff_.b_path )
+    changed_files = [ _getRepoPath( repo_root, path_ ) for path_ in changed_files if path_.endswith( '.py' ) ]
+    deleted_files = [ _getRepoPath( repo_root, path_ ) for path_ in deleted_files if path_.endswith( '.py' ) ]
+    return [ py_file for py_file in changed_files if os.path.isfile( py_file ) ], deleted_files
+
+
+def _walkOrderKey( path_parts ):
+    '''
+    sorts the relative paths of a repository's files in getPythonFiles order ... the files of a
+    folder come before the files of its sub folders
+    '''
+    return [ ( 1, dir_ ) for dir_ in path_parts[:-1] ] + [ ( 0, path_parts[-1] ) ]
+
+
+def readResultRows( output_file ):
+    '''
+    rows of an existing results file as { repo : { file : row } }, in file order
+    '''
+    result_rows = collections.OrderedDict()
+    if os.path.exists( output_file ):
+        for row_ in results_store.iterResultRows( output_file ):
+            result_rows.setdefault( row_[0], collections.OrderedDict() )[row_[1]] = row_
+    return result_rows
+
+
+def loadScanState( output_file ):
+    '''
+    { repo : { 'commit' : sha, 'failed' : [ file ] } } recorded by the last rescan of output_file
+    '''
+    state_file = output_file + constants.SCAN_STATE_SUFFIX
+    scan_state = {}
+    if os.path.exists( state_file ):
+        with open( state_file ) as file_:
+            scan_state = json.load( file_ )
+    for repo_root, repo_state in scan_state.items():
+        # older state files hold only the commit of each repo
+        if not isinstance( repo_state, dict ):
+            scan_state[repo_root] = { 'commit' : repo_state, 'failed' : [] }
+    return scan_state
+
+
+def saveScanState( output_file, scan_state ):
+    with open( output_file + constants.SCAN_STATE_SUFFIX, 'w' ) as file_:
+        json.dump( scan_state, file_, indent=1, sort_keys=True )
+
+
+def rescanRepos( repo_roots, output_file, workers=None, timeout_=constants.SCAN_FILE_TIMEOUT, cache_dir=None, sink_=None ):
+    '''
+    Incremental scan into an existing output_file ... the commit scanned last is recorded per
+    repository next to the output, and only python files changed between that commit and HEAD
+    are scanned again, along with the files that timed out, failed or crashed last time. Rows of
+    deleted files are dropped and the new rows are merged into the results. Repositories without
+    a recorded commit, without rows in output_file, or that are not git repositories, are
+    scanned in full. Uncommitted changes in the working tree are not looked at
+    '''
+    scan_state   = loadScanState( output_file )
+    result_rows  = readResultRows( output_file )
+    head_commits = {}
+    failed_files = collections.defaultdict( list )
+    scan_jobs    = []
+    for repo_root in repo_roots:
+        head_commits[repo_root] = getHeadCommit( repo_root )
+        # the recorded commit only describes the rows that are still in output_file
+        repo_state    = scan_state.get( repo_root ) if repo_root in result_rows else None
+        changed_files = None
+        if repo_state is not None:
+            changed_files = getChangedFiles( repo_root, repo_state['commit'], head_commits[repo_root] )
+        if changed_files is None:
+            result_rows[repo_root] = collections.OrderedDict()
+            changed_files = list( getPythonFiles( repo_root ) )
+        else:
+            changed_files, deleted_files = changed_files
+            changed_files += [ py_file for py_file in repo_state['failed']
+                               if os.path.isfile( py_file ) and py_file not in changed_files and py_file not in deleted_files ]
+            repo_rows = result_rows[repo_root]
+            for py_file in deleted_files + changed_files:
+                repo_rows.pop( py_file, None )
+        scan_jobs += [ ( repo_root, py_file, timeout_, cache_dir, sink_ is not None, None ) for py_file in changed_files ]
+
+    scan_stats = collections.Counter()
+    cache_     = result_cache.ResultCache( cache_dir ) if cache_dir is not None else None
+    try:
+        for repo_root, py_file, row_ in _iterScanRows( scan_jobs, workers, cache_, sink_, scan_stats ):
+            if row_ is None:
+                failed_files[repo_root].append( py_file )
+            else:
+                result_rows[repo_root][py_file] = row_
+    finally:
+        if cache_ is not None:
+            cache_.close()
+
+    temp_file = results_store.getTempFile( output_file )
+    with results_store.getResultsWriter( temp_file ) as writer_:
+        for repo_root, repo_rows in result_rows.items():
+            for py_file in sorted( repo_rows, key=lambda py_file: _walkOrderKey( os.path.relpath( py_file, repo_root ).split( os.sep ) ) ):
+                writer_.writerow( repo_rows[py_file] )
+    os.replace( temp_file, output_file )
+
+    for repo_root, head_commit in head_commits.items():
+        if head_commit is None:
+            scan_state.pop( repo_root, None )
+        else:
+            scan_state[repo_root] = { 'commit' : head_commit, 'failed' : failed_files[repo_root] }
+    saveScanState( output_file, scan_state )
+    return scan_stats
+
+
+if __name__=='__main__':
+    parser_ = argparse.ArgumentParser( description='Scan repositories into the FAME-ML results file' )
+    parser_.add_argument( 'output_file', help='a .csv file, or .parquet / .feather when pyarrow is installed' )
+    parser_.add_argument( 'repo_roots', nargs='+' )
+    parser_.add_argument( '--zoo', action='store_true', help='every repo_root is a folder of repositories' )
+    parser_.add_argument( '--workers', type=int, default=None )
+    parser_.add_argument( '--timeout', type=float, default=constants.SCAN_FILE_TIMEOUT )
+    parser_.add_argument( '--cache-dir', default=None )
+    parser_.add_argument( '--events', default=None, help='write every event to this .jsonl or .csv file' )
+    parser_.add_argument( '--incremental', action='store_true', help='only scan files changed since the last scan of each repo' )
+    parser_.add_argument( '--git-rev', default=None, help='scan this commit from the git object database instead of the working tree' )
+    args_ = parser_.parse_args()
+    if args_.incremental and args_.git_rev is not None:
+        # rescanRepos diffs the working tree's HEAD, it cannot scan another revision
+        parser_.error( '--incremental and --git-rev cannot be used together' )
+
+    repo_roots = args_.repo_roots
+    if args_.zoo:
+        repo_roots = [ repo_ for parent_dir in args_.repo_roots for repo_ in getRepoRoots( parent_dir ) ]
+    sink_      = event_sink.getFileSink( args_.events ) if args_.events else None
+    try:
+        if args_.incremental:
+            scan_stats = rescanRepos( repo_roots, args_.output_file, args_.workers, args_.timeout, args_.cache_dir, sink_ )
+        else:
+            scan_stats = scanRepos( repo_roots, args_.output_file, args_.workers, args_.timeout, args_.cache_dir, sink_, args_.git_rev )
+    finally:
+        if sink_ is not None:
+            sink_.close()
+    print( dict( scan_stats ) )
@@ -0,0 +1,190 @@
+'''
+Mergeable sketches for corpus-wide statistics ... a HyperLogLog sketch counts distinct values
+in a few kilobytes with a chosen relative error, and ExactCounter keeps the values for small
+runs. Both count what was added and merge counters of the same kind. KLLSketch keeps quantiles
+of a stream of numbers in bounded memory
+'''
+
+import base64
+import hashlib
+import math
+import random
+import statistics
+import numpy as np
+import constants
+
+
+class ExactCounter(object):
+    '''
+    Distinct counter that keeps every value
+    '''
+    def __init__(self):
+        self.values_ = set()
+
+    def add(self, value_):
+        self.values_.add( value_ )
+
+    def update(self, values_):
+        self.values_.update( values_ )
+
+    def merge(self, other_):
+        self.values_.update( other_.values_ )
+        return self
+
+    def count(self):
+        return len( self.values_ )
+
+    def __len__(self):
+        return self.count()
+
+
+_SMALL_HLL_ALPHA = { 16: 0.673, 32: 0.697, 64: 0.709 }
+
+
+class HyperLogLog(object):
+    '''
+    HyperLogLog sketch with 2 ** precision registers ... the precision is the smallest one whose
+    standard error 1.04 / sqrt( registers ) is within error_rate
+    '''
+    def __init__(self, error_rate=constants.DISTINCT_ERROR_RATE):
+        self.error_rate = error_rate
+        precision_ = int( math.ceil( math.log2( ( 1.04 / error_rate ) ** 2 ) ) )
+        self.precision = min( max( precision_, constants.HLL_MIN_PRECISION ), constants.HLL_MAX_PRECISION )
+        self.registers = np.zeros( 1 << self.precision, dtype=np.uint8 )
+
+    def add(self, value_):
+        hash_  = int.from_bytes( hashlib.blake2b( value_.encode( constants.UTF_ENCODING ), digest_size=8 ).digest(), 'big' )
+        index_ = hash_ >> ( 64 - self.precision )
+        # rank of the first set bit in the bits left after the register index
+        rank_  = 64 - self.precision - ( hash_ & ( ( 1 << ( 64 - self.precision ) ) - 1 ) ).bit_length() + 1
+        if rank_ > self.registers[index_]:
+            self.registers[index_] = rank_
+
+    def update(self, values_):
+        for value_ in values_:
+            self.add( value_ )
+
+    def merge(self, other_):
+        if other_.precision != self.precision:
+            raise ValueError( 'cannot merge sketches of precision {} and {}'.format( self.precision, other_.precision ) )
+        np.maximum( self.registers, other_.registers, out=self.registers )
+        return self
+
+    def getState(self):
+        '''
+        JSON-able state of the sketch ... its size does not grow with the values added
+        '''
+        return { 'error_rate': self.error_rate, 'precision': self.precision,
+                 'registers': base64.b64encode( self.registers.tobytes() ).decode( 'ascii' ) }
+
+    @classmethod
+    def fromState(cls, state_):
+        sketch_ = cls( state_['error_rate'] )
+        sketch_.precision = state_['precision']
+        sketch_.registers = np.frombuffer( base64.b64decode( state_['registers'] ), dtype=np.uint8 ).copy()
+        return sketch_
+
+    def count(self):
+        register_count = len( self.registers )
+        # the bias correction formula only holds from 128 registers, smaller sketches take the
+        # published constants
+        alpha_   = _SMALL_HLL_ALPHA.get( register_count, 0.7213 / ( 1 + 1.079 / register_count ) )
+        estimate = alpha_ * register_count ** 2 / np.sum( np.ldexp( 1.0, -self.registers.astype( np.int64 ) ) )
+        empty_registers = int( np.count_nonzero( self.registers == 0 ) )
+        if estimate <= 2.5 * register_count and empty_registers > 0:
+            # linear counting is more accurate for small cardinalities
+            estimate = register_count * math.log( register_count / empty_registers )
+        return int( round( estimate ) )
+
+    def __len__(self):
+        return self.count()
+
+
+def getDistinctCounter( error_rate=None ):
+    '''
+    ExactCounter when no error_rate is given, a HyperLogLog sketch otherwise
+    '''
+    if error_rate is None:
+        return ExactCounter()
+    return HyperLogLog( error_rate )
+
+
+class KLLSketch(object):
+    '''
+    KLL quantile sketch ... values are kept in compactors of growing weight, and a full compactor
+    sorts its values and promotes every other one. Memory is O( k ) whatever the stream length,
+    and ranks are off by about 1.7 / k of the count. Streams too short to be compacted are kept
+    exactly
+    '''
+    def __init__(self, k=constants.KLL_K, seed=constants.KLL_SEED):
+        self.k          = k
+        self.count_     = 0
+        self.random_    = random.Random( seed )
+        self.compactors = [ [] ]
+        self.max_size   = self._getCapacity( 0 )
+
+    def _getCapacity(self, level_):
+        depth_ = len( self.compactors ) - level_ - 1
+        return max( int( math.ceil( self.k * ( 2.0 / 3.0 ) ** depth_ ) ), 2 )
+
+    def _grow(self):
+        self.compactors.append( [] )
+        self.max_size = sum( self._getCapacity( level_ ) for level_ in range( len( self.compactors ) ) )
+
+    def _compress(self):
+        while sum( len( compactor_ ) for compactor_ in self.compactors ) >= self.max_size:
+            for level_, compactor_ in enumerate( self.compactors ):
+                if len( compactor_ ) >= self._getCapacity( level_ ):
+                    if level_ + 1 == len( self.compactors ):
+                        self._grow()
+                    compactor_.sort()
+                    # an odd value out stays at this level
+                    kept_ = [ compactor_.pop() ] if len( compactor_ ) % 2 else []
+                    self.compactors[level_ + 1].extend( compactor_[self.random_.randint( 0, 1 )::2] )
+                    self.compactors[level_] = kept_
+                    break
+
+    def add(self, value_):
+        self.compactors[0].append( value_ )
+        self.count_ += 1
+        if len( self.compactors[0] ) >= self._getCapacity( 0 ):
+            self._compress()
+
+    def update(self, values_):
+        for value_ in values_:
+            self.add( value_ )
+
+    def merge(self, other_):
+        while len( self.compactors ) < len( other_.compactors ):
+            self._grow()
+        for level_, compactor_ in enumerate( other_.compactors ):
+            self.compactors[level_].extend( compactor_ )
+        self.count_ += other_.count_
+        self._compress()
+        return self
+
+    def quantile(self, q_):
+        '''
+        smallest kept value whose weighted rank reaches q_ of the count
+        '''
+        weighted_ = sorted( ( value_, 2 ** level_ ) for level_, compactor_ in enumerate( self.compactors ) for value_ in compactor_ )
+        if not weighted_:
+            return None
+        target_ = q_ * sum( weight_ for value_, weight_ in weighted_ )
+        rank_   = 0
+        for value_, weight_ in weighted_:
+            rank_ += weight_
+            if rank_ >= target_:
+                return value_
+        return weighted_[-1][0]
+
+    def median(self):
+        if len( self.compactors ) == 1:
+            return statistics.median( self.compactors[0] ) if self.compactors[0] else None
+        return self.quantile( 0.5 )
+
+    def count(self):
+        return self.count_
+
+    def __len__(self):
+        return self.count_
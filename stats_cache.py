@@ -0,0 +1,46 @@
+'''
+Persistent commit statistics cache for dataset.stats
+Aggregates are stored per ( repo path, branch ) together with the branch head they were computed
+at, so a repo whose head did not move is not read again and one that moved forward only has its
+new commits read
+'''
+
+import json
+import os
+import threading
+import constants
+
+
+class CommitStatsCache(object):
+    '''
+    JSON store of per-branch commit aggregates ... { head, commits, emails, first_day, last_day },
+    with the registers of a HyperLogLog sketch under 'sketch' instead of the emails when developers
+    are counted approximately. Entries may be read and written from the threads of
+    dataset.stats.getAllCommits
+    '''
+    def __init__(self, cache_file=constants.STATS_CACHE_FILE):
+        self.cache_file = cache_file
+        self.lock_      = threading.Lock()
+        self.hits, self.updates, self.misses = 0, 0, 0
+        self.entries    = {}
+        if os.path.exists( cache_file ):
+            with open( cache_file, encoding=constants.UTF_ENCODING ) as file_:
+                self.entries = json.load( file_ )
+
+    def _getKey(self, repo_path, branch_name):
+        return json.dumps( [ os.path.abspath( repo_path ), branch_name ] )
+
+    def get(self, repo_path, branch_name):
+        with self.lock_:
+            return self.entries.get( self._getKey( repo_path, branch_name ) )
+
+    def put(self, repo_path, branch_name, entry_):
+        with self.lock_:
+            self.entries[self._getKey( repo_path, branch_name )] = entry_
+
+    def save(self):
+        with self.lock_:
+            temp_file = self.cache_file + '.tmp'
+            with open( temp_file, 'w', encoding=constants.UTF_ENCODING ) as file_:
+                json.dump( self.entries, file_, sort_keys=True )
+            os.replace( temp_file, self.cache_file )
@@ -0,0 +1,195 @@
+"""
+Team 50 - PyTest checks for the repository statistics in dataset.stats
+"""
+
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from git import Actor, Repo
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+STATS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataset.stats.py')
+
+
+def load_stats():
+    spec = importlib.util.spec_from_file_location('dataset_stats', STATS_FILE)
+    stats = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(stats)
+    return stats
+
+
+def make_history(repo_path, commits):
+    """commits is a list of ( author email, committer date ) pairs, oldest first"""
+    repo = Repo.init(str(repo_path))
+    for index, (email, date) in enumerate(commits):
+        (repo_path / 'step.py').write_text('x = {}\n'.format(index))
+        repo.index.add(['step.py'])
+        author = Actor(email.split('@')[0], email)
+        repo.index.commit('step {}'.format(index), author=author, committer=author,
+                          author_date=date, commit_date=date)
+    return repo
+
+
+def test_commit_log_single_pass(tmp_path):
+    """Emails, commit count and first and last commit days of a branch come from one git log reader"""
+    stats = load_stats()
+    repo = make_history(tmp_path / 'repo', [('a@x.org', '2019-01-02T10:00:00 +0000'),
+                                            ('b@x.org', '2019-03-04T10:00:00 +0000'),
+                                            ('a@x.org', '2020-05-06T23:30:00 -0500')])
+    branch = repo.active_branch.name
+    emails, commits, days = stats.getCommitLog(str(tmp_path / 'repo'), branch)
+    assert (emails, commits) == ({'a@x.org', 'b@x.org'}, 3)
+    assert days == (stats.np.datetime64('2019-01-02'), stats.np.datetime64('2020-05-06'))
+
+    dev_cnt, com_cnt, all_days = stats.getDevDayCommits(str(tmp_path / 'repo'), branch)
+    assert (dev_cnt, com_cnt) == (2, 3)
+    assert all_days == [datetime(2019, 1, 2, 12, 30), datetime(2020, 11, 20, 0, 15)]
+    assert stats.getDevEmailForCommit(str(tmp_path / 'repo'), repo.head.commit.hexsha) == ['a@x.org']
+
+
+def test_branch_names_are_not_options_or_paths(tmp_path):
+    """A branch named like an option or like a file of the repo is read as a revision"""
+    stats = load_stats()
+    repo = make_history(tmp_path / 'repo', [('a@x.org', '2019-01-02T10:00:00 +0000')])
+    repo.git.branch('step.py')
+    assert stats.getCommitLog(str(tmp_path / 'repo'), 'step.py')[1] == 1
+    with pytest.raises(stats.subprocess.CalledProcessError):
+        stats.getCommitLog(str(tmp_path / 'repo'), '--all')
+
+
+def test_emails_without_at_are_not_developers(tmp_path):
+    """Malformed author emails count as commits but not as developers"""
+    stats = load_stats()
+    repo = make_history(tmp_path / 'repo', [('a@x.org', '2019-01-02T10:00:00 +0000'),
+                                            ('nobody', '2019-03-04T10:00:00 +0000')])
+    emails, commits, _ = stats.getCommitLog(str(tmp_path / 'repo'), repo.active_branch.name)
+    assert (emails, commits) == ({'a@x.org'}, 2)
+    assert stats.getDevEmailForCommit(str(tmp_path / 'repo'), repo.head.commit.hexsha) == []
+
+
+def test_missing_branch_is_skipped(tmp_path):
+    """A branch that does not exist gives no commits instead of an error"""
+    stats = load_stats()
+    make_history(tmp_path / 'repo', [('a@x.org', '2019-01-02T10:00:00 +0000')])
+    dev_cnt, com_cnt, all_days = stats.getDevDayCommits(str(tmp_path / 'repo'), 'no-such-branch')
+    assert (dev_cnt, com_cnt) == (0, 0)
+    assert all_days == [datetime(2020, 11, 20, 0, 15)]
+
+
+def test_missing_repo_devs_stay_out_of_distinct_count(tmp_path):
+    """A repo that is not on disk keeps its placeholder developer count but adds nothing to the sketch"""
+    stats = load_stats()
+    dev_counter = stats.sketches.HyperLogLog(0.01)
+    dev_cnt, com_cnt, _ = stats.getDevDayCommits(str(tmp_path / 'gone'), dev_counter=dev_counter)
+    assert (dev_cnt, com_cnt) == (10, 0)
+    assert dev_counter.count() == 0
+
+
+def test_all_commits_parallel_and_isolated(tmp_path, monkeypatch):
+    """Repos are read in parallel, a failing repo is left out and rows keep the input order"""
+    stats = load_stats()
+    make_history(tmp_path / 'old', [('a@x.org', '2015-01-02T10:00:00 +0000'),
+                                    ('b@x.org', '2016-01-02T10:00:00 +0000')])
+    make_history(tmp_path / 'new', [('c@x.org', '2018-01-02T10:00:00 +0000')])
+    make_history(tmp_path / 'bad', [('d@x.org', '2018-01-02T10:00:00 +0000')])
+    branch = Repo(str(tmp_path / 'old')).active_branch.name
+    monkeypatch.setattr(stats, 'getBranch', lambda path: branch)
+    real_day_commits = stats.getDevDayCommits
+
+    def failing_day_commits(path, branchName='master', **kwargs):
+        if path.endswith('bad'):
+            raise RuntimeError('broken repo')
+        return real_day_commits(path, branchName, **kwargs)
+
+    monkeypatch.setattr(stats, 'getDevDayCommits', failing_day_commits)
+    all_repos = [str(tmp_path / name) for name in ('new', 'bad', 'old')]
+    output_file = str(tmp_path / 'COMMIT.STATS.csv')
+    dev_counter = stats.sketches.ExactCounter()
+    min_day, max_day, commits, devs = stats.getAllCommits(all_repos, workers=3, output_file=output_file,
+                                                          dev_counter=dev_counter)
+    assert (min_day, max_day, commits, devs) == (datetime(2015, 1, 2, 12, 30), datetime(2020, 11, 20, 0, 15), 3, 3)
+    assert dev_counter.values_ == {'a@x.org', 'b@x.org', 'c@x.org'}
+    rows = stats.pd.read_csv(output_file)
+    assert rows['REPO'].tolist() == [all_repos[0], all_repos[2]]
+    assert rows['COMMITS'].tolist() == [1, 2]
+
+
+def test_day_range_keeps_mining_day(tmp_path):
+    """The 2020-11-20 mining day stays in the day range of repos with later commits"""
+    stats = load_stats()
+    repo = make_history(tmp_path / 'repo', [('a@x.org', '2021-02-03T10:00:00 +0000'),
+                                            ('a@x.org', '2022-04-05T10:00:00 +0000')])
+    dev_cnt, com_cnt, all_days = stats.getDevDayCommits(str(tmp_path / 'repo'), repo.active_branch.name)
+    assert (dev_cnt, com_cnt) == (1, 2)
+    assert all_days == [datetime(2020, 11, 20, 0, 15), datetime(2022, 4, 5, 12, 30)]
+
+
+def test_commit_stats_cache_follows_head(tmp_path):
+    """An unchanged head is served from the cache and a moved head only reads the new commits"""
+    stats = load_stats()
+    repo_path = tmp_path / 'repo'
+    repo = make_history(repo_path, [('a@x.org', '2015-01-02T10:00:00 +0000'),
+                                    ('b@x.org', '2016-01-02T10:00:00 +0000')])
+    branch = repo.active_branch.name
+    cache_file = str(tmp_path / 'cache.json')
+
+    def cached_stats():
+        stats_cache = stats.CommitStatsCache(cache_file)
+        result = stats.getDevDayCommits(str(repo_path), branch, stats_cache=stats_cache)
+        stats_cache.save()
+        return result, (stats_cache.hits, stats_cache.updates, stats_cache.misses)
+
+    assert cached_stats() == (stats.getDevDayCommits(str(repo_path), branch), (0, 0, 1))
+    assert cached_stats()[1] == (1, 0, 0)
+
+    (repo_path / 'step.py').write_text('x = 99\n')
+    repo.index.add(['step.py'])
+    author = Actor('c', 'c@x.org')
+    repo.index.commit('step 99', author=author, committer=author,
+                      author_date='2021-06-07T10:00:00 +0000', commit_date='2021-06-07T10:00:00 +0000')
+    assert cached_stats() == (stats.getDevDayCommits(str(repo_path), branch), (0, 1, 0))
+    assert cached_stats()[0] == (3, 3, [datetime(2015, 1, 2, 12, 30), datetime(2021, 6, 7, 12, 30)])
+
+
+def test_sketch_cache_keeps_registers_not_emails(tmp_path):
+    """With a HyperLogLog counter the cache holds the sketch, and serves the same counts"""
+    stats = load_stats()
+    repo_path = tmp_path / 'repo'
+    repo = make_history(repo_path, [('dev{}@x.org'.format(index), '2015-01-02T10:00:00 +0000') for index in range(5)])
+    branch = repo.active_branch.name
+    cache_file = str(tmp_path / 'cache.json')
+
+    def cached_devs():
+        stats_cache = stats.CommitStatsCache(cache_file)
+        dev_counter = stats.sketches.HyperLogLog(0.05)
+        stats.getDevDayCommits(str(repo_path), branch, dev_counter=dev_counter, stats_cache=stats_cache)
+        stats_cache.save()
+        return dev_counter.count(), (stats_cache.hits, stats_cache.updates, stats_cache.misses)
+
+    assert cached_devs() == (5, (0, 0, 1))
+    assert cached_devs() == (5, (1, 0, 0))
+    entry = list(stats.CommitStatsCache(cache_file).entries.values())[0]
+    assert 'emails' not in entry and entry['sketch']['precision'] == stats.sketches.HyperLogLog(0.05).precision
+
+    exact_cache = stats.CommitStatsCache(cache_file)
+    assert stats.getDevDayCommits(str(repo_path), branch, stats_cache=exact_cache)[0] == 5
+    assert exact_cache.misses == 1
+
+
+def test_chunked_file_count_matches(tmp_path):
+    """Streaming a results file gives the file count and size of loading it whole"""
+    stats = load_stats()
+    rows = []
+    for repo_index in range(3):
+        for file_index in range(5):
+            py_file = tmp_path / 'r{}_f{}.py'.format(repo_index, file_index)
+            py_file.write_text('x = 1\n' * (repo_index + file_index + 1))
+            rows += [('repo{}'.format(repo_index), str(py_file), file_index % 2)] * 2
+    result_file = str(tmp_path / 'results.csv')
+    stats.pd.DataFrame(rows, columns=['REPO_FULL_PATH', 'FILE_FULL_PATH', 'TOTAL_EVENT_COUNT']).to_csv(result_file, index=False)
+    file_size, file_count = stats.getAllFileCount(stats.pd.read_csv(result_file))
+    assert stats.getChunkedFileCount(result_file, chunksize=4) == (file_size, file_count, ['repo0', 'repo1', 'repo2'])
@@ -0,0 +1,152 @@
+"""
+Team 50 - PyTest checks for the frequency reports
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import frequency
+
+FIELDS = [
+    'DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT', 'DATA_DOWNLOAD_COUNT',
+    'MODEL_LABEL_COUNT', 'MODEL_OUTPUT_COUNT', 'DATA_PIPELINE_COUNT',
+    'ENVIRONMENT_COUNT', 'STATE_OBSERVE_COUNT', 'TOTAL_EVENT_COUNT'
+]
+
+
+def write_results(tmp_path, rows=400, seed=7):
+    """A results CSV with repeated file rows, repos without events and real files to count"""
+    rng = np.random.default_rng(seed)
+    src_dir = tmp_path / 'src'
+    src_dir.mkdir()
+    py_files = []
+    for index in range(40):
+        py_file = src_dir / 'f{}.py'.format(index)
+        py_file.write_text('x = 1\n' * (index + 1))
+        py_files.append(str(py_file))
+    file_index = rng.integers(0, len(py_files), rows)
+    data = {'REPO_FULL_PATH': ['repo{}'.format(index % 7) for index in file_index],
+            'FILE_FULL_PATH': [py_files[index] for index in file_index]}
+    for field in FIELDS[:-1]:
+        data[field] = rng.integers(0, 3, rows) * (rng.random(rows) < 0.3)
+    results = pd.DataFrame(data)
+    results.loc[results['REPO_FULL_PATH'] == 'repo3', FIELDS[:-1]] = 0
+    results['TOTAL_EVENT_COUNT'] = results[FIELDS[:-1]].sum(axis=1)
+    res_file = str(tmp_path / 'results.csv')
+    results.to_csv(res_file, index=False)
+    return res_file
+
+
+def legacy_proportion(res_file, output_file):
+    """reportProportion as it was written before the groupby engine"""
+    res_df = pd.read_csv(res_file)
+    df_list = []
+    for repo in np.unique(res_df['REPO_FULL_PATH'].tolist()):
+        repo_entity = res_df[res_df['REPO_FULL_PATH'] == repo]
+        all_py_files = np.unique(repo_entity['FILE_FULL_PATH'].tolist())
+        for field in FIELDS:
+            atleast_one_files = np.unique(repo_entity[repo_entity[field] > 0]['FILE_FULL_PATH'].tolist())
+            prop_metric = round(float(len(atleast_one_files)) / float(len(all_py_files)), 5) * 100
+            df_list.append((repo, len(all_py_files), field, len(atleast_one_files), prop_metric))
+    pd.DataFrame(df_list).to_csv(output_file, header=['REPO_NAME', 'TOTAL_FILES', 'CATEGORY', 'ATLEASTONE', 'PROP_VAL'],
+                                 index=False, encoding='utf-8')
+
+
+def read_bytes(path):
+    with open(path, 'rb') as csv_file:
+        return csv_file.read()
+
+
+def test_proportion_csv_unchanged(tmp_path):
+    """The groupby engine writes the same proportion CSV byte for byte"""
+    res_file = write_results(tmp_path)
+    frequency.reportProportion(res_file, str(tmp_path / 'new.csv'))
+    legacy_proportion(res_file, str(tmp_path / 'old.csv'))
+    assert read_bytes(str(tmp_path / 'new.csv')) == read_bytes(str(tmp_path / 'old.csv'))
+
+
+def legacy_density(res_file, output_file):
+    """reportEventDensity as it was written before the grouped aggregation"""
+    res_df = pd.read_csv(res_file)
+    df_list = []
+    for repo in np.unique(res_df['REPO_FULL_PATH'].tolist()):
+        repo_entity = res_df[res_df['REPO_FULL_PATH'] == repo]
+        all_py_size = sum(sum(1 for _ in open(file_, encoding='latin-1'))
+                          for file_ in np.unique(repo_entity['FILE_FULL_PATH'].tolist()))
+        for field in FIELDS:
+            field_res_count = sum(repo_entity[field].tolist())
+            event_density = round(float(field_res_count * 1000) / float(all_py_size), 5)
+            df_list.append((repo, all_py_size, field, field_res_count, event_density))
+    pd.DataFrame(df_list).to_csv(output_file, header=['REPO_NAME', 'TOTAL_LOC', 'CATEGORY', 'TOTAL_EVENT_COUNT', 'EVENT_DENSITY'],
+                                 index=False, encoding='utf-8')
+
+
+def test_density_csv_unchanged(tmp_path):
+    """The grouped aggregation writes the same density CSV byte for byte"""
+    res_file = write_results(tmp_path)
+    frequency.reportEventDensity(res_file, str(tmp_path / 'new.csv'))
+    legacy_density(res_file, str(tmp_path / 'old.csv'))
+    assert read_bytes(str(tmp_path / 'new.csv')) == read_bytes(str(tmp_path / 'old.csv'))
+
+
+def test_density_uses_line_count_column(tmp_path):
+    """A LINE_COUNT column is used instead of reading the files"""
+    results = pd.read_csv(write_results(tmp_path))
+    results['LINE_COUNT'] = 10
+    results['FILE_FULL_PATH'] = results['FILE_FULL_PATH'] + '.missing'
+    res_file = str(tmp_path / 'counted.csv')
+    results.to_csv(res_file, index=False)
+    frequency.reportEventDensity(res_file, str(tmp_path / 'density.csv'))
+    density = pd.read_csv(str(tmp_path / 'density.csv'))
+    files_per_repo = results.groupby('REPO_FULL_PATH')['FILE_FULL_PATH'].nunique()
+    assert density.groupby('REPO_NAME')['TOTAL_LOC'].first().tolist() == (files_per_repo * 10).tolist()
+
+
+def test_chunked_reports_match_in_memory(tmp_path):
+    """Chunk by chunk aggregation writes the same CSVs as loading the whole results file"""
+    res_file = write_results(tmp_path)
+    results = pd.read_csv(res_file).sort_values(['REPO_FULL_PATH', 'FILE_FULL_PATH'], kind='stable')
+    results.to_csv(res_file, index=False)
+    for report_func in (frequency.reportProportion, frequency.reportEventDensity):
+        report_func(res_file, str(tmp_path / 'whole.csv'))
+        report_func(res_file, str(tmp_path / 'chunked.csv'), chunksize=37)
+        assert read_bytes(str(tmp_path / 'chunked.csv')) == read_bytes(str(tmp_path / 'whole.csv'))
+
+
+def test_chunked_reports_reject_interleaved_repos(tmp_path):
+    """Chunked aggregation refuses a results file whose repos come back after other repos"""
+    res_file = write_results(tmp_path)
+    with pytest.raises(ValueError, match='not contiguous'):
+        frequency.reportProportion(res_file, str(tmp_path / 'chunked.csv'), chunksize=37)
+
+
+def test_reports_return_dataframes(tmp_path):
+    """The reports return what they write, and take a results DataFrame as well as a file"""
+    res_file = write_results(tmp_path)
+    results = pd.read_csv(res_file)
+    for report_func in (frequency.reportProportion, frequency.reportEventDensity):
+        written = report_func(res_file, str(tmp_path / 'written.csv'))
+        assert written.equals(pd.read_csv(str(tmp_path / 'written.csv')))
+        assert report_func(results).equals(written)
+
+
+def test_density_of_repo_without_lines(tmp_path):
+    """A repo whose only file is empty gets a density of 0, not inf or nan"""
+    res_file = write_results(tmp_path)
+    results = pd.read_csv(res_file)
+    empty_file = tmp_path / 'src' / '__init__.py'
+    empty_file.write_text('')
+    empty_row = {column: 0 for column in results.columns}
+    empty_row.update({'REPO_FULL_PATH': 'repo_empty', 'FILE_FULL_PATH': str(empty_file)})
+    results = pd.concat([results, pd.DataFrame([empty_row])], ignore_index=True)
+    density = frequency.reportEventDensity(results)
+    empty_density = density[density['REPO_NAME'] == 'repo_empty']
+    assert empty_density['TOTAL_LOC'].tolist() == [0] * len(FIELDS)
+    assert empty_density['EVENT_DENSITY'].tolist() == [0.0] * len(FIELDS)
+    assert np.isfinite(density['EVENT_DENSITY']).all()
@@ -0,0 +1,61 @@
+"""
+Team 50 - PyTest checks for the historical trend mode
+"""
+
+import os
+import sys
+
+from git import Repo
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import constants
+import history
+from test_scanner import commit_all, make_repos, read_rows
+
+
+def test_history_trend_counts_each_commit(tmp_path):
+    """Every commit gets the counts a scan of its checkout gives, and unchanged blobs are analyzed once"""
+    repo_a = make_repos(tmp_path / 'corpus')[0]
+    repo = Repo.init(repo_a)
+    commit_all(repo, 'first')
+    (tmp_path / 'corpus' / 'repo_a' / 'pkg' / 'new.py').write_text('y = np.load(g)\n')
+    commit_all(repo, 'second')
+    os.remove(os.path.join(repo_a, 'pkg', 'load.py'))
+    commit_all(repo, 'third')
+
+    output_file = str(tmp_path / 'trends.csv')
+    branch = repo.active_branch.name
+    stats = history.writeTrends([repo_a], output_file, lambda repo_root: branch, workers=2)
+    assert sum(stats.values()) == 3
+    rows = [dict(zip(constants.TREND_HEADER, row)) for row in read_rows(output_file)[1:]]
+    assert [row['COMMIT_HASH'] for row in rows] == [commit.hexsha for commit in reversed(list(repo.iter_commits()))]
+    assert [(row['FILE_COUNT'], row['DATA_LOAD_COUNT']) for row in rows] == [('2', '2'), ('3', '3'), ('2', '1')]
+
+    history.writeTrends([repo_a], output_file, lambda repo_root: branch, every_n=2, workers=2)
+    assert [row[1] for row in read_rows(output_file)[1:]] == [rows[0]['COMMIT_HASH'], rows[2]['COMMIT_HASH']]
+
+
+def test_unreadable_blob_counts_as_zero(tmp_path, monkeypatch):
+    """A blob missing from the object database counts as zero without stopping the trend"""
+    from git.cmd import Git
+    repo_a = make_repos(tmp_path / 'corpus')[0]
+    repo = Repo.init(repo_a)
+    commit_all(repo, 'first')
+    missing_sha = repo.head.commit.tree['pkg/load.py'].hexsha
+    (tmp_path / 'corpus' / 'repo_a' / 'pkg' / 'new.py').write_text('y = np.load(g)\n')
+    commit_all(repo, 'second')
+    real_object_data = Git.get_object_data
+
+    def missing_object_data(self, ref):
+        if ref == missing_sha:
+            raise ValueError('{} missing'.format(ref))
+        return real_object_data(self, ref)
+
+    monkeypatch.setattr(Git, 'get_object_data', missing_object_data)
+    output_file = str(tmp_path / 'trends.csv')
+    branch = repo.active_branch.name
+    stats = history.writeTrends([repo_a], output_file, lambda repo_root: branch, workers=2)
+    assert stats[history.scanner.SCAN_ERROR] == 1
+    rows = [dict(zip(constants.TREND_HEADER, row)) for row in read_rows(output_file)[1:]]
+    assert [(row['FILE_COUNT'], row['DATA_LOAD_COUNT']) for row in rows] == [('2', '0'), ('3', '1')]
@@ -0,0 +1,46 @@
+"""
+Team 50 - PyTest checks for the shared line counting service
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import line_counter
+
+
+def write_files(tmp_path):
+    sources = {'a.py': 'x = 1\ny = 2\n', 'b.py': 'z = 3\r\nw = 4', 'c.py': '', 'd.py': 'caf\xe9 = 1\n\n'}
+    py_files = []
+    for name, src in sources.items():
+        py_file = tmp_path / name
+        py_file.write_bytes(src.encode('latin-1'))
+        py_files.append(str(py_file))
+    return py_files
+
+
+def test_counts_match_text_mode(tmp_path):
+    """Counts agree with iterating each file in text mode, the way SLOC was measured"""
+    py_files = write_files(tmp_path)
+    counts = line_counter.getLineCounts(py_files, workers=2, cache_=line_counter.LineCountCache())
+    assert counts == {py_file: sum(1 for _ in open(py_file, encoding='latin-1')) for py_file in py_files}
+    assert line_counter.getTotalLines(py_files, cache_=line_counter.LineCountCache()) == 6
+
+
+def test_unchanged_files_come_from_cache(tmp_path, monkeypatch):
+    """Only files whose size or mtime changed are counted again, also across processes"""
+    py_files = write_files(tmp_path)
+    with line_counter.LineCountCache(str(tmp_path / 'cache')) as cache:
+        line_counter.getLineCounts(py_files, cache_=cache)
+
+    counted = []
+    real_count = line_counter.countFileLines
+    monkeypatch.setattr(line_counter, 'countFileLines', lambda py_file: counted.append(py_file) or real_count(py_file))
+    with open(py_files[0], 'a') as py_file:
+        py_file.write('v = 5\n')
+    with line_counter.LineCountCache(str(tmp_path / 'cache')) as cache:
+        counts = line_counter.getLineCounts(py_files, cache_=cache)
+        assert (cache.hits, cache.misses) == (3, 1)
+    assert counted == [py_files[0]]
+    assert counts[py_files[0]] == 3
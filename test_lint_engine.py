@@ -0,0 +1,111 @@
+"""
+Team 50 - PyTest checks for the lint_engine detectors
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import constants
+import event_sink
+import lint_engine
+import py_parser
+
+SAMPLE_SRC = '''
+import torch
+x = torch.load(f)
+df = pd.read_csv("a.csv", sep=",")
+model.load_state_dict(sd)
+wget.download(u)
+env.step(act)
+parser = argparse.ArgumentParser(description='d')
+'''
+
+
+def write_sample(tmp_path, src=SAMPLE_SRC):
+    py_file = tmp_path / 'sample.py'
+    py_file.write_text(src)
+    return str(py_file)
+
+
+def test_analyze_file_counts(tmp_path):
+    """analyze_file returns every CSV count column in one call"""
+    counts = lint_engine.analyze_file(write_sample(tmp_path))
+    assert list(counts) == constants.CSV_HEADER[2:]
+    assert counts['DATA_LOAD_COUNT'] == 2
+    assert counts['MODEL_LOAD_COUNT'] == 1
+    assert counts['DATA_DOWNLOAD_COUNT'] == 1
+    assert counts['DATA_PIPELINE_COUNT'] == 1
+    assert counts['ENVIRONMENT_COUNT'] == 1
+    assert counts['STATE_OBSERVE_COUNT'] == 1
+    assert counts['TOTAL_EVENT_COUNT'] == 7
+
+
+def test_file_parsed_once(tmp_path, monkeypatch):
+    """All detectors share one parse of the file"""
+    parse_calls = []
+    real_parse = py_parser.getSourceParseObject
+
+    def counting_parse(py_source):
+        parse_calls.append(py_source)
+        return real_parse(py_source)
+
+    monkeypatch.setattr(py_parser, 'getSourceParseObject', counting_parse)
+    py_file = write_sample(tmp_path)
+    lint_engine.analyze_file(py_file)
+    lint_engine.getDataLoadCount(py_file)
+    lint_engine.getExcepts(py_file)
+    assert parse_calls == [SAMPLE_SRC.encode()]
+
+
+def test_prefilter_skips_parsing(tmp_path, monkeypatch):
+    """Files holding no complete rule key get zero counts without being parsed"""
+    monkeypatch.setattr(py_parser, 'getSourceParseObject', None)
+    lint_engine.resetPrefilterStats()
+    # 'load' alone is a rule key of getDataLoadCountc, so both names are kept apart from it
+    py_file = write_sample(tmp_path, '# torch and ldr\nx = torch.lod(f)\n')
+    counts = lint_engine.analyze_file(py_file)
+    assert set(counts.values()) == {0}
+    assert lint_engine.getDataLoadCount(py_file) == 0
+    assert lint_engine.getPrefilterStats() == {
+        'FILES_SCANNED': 1, 'FILES_MATCHED': 0, 'FILES_SKIPPED': 1, 'SKIP_RATE': 1.0}
+
+
+def test_prefilter_keeps_candidates():
+    """A file holding every name of one rule key always goes on to the parser"""
+    assert lint_engine.hasRuleKeywords(b'x = torch.load(f)\n')
+    assert not lint_engine.hasRuleKeywords(b'x = torch.save(f)\n')
+    assert lint_engine.hasRuleKeywords('x = \uff54orch.\uff4coad(f)\n'.encode('utf-8'))
+
+
+def test_modified_file_is_reparsed(tmp_path):
+    """A changed file is not served from the parse cache"""
+    py_file = write_sample(tmp_path)
+    assert lint_engine.getDataLoadCount(py_file) == 2
+    write_sample(tmp_path, SAMPLE_SRC + 'y = pickle.load(fp)\n')
+    assert lint_engine.getDataLoadCount(py_file) == 3
+
+
+def test_shared_rule_key_counts_for_every_detector(tmp_path):
+    """One record hitting a shared rule key is counted by each detector on it"""
+    py_file = write_sample(tmp_path, 'import keras\nr = model.evaluate(x, batch_size=8)\n')
+    assert ('getModelOutputCountb', lint_engine._withArgs) in lint_engine.ASSIGNMENT_RULES['evaluate']
+    assert lint_engine.getModelOutputCountb(py_file) == 1
+    assert lint_engine.getDNNDecisionCountb(py_file) == 1
+    assert lint_engine.classifyRecords(py_file)['getModelOutputCountb'] == [(2, '', 'evaluate')]
+
+
+def test_detector_events_go_to_sink(tmp_path, capsys):
+    """Direct detector calls print their events, analyze_file hands them to its sink"""
+    py_file = write_sample(tmp_path)
+    assert lint_engine.getDataLoadCount(py_file) == 2
+    assert capsys.readouterr().out.splitlines() == [
+        'Detected DATA_LOAD_EVENT, at line 3, in {}'.format(py_file),
+        'Detected DATA_LOAD_EVENT, at line 4, in {}'.format(py_file)]
+
+    sink = event_sink.ListSink()
+    lint_engine.analyze_file(py_file, sink)
+    assert capsys.readouterr().out == ''
+    assert sink.events[0] == event_sink.Event('DATA_LOAD_EVENT', py_file, 3, 'torch', 'load')
+    assert len(sink.events) == 7
@@ -0,0 +1,106 @@
+"""
+Team 50 - PyTest checks for the py_parser extractors
+"""
+
+import ast
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import py_parser
+
+SAMPLE_SRC = '''
+import logging
+import torch.nn
+from os import path
+x = torch.load(f, map_location=dev)
+labels, y = np.array(lst)
+bs = data.HP_batch_size
+batch_label = [sent for sent in input_batch_list]
+get_configs_from_pipeline_file(f, k=1)
+try:
+    foo()
+except ValueError as e:
+    logging.error(e)
+'''
+
+
+def test_extractors_share_one_walk():
+    """Every extractor is served from the same TreeRecords of a tree"""
+    tree = ast.parse(SAMPLE_SRC)
+    records = py_parser.getTreeRecords(tree)
+    assert py_parser.getTreeRecords(tree) is records
+    assert py_parser.getPythonAtrributeFuncs(tree) == [record.astuple() for record in records.attrib_calls]
+
+
+def test_extractor_records():
+    """The single walk yields the same records the extractors always returned"""
+    tree = ast.parse(SAMPLE_SRC)
+    assert ('torch', 'load', 5, [('f', '_index_1'), ('map_location', '_index_2')]) in py_parser.getPythonAtrributeFuncs(tree)
+    assert py_parser.getFunctionAssignments(tree) == [('x', 'load', 5, [('map_location', 'FUNC_CALL_ARG:2')]), ('', 'array', 6, [])]
+    assert py_parser.getFunctionDefinitions(tree) == [('get_configs_from_pipeline_file', 9, [('f', '_index_1'), ('k', '_index_2')])]
+    assert py_parser.getFunctionAssignmentsWithMultipleLHS(tree)[-1] == (['labels', 'y'], 'array', 6, [('lst', 'FUNC_CALL_ARG:1')])
+    assert py_parser.getModelFeature(tree) == [('bs', 'data', 'HP_batch_size', 7)]
+    lhs, var_s, var_d, rhs_var_iter, line_ = py_parser.getTupAssiDetails(tree)[0]
+    assert (lhs, var_d, rhs_var_iter, line_) == ('batch_label', 'sent', 'input_batch_list', 8)
+    assert py_parser.getImport(tree) == ['logging', 'torch', 'os']
+    assert len(py_parser.getPythonExcepts(tree)) == 1
+
+
+def test_empty_tree():
+    """An empty module yields no records at all"""
+    tree = ast.parse('')
+    assert py_parser.getPythonAtrributeFuncs(tree) == []
+    assert py_parser.getImport(tree) == []
+    assert py_parser.getPythonExcepts(tree) == []
+
+
+def test_call_records_are_compact():
+    """Call records keep integer argument positions and build the labelled tuples on demand"""
+    tree = ast.parse('x = torch.load(f, 3, g, map_location=dev)\n')
+    record = py_parser.getTreeRecords(tree).attrib_calls[0]
+    assert not hasattr(record, '__dict__')
+    assert record.arg_names == ('f', 'g', 'map_location')
+    assert record.arg_positions == (1, 3, 4)
+    assert record.astuple() == ('torch', 'load', 1, [('f', '_index_1'), ('g', '_index_3'), ('map_location', '_index_4')])
+
+
+def test_logging_index():
+    """checkLoggingPerData is answered from the logging index of the tree"""
+    tree = ast.parse(SAMPLE_SRC + 'logging.info(data, "msg", level=2)\n')
+    records = py_parser.getTreeRecords(tree)
+    assert records.logging_imported
+    assert [record.func_name for record in records.logging_calls] == ['error', 'info']
+    assert {'e', 'data', '_index_1', '_index_3'} <= records.logging_arg_keys
+    assert py_parser.checkLoggingPerData(tree, 'data')
+    assert py_parser.checkLoggingPerData(tree, '_index_3')
+    assert not py_parser.checkLoggingPerData(tree, 'pytorch')
+    assert not py_parser.checkLoggingPerData(tree, ['data'])
+    assert not py_parser.checkLoggingPerData(ast.parse('import torch\nlogging.info(data)\n'), 'data')
+
+
+def test_source_loading(tmp_path, monkeypatch):
+    """Files are parsed from bytes with their coding cookie, and null bytes give an empty tree"""
+    latin_file = tmp_path / 'latin.py'
+    latin_file.write_bytes(b'# -*- coding: latin-1 -*-\nname = "caf\xe9"\n')
+    assert py_parser.getPythonParseObject(str(latin_file)).body[0].value.value == 'caf\xe9'
+
+    nul_file = tmp_path / 'nul.py'
+    nul_file.write_bytes(b'x = 1\x00\n')
+    assert py_parser.getPythonParseObject(str(nul_file)).body == []
+    assert not py_parser.checkIfParsablePython(str(nul_file))
+
+    monkeypatch.setattr(py_parser.constants, 'MMAP_MIN_SIZE', 1)
+    analysis = py_parser.FileAnalysis(str(latin_file))
+    assert not isinstance(analysis.source, bytes)
+    assert analysis.line_count == 2
+    assert py_parser.getImport(analysis.tree) == []
+
+
+def test_count_lines(tmp_path):
+    """Lines are counted the way dataset.stats.getFileLength counts them"""
+    py_file = tmp_path / 'lines.py'
+    for source in [b'', b'a', b'a\n', b'a\r\nb', b'a\rb\r', b'\n\n\r\n\xe9']:
+        py_file.write_bytes(source)
+        assert py_parser.countLines(source) == sum(1 for line in open(py_file, encoding='latin-1'))
@@ -0,0 +1,90 @@
+"""
+Team 50 - PyTest checks for the report summaries
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import report
+
+
+def write_report_file(path, metric, values):
+    categories = ['DATA_LOAD_COUNT', 'MODEL_LOAD_COUNT'] * (len(values) // 2)
+    pd.DataFrame({'REPO_NAME': ['repo{}'.format(index // 2) for index in range(len(values))],
+                  'CATEGORY': categories, metric: values}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_batch_summary_matches_per_file_reports(tmp_path, capsys):
+    """Mean, median and percentiles per (dataset, category) agree with the per-file helpers"""
+    prop_values = [10.0, 0.0, 30.0, 50.0, 20.0, 100.0, 40.0, 0.0]
+    density_values = [1.5, 0.25, 3.0, 0.5]
+    res_files = [write_report_file(tmp_path / 'PROPORTION_GITHUB.csv', 'PROP_VAL', prop_values),
+                 write_report_file(tmp_path / 'DENSITY_GITHUB.csv', 'EVENT_DENSITY', density_values)]
+    summary = report.reportBatch(res_files, percentiles=(25, 90), output_file=str(tmp_path / 'summary.csv'))
+
+    assert summary[['DATASET', 'METRIC', 'CATEGORY']].values.tolist() == [
+        ['PROPORTION_GITHUB', 'PROP_VAL', 'DATA_LOAD_COUNT'], ['PROPORTION_GITHUB', 'PROP_VAL', 'MODEL_LOAD_COUNT'],
+        ['DENSITY_GITHUB', 'EVENT_DENSITY', 'DATA_LOAD_COUNT'], ['DENSITY_GITHUB', 'EVENT_DENSITY', 'MODEL_LOAD_COUNT']]
+    load_values = prop_values[0::2]
+    load_row = summary.iloc[0]
+    assert load_row['COUNT'] == 4
+    assert load_row['AVERAGE'] == pytest.approx(report.Average(load_values))
+    assert load_row['MEDIAN'] == report.Median(load_values)
+    assert load_row['P90'] == pytest.approx(np.percentile(load_values, 90))
+    assert summary.iloc[3]['MEDIAN'] == report.Median(density_values[1::2])
+    assert pd.read_csv(str(tmp_path / 'summary.csv')).shape == (4, 8)
+
+    console = capsys.readouterr().out
+    assert 'CATEGORY:DATA_LOAD_COUNT, MEDIAN_PROP_VAL:25.0' in console
+    assert 'CATEGORY:TOTAL_EVENT_COUNT, AVG_PROP_VAL:0.0' in console
+
+
+def test_batch_labels_files_with_same_name_apart(tmp_path, monkeypatch):
+    """Report files of the same name in different folders are summarized as separate datasets"""
+    monkeypatch.chdir(tmp_path)
+    for folder in ('github', 'gitlab'):
+        os.mkdir(folder)
+    res_files = [write_report_file(os.path.join('github', 'PROPORTION.csv'), 'PROP_VAL', [10.0, 20.0]),
+                 write_report_file(os.path.join('gitlab', 'PROPORTION.csv'), 'PROP_VAL', [30.0, 40.0])]
+    summary = report.reportBatch(res_files)
+    assert summary['DATASET'].unique().tolist() == res_files
+    assert summary['AVERAGE'].tolist() == [10.0, 20.0, 30.0, 40.0]
+    with pytest.raises(ValueError, match='more than once'):
+        report.reportBatch([res_files[0], res_files[0]])
+
+
+def test_chunked_report_matches_whole_file(tmp_path, capsys):
+    """Streaming a report file chunk by chunk prints the same averages and medians"""
+    values = [float(value) for value in range(60)]
+    res_file = write_report_file(tmp_path / 'PROPORTION_GITLAB.csv', 'PROP_VAL', values)
+    report.reportProp(res_file)
+    whole_lines = [line for line in capsys.readouterr().out.splitlines() if 'CATEGORY:' in line]
+    report.reportProp(res_file, chunksize=7)
+    chunked_lines = [line for line in capsys.readouterr().out.splitlines() if 'CATEGORY:' in line]
+    assert chunked_lines == whole_lines
+
+
+def test_pipeline_matches_file_chain(tmp_path):
+    """The in-memory pipeline gives the summary of the CSV chain and persists only the asked stages"""
+    from test_frequency import write_results
+    import frequency
+    res_file = write_results(tmp_path)
+    prop_file, density_file = str(tmp_path / 'PROPORTION_results.csv'), str(tmp_path / 'DENSITY_results.csv')
+    frequency.reportProportion(res_file, prop_file)
+    frequency.reportEventDensity(res_file, density_file)
+    chained = report.reportBatch([prop_file, density_file])
+
+    summary_file = str(tmp_path / 'summary.csv')
+    proportion_df, density_df, summary = report.run_pipeline(res_file, summary_file=summary_file)
+    pd.testing.assert_frame_equal(summary, chained)
+    pd.testing.assert_frame_equal(pd.read_csv(summary_file), summary)
+    assert report.reportProp(proportion_df) == report.reportProp(prop_file)
+    assert report.reportDensity(density_df) == report.reportDensity(density_file)
+    assert sorted(os.listdir(str(tmp_path))) == ['DENSITY_results.csv', 'PROPORTION_results.csv', 'results.csv', 'src', 'summary.csv']
@@ -0,0 +1,98 @@
+"""
+Team 50 - PyTest checks for the persistent result cache
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import lint_engine
+import py_parser
+import result_cache
+
+SAMPLE_SRC = '''
+import logging
+x = torch.load(f)
+try:
+    foo()
+except ValueError as e:
+    logging.error(e)
+'''
+
+
+def write_sample(tmp_path, src=SAMPLE_SRC):
+    py_file = tmp_path / 'sample.py'
+    py_file.write_text(src)
+    return str(py_file)
+
+
+def test_rerun_is_served_from_cache(tmp_path, monkeypatch):
+    """A second run over an unchanged file does not parse it"""
+    py_file = write_sample(tmp_path)
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        first = cache.analyzeFile(py_file)
+    assert first['DATA_LOAD_COUNT'] == 1
+    assert first['EXCEPT_LOGGING_IS_ON_FLAG'] is True
+
+    py_parser._analysis_cache.clear()
+    monkeypatch.setattr(py_parser, 'getSourceParseObject', None)
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        assert cache.analyzeFile(py_file) == first
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_modified_file_is_analyzed_again(tmp_path):
+    """A file whose content changed misses the cache"""
+    py_file = write_sample(tmp_path)
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        cache.analyzeFile(py_file)
+        write_sample(tmp_path, SAMPLE_SRC + 'y = pickle.load(fp)\n')
+        assert cache.analyzeFile(py_file)['DATA_LOAD_COUNT'] == 2
+        assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_rule_change_invalidates_cache(tmp_path, monkeypatch):
+    """Results stored under other rules are dropped"""
+    py_file = write_sample(tmp_path)
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        cache.analyzeFile(py_file)
+    monkeypatch.setitem(lint_engine.ATTRIB_CALL_RULES, ('torch', 'save'), (('getDataLoadCount', lint_engine._always),))
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        cache.analyzeFile(py_file)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_extractor_change_invalidates_cache(tmp_path, monkeypatch):
+    """Results stored before the record extraction changed are dropped"""
+    py_file = write_sample(tmp_path)
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        cache.analyzeFile(py_file)
+    monkeypatch.setattr(py_parser, 'EXTRACTOR_VERSION', py_parser.EXTRACTOR_VERSION + 1)
+    with result_cache.ResultCache(str(tmp_path / 'cache')) as cache:
+        cache.analyzeFile(py_file)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_matcher_and_keyword_changes_change_rules_version(monkeypatch):
+    """Editing a matcher body, the prefilter or a keyword the matchers compare against gives a new rules version"""
+    rules_version = lint_engine.getRulesVersion()
+    monkeypatch.setattr(lint_engine.constants, 'LABEL_KW', 'target')
+    assert lint_engine.getRulesVersion() != rules_version
+    monkeypatch.undo()
+
+    def _withFewArgs(record_):
+        return 1 if len(record_.arg_names) < 4 else 0
+
+    for key, rules in list(lint_engine.ATTRIB_CALL_RULES.items()):
+        if any(matcher is lint_engine._withFewArgs for _, matcher in rules):
+            monkeypatch.setitem(lint_engine.ATTRIB_CALL_RULES, key, tuple((name, _withFewArgs) for name, _ in rules))
+    assert lint_engine.getRulesVersion() != rules_version
+    monkeypatch.undo()
+
+    def hasRuleKeywords(py_source):
+        return True
+
+    monkeypatch.setattr(lint_engine, 'RULE_CODE', tuple(hasRuleKeywords if code is lint_engine.hasRuleKeywords else code
+                                                        for code in lint_engine.RULE_CODE))
+    assert lint_engine.getRulesVersion() != rules_version
@@ -0,0 +1,80 @@
+"""
+Team 50 - PyTest checks for the results store
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import constants
+import frequency
+import results_store
+from test_frequency import write_results, read_bytes
+
+
+def test_csv_projection_and_categories(tmp_path):
+    """CSV results read back with only the asked columns and sorted categorical paths"""
+    res_file = write_results(tmp_path)
+    res_df = results_store.readResults(res_file, ['REPO_FULL_PATH', 'TOTAL_EVENT_COUNT'])
+    assert list(res_df.columns) == ['REPO_FULL_PATH', 'TOTAL_EVENT_COUNT']
+    assert isinstance(res_df['REPO_FULL_PATH'].dtype, pd.CategoricalDtype)
+    assert list(res_df['REPO_FULL_PATH'].cat.categories) == sorted(set(res_df['REPO_FULL_PATH']))
+    assert res_df['REPO_FULL_PATH'].tolist() == pd.read_csv(res_file)['REPO_FULL_PATH'].tolist()
+
+
+def test_csv_writer_round_trip(tmp_path):
+    res_file = str(tmp_path / 'results.csv')
+    rows = [['r', 'r/a.py'] + [1] * (len(constants.CSV_HEADER) - 2),
+            ['r', 'r/b.py'] + [0] * (len(constants.CSV_HEADER) - 2)]
+    with results_store.getResultsWriter(res_file) as writer:
+        for row in rows:
+            writer.writerow(row)
+    assert results_store.readResultsHeader(res_file) == constants.CSV_HEADER
+    assert list(results_store.iterResultRows(res_file)) == [[str(value) for value in row] for row in rows]
+
+
+def test_columnar_needs_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(results_store, '_getPyArrow', lambda: None)
+    with pytest.raises(ImportError, match='.csv'):
+        results_store.getResultsWriter(str(tmp_path / 'results.parquet'))
+
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.feather'])
+def test_columnar_matches_csv(tmp_path, suffix):
+    """Columnar results give the same reports as the CSV and export back to it"""
+    pytest.importorskip('pyarrow')
+    res_file = write_results(tmp_path)
+    columnar_file = str(tmp_path / ('results' + suffix))
+    with results_store.ArrowResultsWriter(columnar_file, constants.CSV_HEADER, batch_size=64) as writer:
+        for row in results_store.iterResultRows(res_file):
+            writer.writerow(row)
+    columnar_df = results_store.readResults(columnar_file)
+    assert str(columnar_df['TOTAL_EVENT_COUNT'].dtype) == 'int32'
+    assert isinstance(columnar_df['FILE_FULL_PATH'].dtype, pd.CategoricalDtype)
+    frequency.reportProportion(res_file, str(tmp_path / 'csv.csv'))
+    frequency.reportProportion(columnar_file, str(tmp_path / 'columnar.csv'))
+    assert read_bytes(str(tmp_path / 'csv.csv')) == read_bytes(str(tmp_path / 'columnar.csv'))
+    results_store.exportCSV(columnar_file, str(tmp_path / 'export.csv'))
+    assert pd.read_csv(str(tmp_path / 'export.csv')).equals(pd.read_csv(res_file))
+
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.feather'])
+def test_columnar_batches_stay_small(tmp_path, suffix):
+    """Many small batches take about the room of one batch, file paths are kept as plain strings"""
+    pytest.importorskip('pyarrow')
+    rows = [['r{}'.format(index // 50), 'r{}/f{}.py'.format(index // 50, index)] + [index % 3] * (len(constants.CSV_HEADER) - 2)
+            for index in range(20000)]
+    sizes = []
+    for batch_size in (2000, len(rows)):
+        columnar_file = str(tmp_path / '{}{}'.format(batch_size, suffix))
+        with results_store.ArrowResultsWriter(columnar_file, constants.CSV_HEADER, batch_size=batch_size) as writer:
+            for row in rows:
+                writer.writerow(row)
+        sizes.append(os.path.getsize(columnar_file))
+        assert list(results_store.iterResultRows(columnar_file)) == rows
+    assert sizes[0] < 2 * sizes[1]
+    assert writer.schema_.field('FILE_FULL_PATH').type == 'string'
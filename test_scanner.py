@@ -0,0 +1,341 @@
+"""
+Team 50 - PyTest checks for the corpus scanner
+"""
+
+import csv
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+import pytest
+from git import Repo
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import constants
+import event_sink
+import lint_engine
+import scanner
+
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason='workers must inherit the monkeypatched detectors')
+
+
+def make_repos(tmp_path):
+    repo_a = tmp_path / 'repo_a'
+    (repo_a / 'pkg').mkdir(parents=True)
+    (repo_a / 'pkg' / 'load.py').write_text('x = torch.load(f)\ny = pickle.load(g)\n')
+    (repo_a / 'setup.py').write_text('print(1)\n')
+    (repo_a / 'notes.txt').write_text('torch.load\n')
+    repo_b = tmp_path / 'repo_b'
+    repo_b.mkdir()
+    (repo_b / 'env.py').write_text('env.step(act)\n')
+    return [str(repo_a), str(repo_b)]
+
+
+def read_rows(output_file):
+    with open(output_file, newline='') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def test_scan_writes_results_csv(tmp_path):
+    """Every python file gets one row, in walk order, with the CSV_HEADER columns"""
+    output_file = str(tmp_path / 'out.csv')
+    stats = scanner.scanRepos(make_repos(tmp_path), output_file, workers=2)
+    rows = read_rows(output_file)
+    assert rows[0] == constants.CSV_HEADER
+    assert [os.path.basename(row[1]) for row in rows[1:]] == ['setup.py', 'load.py', 'env.py']
+    load_row = dict(zip(rows[0], rows[2]))
+    assert load_row['DATA_LOAD_COUNT'] == '2'
+    assert load_row['TOTAL_EVENT_COUNT'] == '2'
+    assert dict(zip(rows[0], rows[3]))['ENVIRONMENT_COUNT'] == '1'
+    assert stats == {scanner.SCAN_MATCHED: 2, scanner.SCAN_SKIPPED: 1}
+
+
+def test_scan_reuses_result_cache(tmp_path):
+    """A rescan with a cache dir serves unchanged files from the cache"""
+    repo_roots = make_repos(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    scanner.scanRepos(repo_roots, str(tmp_path / 'first.csv'), workers=2, cache_dir=cache_dir)
+    stats = scanner.scanRepos(repo_roots, str(tmp_path / 'second.csv'), workers=2, cache_dir=cache_dir)
+    assert stats == {scanner.SCAN_CACHED: 3}
+    assert read_rows(str(tmp_path / 'first.csv')) == read_rows(str(tmp_path / 'second.csv'))
+
+
+def test_scan_events_written_in_file_order(tmp_path):
+    """Worker events reach the parent's sink as data, file by file"""
+    events_file = str(tmp_path / 'events.csv')
+    with event_sink.CSVSink(events_file, batch_size=2) as sink:
+        scanner.scanRepos(make_repos(tmp_path), str(tmp_path / 'out.csv'), workers=2, sink_=sink)
+    rows = read_rows(events_file)
+    assert rows[0] == constants.EVENT_HEADER
+    assert [(row[0], os.path.basename(row[1]), row[2], row[4]) for row in rows[1:]] == [
+        ('DATA_LOAD_EVENT', 'load.py', '1', 'load'),
+        ('DATA_LOAD_EVENT', 'load.py', '2', 'load'),
+        ('ENV_REINFORCEMENT_LEARNING_EVENT', 'env.py', '1', 'step'),
+        ('ENV_REINFORCEMENT_LEARNING_EVENT', 'env.py', '1', 'step')]
+
+
+def test_slow_file_times_out(tmp_path, monkeypatch):
+    """A file running past its timeout is abandoned"""
+    def slow_analyze(py_file, sink_=None):
+        time.sleep(5)
+
+    monkeypatch.setattr(lint_engine, 'analyze_file', slow_analyze)
+    py_file = tmp_path / 'slow.py'
+    py_file.write_text('x = torch.load(f)\n')
+    assert scanner.scanFile((str(tmp_path), str(py_file), 0.1, None, False, None))[0] == scanner.SCAN_TIMEOUT
+
+
+@needs_fork
+def test_crashing_file_is_isolated(tmp_path, monkeypatch):
+    """A file that kills its worker is reported and the other files are still scanned"""
+    real_analyze = lint_engine.analyze_file
+
+    def crashing_analyze(analysis, sink_=None):
+        if analysis.path.endswith('load.py'):
+            os._exit(1)
+        return real_analyze(analysis, sink_)
+
+    monkeypatch.setattr(lint_engine, 'analyze_file', crashing_analyze)
+    output_file = str(tmp_path / 'out.csv')
+    stats = scanner.scanRepos(make_repos(tmp_path), output_file, workers=2)
+    assert stats[scanner.SCAN_CRASHED] == 1
+    assert [os.path.basename(row[1]) for row in read_rows(output_file)[1:]] == ['setup.py', 'env.py']
+
+
+def write_files(tmp_path, count):
+    jobs = []
+    for index in range(count):
+        py_file = tmp_path / 'f{}.py'.format(index)
+        py_file.write_text('x = torch.load(f)\n')
+        jobs.append((str(tmp_path), str(py_file), 0.5, None, False, None))
+    return jobs
+
+
+@needs_fork
+def test_crash_while_consumer_is_stalled(tmp_path, monkeypatch):
+    """A worker dying while the consumer is busy breaks the refill, and only its file is lost"""
+    real_analyze = lint_engine.analyze_file
+
+    def crashing_analyze(analysis, sink_=None):
+        if analysis.path.endswith('f2.py'):
+            os._exit(1)
+        return real_analyze(analysis, sink_)
+
+    monkeypatch.setattr(lint_engine, 'analyze_file', crashing_analyze)
+    jobs = write_files(tmp_path, 10)
+    results = []
+    for job, result in scanner.iterScanResults(jobs, workers=1):
+        if not results:
+            # the pool breaks on f2.py while the parent is still here, before the next submit
+            time.sleep(1)
+        results.append((os.path.basename(job[1]), result[0]))
+    assert [name for name, _ in results] == ['f{}.py'.format(index) for index in range(10)]
+    assert [name for name, status in results if status == scanner.SCAN_CRASHED] == ['f2.py']
+    assert sum(status == scanner.SCAN_MATCHED for _, status in results) == 9
+
+
+@needs_fork
+def test_stuck_file_times_out_in_parent(tmp_path, monkeypatch):
+    """A file its worker alarm cannot stop is abandoned by the parent and the pool rebuilt"""
+    real_analyze = lint_engine.analyze_file
+
+    def stuck_analyze(analysis, sink_=None):
+        if analysis.path.endswith('f1.py'):
+            # as a long C call would, the stuck file never sees its alarm
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            time.sleep(60)
+        return real_analyze(analysis, sink_)
+
+    monkeypatch.setattr(lint_engine, 'analyze_file', stuck_analyze)
+    monkeypatch.setattr(constants, 'SCAN_TIMEOUT_GRACE', 0.5)
+    started = time.time()
+    results = [(os.path.basename(job[1]), result[0]) for job, result in scanner.iterScanResults(write_files(tmp_path, 4), workers=2)]
+    assert time.time() - started < 10
+    assert results == [('f0.py', scanner.SCAN_MATCHED), ('f1.py', scanner.SCAN_TIMEOUT),
+                       ('f2.py', scanner.SCAN_MATCHED), ('f3.py', scanner.SCAN_MATCHED)]
+
+
+@needs_fork
+def test_stuck_file_does_not_serialize_the_window(tmp_path, monkeypatch):
+    """After a timeout the unfinished jobs in flight run in parallel again, not one at a time"""
+    real_analyze = lint_engine.analyze_file
+
+    def slow_analyze(analysis, sink_=None):
+        if analysis.path.endswith('f0.py'):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            time.sleep(60)
+        time.sleep(0.5)
+        return real_analyze(analysis, sink_)
+
+    monkeypatch.setattr(lint_engine, 'analyze_file', slow_analyze)
+    monkeypatch.setattr(constants, 'SCAN_TIMEOUT_GRACE', 0.2)
+    jobs = [job[:2] + (1.0,) + job[3:] for job in write_files(tmp_path, 16)]
+    started = time.time()
+    results = [(os.path.basename(job[1]), result[0]) for job, result in scanner.iterScanResults(jobs, workers=4)]
+    assert time.time() - started < 4.5
+    assert results == [('f0.py', scanner.SCAN_TIMEOUT)] + [('f{}.py'.format(index), scanner.SCAN_MATCHED) for index in range(1, 16)]
+
+
+@needs_fork
+def test_abandoned_scan_does_not_wait_for_stuck_worker(tmp_path, monkeypatch):
+    """Closing the results early kills a worker stuck where its alarm cannot reach"""
+    real_analyze = lint_engine.analyze_file
+
+    def stuck_analyze(analysis, sink_=None):
+        if analysis.path.endswith('f1.py'):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            time.sleep(60)
+        return real_analyze(analysis, sink_)
+
+    monkeypatch.setattr(lint_engine, 'analyze_file', stuck_analyze)
+    started = time.time()
+    results = scanner.iterScanResults(write_files(tmp_path, 4), workers=2)
+    assert next(results)[1][0] == scanner.SCAN_MATCHED
+    time.sleep(0.5)
+    results.close()
+    assert time.time() - started < 10
+
+
+@needs_fork
+def test_worker_exception_fails_only_its_file(tmp_path, monkeypatch):
+    """An exception raised out of a worker is reported for its file and the scan goes on"""
+    real_scan_file = scanner.scanFile
+
+    def scanFile(job):
+        if job[1].endswith('f1.py'):
+            raise RuntimeError('worker broke')
+        return real_scan_file(job)
+
+    scanFile.__module__, scanFile.__qualname__ = real_scan_file.__module__, real_scan_file.__qualname__
+    monkeypatch.setattr(scanner, 'scanFile', scanFile)
+    results = [(os.path.basename(job[1]), result[:2]) for job, result in scanner.iterScanResults(write_files(tmp_path, 4), workers=2)]
+    assert [name for name, _ in results] == ['f0.py', 'f1.py', 'f2.py', 'f3.py']
+    assert results[1][1] == (scanner.SCAN_ERROR, repr(RuntimeError('worker broke')))
+    assert [status for _, (status, _) in results] == [scanner.SCAN_MATCHED, scanner.SCAN_ERROR, scanner.SCAN_MATCHED, scanner.SCAN_MATCHED]
+
+
+def commit_all(repo, message):
+    repo.git.add(A=True)
+    repo.index.commit(message)
+
+
+def test_incremental_rescan_matches_full_scan(tmp_path):
+    """Only files changed since the last scanned commit are scanned, the merged table matches a full scan"""
+    repo_roots = make_repos(tmp_path / 'corpus')
+    repo = Repo.init(repo_roots[0])
+    commit_all(repo, 'first')
+    output_file = str(tmp_path / 'out.csv')
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2) == {scanner.SCAN_MATCHED: 2, scanner.SCAN_SKIPPED: 1}
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2) == {scanner.SCAN_MATCHED: 1}
+
+    repo_a = tmp_path / 'corpus' / 'repo_a'
+    (repo_a / 'pkg' / 'load.py').write_text('x = torch.load(f)\n')
+    (repo_a / 'pkg' / 'new.py').write_text('y = np.load(g)\n')
+    repo.git.mv('setup.py', 'pkg/setup2.py')
+    commit_all(repo, 'second')
+    stats = scanner.rescanRepos(repo_roots, output_file, workers=2)
+    assert stats == {scanner.SCAN_MATCHED: 3, scanner.SCAN_SKIPPED: 1}
+
+    full_file = str(tmp_path / 'full.csv')
+    scanner.scanRepos(repo_roots, full_file, workers=2)
+    assert read_rows(output_file) == read_rows(full_file)
+    assert dict(zip(constants.CSV_HEADER, read_rows(output_file)[1]))['FILE_FULL_PATH'].endswith('load.py')
+
+
+def test_scan_from_git_object_database(tmp_path):
+    """A bare clone is scanned from its blobs, with the rows a checkout scan gives"""
+    repo_a = make_repos(tmp_path / 'corpus')[0]
+    repo = Repo.init(repo_a)
+    commit_all(repo, 'first')
+    bare_root = str(tmp_path / 'bare' / 'repo_a')
+    Repo.clone_from(repo_a, bare_root, bare=True)
+
+    checkout_file, bare_file = str(tmp_path / 'checkout.csv'), str(tmp_path / 'bare.csv')
+    scanner.scanRepos([repo_a], checkout_file, workers=2)
+    stats = scanner.scanRepos([bare_root], bare_file, workers=2, rev_='HEAD')
+    assert stats == {scanner.SCAN_MATCHED: 1, scanner.SCAN_SKIPPED: 1}
+    bare_rows = read_rows(bare_file)
+    assert [row[2:] for row in bare_rows] == [row[2:] for row in read_rows(checkout_file)]
+    assert bare_rows[2][1] == os.path.join(bare_root, 'pkg', 'load.py')
+
+
+def test_incremental_rescan_of_parquet_results(tmp_path):
+    """A Parquet results file is rescanned in place and exports to the CSV a full scan writes"""
+    pytest.importorskip('pyarrow')
+    import results_store
+    repo_roots = make_repos(tmp_path / 'corpus')
+    commit_all(Repo.init(repo_roots[0]), 'first')
+    output_file = str(tmp_path / 'out.parquet')
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2) == {scanner.SCAN_MATCHED: 2, scanner.SCAN_SKIPPED: 1}
+    (tmp_path / 'corpus' / 'repo_a' / 'pkg' / 'new.py').write_text('y = np.load(g)\n')
+    commit_all(Repo(repo_roots[0]), 'second')
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2) == {scanner.SCAN_MATCHED: 2}
+    full_file = str(tmp_path / 'full.csv')
+    scanner.scanRepos(repo_roots, full_file, workers=2)
+    results_store.exportCSV(output_file, str(tmp_path / 'export.csv'))
+    assert read_rows(str(tmp_path / 'export.csv')) == read_rows(full_file)
+
+
+def test_incremental_rescan_without_output_scans_in_full(tmp_path):
+    """A state file left without its results file does not limit the rescan to the changed files"""
+    repo_roots = make_repos(tmp_path / 'corpus')
+    repo = Repo.init(repo_roots[0])
+    commit_all(repo, 'first')
+    output_file = str(tmp_path / 'out.csv')
+    scanner.rescanRepos(repo_roots, output_file, workers=2)
+    os.remove(output_file)
+    (tmp_path / 'corpus' / 'repo_a' / 'setup.py').write_text('x = torch.load(f)\n')
+    commit_all(repo, 'second')
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2) == {scanner.SCAN_MATCHED: 3}
+
+    full_file = str(tmp_path / 'full.csv')
+    scanner.scanRepos(repo_roots, full_file, workers=2)
+    assert read_rows(output_file) == read_rows(full_file)
+
+
+@needs_fork
+def test_incremental_rescan_retries_failed_files(tmp_path, monkeypatch):
+    """A file that failed in the last scan is scanned again even when its blob did not change"""
+    real_analyze = lint_engine.analyze_file
+
+    def failing_analyze(analysis, sink_=None):
+        if analysis.path.endswith('load.py'):
+            raise RuntimeError('broken detector')
+        return real_analyze(analysis, sink_)
+
+    repo_roots = make_repos(tmp_path / 'corpus')
+    commit_all(Repo.init(repo_roots[0]), 'first')
+    output_file = str(tmp_path / 'out.csv')
+    monkeypatch.setattr(lint_engine, 'analyze_file', failing_analyze)
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2)[scanner.SCAN_ERROR] == 1
+    monkeypatch.setattr(lint_engine, 'analyze_file', real_analyze)
+    assert scanner.rescanRepos(repo_roots, output_file, workers=2) == {scanner.SCAN_MATCHED: 2}
+
+    full_file = str(tmp_path / 'full.csv')
+    scanner.scanRepos(repo_roots, full_file, workers=2)
+    assert read_rows(output_file) == read_rows(full_file)
+
+
+def test_unreadable_blob_is_skipped(tmp_path, monkeypatch):
+    """A blob missing from the object database is counted as failed and the other files are scanned"""
+    from git.cmd import Git
+    repo_a = make_repos(tmp_path / 'corpus')[0]
+    repo = Repo.init(repo_a)
+    commit_all(repo, 'first')
+    missing_sha = repo.head.commit.tree['pkg/load.py'].hexsha
+    real_object_data = Git.get_object_data
+
+    def missing_object_data(self, ref):
+        if ref == missing_sha:
+            raise ValueError('{} missing'.format(ref))
+        return real_object_data(self, ref)
+
+    monkeypatch.setattr(Git, 'get_object_data', missing_object_data)
+    output_file = str(tmp_path / 'out.csv')
+    stats = scanner.scanRepos([repo_a], output_file, workers=2, rev_='HEAD')
+    assert stats == {scanner.SCAN_SKIPPED: 1, scanner.SCAN_ERROR: 1}
+    assert [os.path.basename(row[1]) for row in read_rows(output_file)[1:]] == ['setup.py']
@@ -0,0 +1,66 @@
+"""
+Team 50 - PyTest checks for the distinct counters
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sketches
+
+
+def emails(start, stop):
+    return ['dev{}@example.org'.format(index) for index in range(start, stop)]
+
+
+def test_sketch_within_error_bound():
+    """A sketch counts distinct values within a few standard errors"""
+    sketch = sketches.HyperLogLog(0.01)
+    sketch.update(emails(0, 50000))
+    sketch.update(emails(0, 50000))
+    assert abs(sketch.count() - 50000) <= 50000 * 0.03
+    assert len(sketches.HyperLogLog(0.01)) == 0
+
+
+def test_small_sketches_use_their_alpha():
+    """Sketches under 128 registers estimate with the published alpha of their size"""
+    for error_rate, alpha in ((0.26, 0.673), (0.184, 0.697), (0.13, 0.709)):
+        sketch = sketches.HyperLogLog(error_rate)
+        sketch.registers[:] = 10
+        register_count = len(sketch.registers)
+        assert register_count == {0.673: 16, 0.697: 32, 0.709: 64}[alpha]
+        assert sketch.count() == round(alpha * register_count * 2 ** 10)
+
+
+def test_merged_sketches_count_the_union():
+    """Per-repo sketches merge into the count of the union, like exact counters do"""
+    repo_a, repo_b = sketches.getDistinctCounter(0.02), sketches.getDistinctCounter(0.02)
+    exact_a, exact_b = sketches.getDistinctCounter(), sketches.getDistinctCounter()
+    for counter in (repo_a, exact_a):
+        counter.update(emails(0, 20000))
+    for counter in (repo_b, exact_b):
+        counter.update(emails(10000, 40000))
+    assert exact_a.merge(exact_b).count() == 40000
+    assert abs(repo_a.merge(repo_b).count() - 40000) <= 40000 * 0.06
+    with pytest.raises(ValueError):
+        repo_a.merge(sketches.HyperLogLog(0.1))
+
+
+def test_quantile_sketch_bounded_and_mergeable():
+    """KLL sketches stay small, merge, and keep short streams exact"""
+    values = [(index * 7919) % 100000 for index in range(100000)]
+    first, second = sketches.KLLSketch(), sketches.KLLSketch(seed=1)
+    first.update(values[:50000])
+    second.update(values[50000:])
+    merged = first.merge(second)
+    assert merged.count() == 100000
+    assert sum(len(compactor) for compactor in merged.compactors) < 1000
+    assert abs(merged.median() - 50000) <= 100000 * 0.02
+    assert abs(merged.quantile(0.9) - 90000) <= 100000 * 0.02
+
+    short = sketches.KLLSketch()
+    short.update([3.0, 1.0, 4.0, 2.0])
+    assert short.median() == 2.5